@@ -49,9 +49,9 @@ class InitiativeAdmin(admin.ModelAdmin):
 
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
-    list_display = ("report_id", "status", "created_at")
+    list_display = ("report_id", "status", "created_at", "started_at", "finished_at", "attempts")
     search_fields = ("report_id", "status")
     list_filter = ("status",)
-    readonly_fields = ("report_id", "created_at")
+    readonly_fields = ("report_id", "created_at", "started_at", "finished_at", "attempts", "error", "artifacts")
     ordering = ("-created_at",)
     list_per_page = 50
@@ -1,21 +1,63 @@
+from django.utils.decorators import method_decorator
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
-from django.utils.text import slugify
+from rest_framework.response import Response
 
+from .conditional import conditional_get
+from .dimensions import get_resolver
 from .models import State, Scheme, Initiative
+from .pagination import KeysetPagination
 from .serializers import StateSerializer, SchemeSerializer, InitiativeSerializer
 
+# ?fields= output name -> values() lookup for the flat fast path.
+FLAT_FIELDS = {
+    "id": "id",
+    "name": "name",
+    "state": "state__name",
+    "state_id": "state_id",
+    "scheme": "scheme__name",
+    "scheme_id": "scheme_id",
+    "category": "category",
+    "year": "year",
+    "status": "status",
+    "progress": "progress",
+    "schools_impacted": "schools_impacted",
+    "students_impacted": "students_impacted",
+    "scholarships_awarded": "scholarships_awarded",
+    "budget_utilized": "budget_utilized",
+}
+
+
+def _conditional(viewset):
+    """ETag/304 handling on the read actions; DRF negotiates the renderer, so vary on Accept."""
+    for action in ("list", "retrieve"):
+        viewset = method_decorator(conditional_get(vary_on_accept=True), name=action)(viewset)
+    return viewset
+
+
+@_conditional
 class StateViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = State.objects.all().order_by('name')
     serializer_class = StateSerializer
     permission_classes = [AllowAny]
 
+@_conditional
 class SchemeViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Scheme.objects.all().order_by('name')
     serializer_class = SchemeSerializer
     permission_classes = [AllowAny]
 
+@_conditional
 class InitiativeViewSet(viewsets.ReadOnlyModelViewSet):
+    """Initiatives from the database.
+
+    ``?pagination=cursor`` (or any ``?cursor=``) switches to keyset pages
+    ordered on (year, state, id) without a COUNT query. ``?fields=a,b`` (or
+    ``?fields=*``) returns flat rows straight from ``values()`` instead of
+    nested serializer output.
+    """
+
     serializer_class = InitiativeSerializer
     permission_classes = [AllowAny]
 
@@ -30,10 +72,47 @@ class InitiativeViewSet(viewsets.ReadOnlyModelViewSet):
                 qs = qs.filter(year=int(year))
             except ValueError:
                 pass
-        if state:
-            qs = qs.filter(state__name=state) | qs.filter(state__slug=slugify(state))
-        if scheme:
-            qs = qs.filter(scheme__name=scheme) | qs.filter(scheme__slug=slugify(scheme))
+        # Name or slug resolves to the FK id through the cached dimension table.
+        for dimension, value in (('state', state), ('scheme', scheme)):
+            if value:
+                pk = get_resolver(dimension).pk(value)
+                qs = qs.filter(**{f'{dimension}_id': pk}) if pk is not None else qs.none()
         if category:
             qs = qs.filter(category=category)
         return qs.order_by('-year', 'state__name')
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params if self.request is not None else {}
+            if params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = KeysetPagination()
+            else:
+                return super().paginator
+        return self._paginator
+
+    def _flat_fields(self):
+        raw = self.request.query_params.get('fields')
+        if raw is None:
+            return None
+        names = [name.strip() for name in raw.split(',') if name.strip()]
+        if not names or names == ['*']:
+            return list(FLAT_FIELDS)
+        unknown = [name for name in names if name not in FLAT_FIELDS]
+        if unknown:
+            raise ValidationError({'fields': f"Unknown field(s): {', '.join(unknown)}. Choose from {', '.join(FLAT_FIELDS)}."})
+        return names
+
+    def list(self, request, *args, **kwargs):
+        fields = self._flat_fields()
+        if fields is None:
+            return super().list(request, *args, **kwargs)
+        # Keyset pagination reads its ordering key from each row.
+        lookups = list(dict.fromkeys([FLAT_FIELDS[name] for name in fields] + ['year', 'state_id', 'id']))
+        rows = self.filter_queryset(self.get_queryset()).values(*lookups)
+        page = self.paginate_queryset(rows)
+        pairs = [(name, FLAT_FIELDS[name]) for name in fields]
+        data = [{name: row[lookup] for name, lookup in pairs} for row in (rows if page is None else page)]
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
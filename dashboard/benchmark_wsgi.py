@@ -0,0 +1,20 @@
+"""
+WSGI entry point used by ``manage.py benchmark`` for its gunicorn runs.
+
+It is the regular application, except that the default database is replaced
+by the benchmark's seeded test database, passed in as JSON through the
+``DASHBOARD_BENCH_DATABASE`` environment variable.
+"""
+
+import json
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mhrd_dashboard.settings')
+
+from django.conf import settings  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+
+if os.environ.get('DASHBOARD_BENCH_DATABASE'):
+    settings.DATABASES['default'] = json.loads(os.environ['DASHBOARD_BENCH_DATABASE'])
+
+application = get_wsgi_application()
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+VERSION_KEY = "dashboard:data-version"
+
+FilterKey = Tuple[Optional[int], Optional[str], Optional[str], Optional[str]]
+
+_MISSING = object()
+
+
+def _now_version() -> int:
+    """A data version that is also the time of the change, in milliseconds.
+
+    Starting from the clock (rather than 0) means a restarted process or a
+    flushed shared cache never reissues a version seen with older data, so
+    versions can back HTTP validators, and ``last_modified`` falls out of it.
+    """
+
+    return int(time.time() * 1000)
+
+
+def normalize_filters(filters: Dict[str, Optional[str]]) -> FilterKey:
+    """Canonical, hashable form of the dashboard filters."""
+
+    year = filters.get("year")
+    return (
+        int(year) if year else None,
+        filters.get("state") or None,
+        filters.get("scheme") or None,
+        filters.get("category") or None,
+    )
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _shared_version(default: int) -> Optional[int]:
+    """The version in the ``DataVersion`` row, created as ``default`` if missing.
+
+    None when the database cannot answer (no database configured, or the
+    table is not migrated yet); callers then keep their own version.
+    """
+
+    from .models import DataVersion
+
+    try:
+        with transaction.atomic():
+            return DataVersion.objects.get_or_create(pk=1, defaults={"version": default})[0].version
+    except Exception:
+        return None
+
+
+def _bump_shared_version(floor: int) -> Optional[int]:
+    from django.db.models import F, Value
+    from django.db.models.functions import Greatest
+
+    from .models import DataVersion
+
+    try:
+        with transaction.atomic():
+            if not DataVersion.objects.filter(pk=1).update(version=Greatest(F("version") + 1, Value(floor))):
+                DataVersion.objects.get_or_create(pk=1, defaults={"version": floor})
+            return DataVersion.objects.get(pk=1).version
+    except Exception:
+        return None
+
+
+class LocalMemoryBackend:
+    """Per-process LRU cache bounded to ``max_entries`` items.
+
+    The data version is shared through the database (``DataVersion``): a
+    bump from any process, a worker's signal handler or a management
+    command, reaches every worker within ``version_ttl`` seconds, at which
+    point its entries for older versions are dropped. Without a database the
+    version stays per process.
+    """
+
+    def __init__(self, max_entries: int = 1024, version_ttl: float = 1.0, **_: object) -> None:
+        self.max_entries = max_entries
+        self.version_ttl = version_ttl
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = _now_version()
+        self._checked = float("-inf")
+
+    @property
+    def blocking(self) -> bool:
+        # Lookups are dict operations, safe to call straight from an event
+        # loop, except for the periodic read of the shared version.
+        return time.monotonic() - self._checked >= self.version_ttl
+
+    def get(self, key: str) -> object:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: object) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _adopt(self, version: int) -> int:
+        with self._lock:
+            self._checked = time.monotonic()
+            if version != self._version:
+                self._version = version
+                # Old keys can never be hit again; drop them instead of waiting for LRU.
+                self._entries.clear()
+            return self._version
+
+    def get_version(self) -> int:
+        # Never query from an event loop: async callers check ``blocking`` and
+        # ask from a thread; one that races the TTL gets the previous version.
+        if self.blocking and not _in_event_loop():
+            return self._adopt(_shared_version(self._version) or self._version)
+        return self._version
+
+    def bump_version(self) -> int:
+        version = max(self._version + 1, _now_version())
+        return self._adopt(_bump_shared_version(version) or version)
+
+
+class DjangoCacheBackend:
+    """Delegates to a ``CACHES`` alias; eviction is that cache's own policy.
+
+    Use a shared cache (Redis, Memcached, database) to share payloads and
+    the data version across workers and with management commands.
+    """
+
+    blocking = True
+
+    def __init__(self, alias: str = "default", timeout: Optional[int] = None, **_: object) -> None:
+        from django.core.cache import caches
+
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key: str) -> object:
+        return self.cache.get(key, _MISSING)
+
+    def set(self, key: str, value: object) -> None:
+        self.cache.set(key, value, self.timeout)
+
+    def clear(self) -> None:
+        self.bump_version()
+
+    def __len__(self) -> int:
+        return 0
+
+    def get_version(self) -> int:
+        version = self.cache.get(VERSION_KEY)
+        if version is None:
+            self.cache.add(VERSION_KEY, _now_version(), None)
+            version = self.cache.get(VERSION_KEY, 0)
+        return int(version)
+
+    def bump_version(self) -> int:
+        # Racing bumps may both land on "now"; either way every reader moves on.
+        version = max(self.get_version() + 1, _now_version())
+        self.cache.set(VERSION_KEY, version, None)
+        return version
+
+
+BACKENDS = {
+    "local": LocalMemoryBackend,
+    "django": DjangoCacheBackend,
+}
+
+
+class PayloadCache:
+    """Memoizes computed results per (namespace, filters, data version)."""
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._inflight: Dict[Tuple[int, str], "asyncio.Future[object]"] = {}
+
+    @classmethod
+    def from_settings(cls) -> "PayloadCache":
+        options = dict(getattr(settings, "DASHBOARD_CACHE", {}))
+        backend_name = str(options.pop("BACKEND", "local")).lower()
+        kwargs = {name.lower(): value for name, value in options.items()}
+        return cls(BACKENDS[backend_name](**kwargs))
+
+    @property
+    def version(self) -> int:
+        return self.backend.get_version()
+
+    async def aversion(self) -> int:
+        """``version`` for async callers; a ``blocking`` backend is read from a thread."""
+
+        if self.backend.blocking:
+            return await sync_to_async(self.backend.get_version)()
+        return self.backend.get_version()
+
+    @staticmethod
+    def last_modified(version: int) -> int:
+        """Unix time (seconds) at which ``version`` was issued."""
+
+        return version // 1000
+
+    def key(self, namespace: str, filters: Dict[str, Optional[str]]) -> str:
+        digest = hashlib.sha1(repr(normalize_filters(filters)).encode("utf-8")).hexdigest()
+        return f"dashboard:{namespace}:v{self.version}:{digest}"
+
+    def get_or_compute(self, namespace: str, filters: Dict[str, Optional[str]], compute: Callable[[], object]) -> object:
+        key = self.key(namespace, filters)
+        value = self.backend.get(key)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = compute()
+        self.backend.set(key, value)
+        return value
+
+    async def aget_or_compute(
+        self, namespace: str, filters: Dict[str, Optional[str]], compute: Callable[[], Awaitable[object]]
+    ) -> object:
+        """``get_or_compute`` for async views: ``compute`` is awaited on a miss.
+
+        Concurrent misses on one key within an event loop share a single
+        computation instead of each running the queries. Calls into a
+        ``blocking`` backend (a shared cache over the network, or the local
+        one when its shared version is due for a re-read) run in a thread
+        rather than on the event loop.
+        """
+
+        if self.backend.blocking:
+            key = await sync_to_async(self.key)(namespace, filters)
+            value = await sync_to_async(self.backend.get)(key)
+        else:
+            key = self.key(namespace, filters)
+            value = self.backend.get(key)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+        loop = asyncio.get_running_loop()
+        flight = (id(loop), key)  # futures belong to the loop that made them
+        pending = self._inflight.get(flight)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+        self.misses += 1
+        future = self._inflight[flight] = loop.create_future()
+        try:
+            value = await compute()
+            if self.backend.blocking:
+                await sync_to_async(self.backend.set)(key, value)
+            else:
+                self.backend.set(key, value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't log it as unretrieved
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[flight]
+
+    def bump_version(self) -> int:
+        return self.backend.bump_version()
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "version": self.version,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+        }
+
+
+_CACHE: Optional[PayloadCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_payload_cache() -> PayloadCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = PayloadCache.from_settings()
+    return _CACHE
+
+
+def bump_data_version() -> int:
+    """Invalidate every cached result computed from the current dataset."""
+
+    return get_payload_cache().bump_version()
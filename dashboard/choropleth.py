@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Map metric -> (state summary field, scale). Progress is a 0-1 mean shown as a percentage.
+CHOROPLETH_METRICS: Dict[str, Tuple[str, float]] = {
+    "students": ("students", 1),
+    "schools": ("schools", 1),
+    "scholarships": ("scholarships", 1),
+    "progress": ("avg_progress", 100),
+}
+CLASS_METHODS = ("quantile", "equal-interval", "jenks")
+DEFAULT_CLASSES = 5
+MAX_CLASSES = 9
+
+# Class index for boundary features without data for the filters.
+NO_DATA = -1
+
+
+def join_key(name: str) -> str:
+    """Letters of a state name, lower-cased: "Jammu & Kashmir" and "JAMMU  KASHMIR" meet."""
+
+    return re.sub(r"[^a-z]", "", (name or "").lower())
+
+
+def _jenks(ordered: np.ndarray, count: int) -> List[float]:
+    """Upper bounds of the ``count`` classes minimizing within-class squared deviation (Fisher-Jenks)."""
+
+    n = len(ordered)
+    sums = np.concatenate(([0.0], np.cumsum(ordered)))
+    squares = np.concatenate(([0.0], np.cumsum(ordered * ordered)))
+
+    def deviation(start: int, end: int) -> float:
+        total = sums[end] - sums[start]
+        return squares[end] - squares[start] - total * total / (end - start)
+
+    # cost[j][i]: best total deviation of the first i values in j classes; cut[j][i]: where the last class starts.
+    cost = np.full((count + 1, n + 1), np.inf)
+    cut = np.zeros((count + 1, n + 1), dtype=int)
+    cost[0][0] = 0.0
+    for classes in range(1, count + 1):
+        for end in range(classes, n + 1):
+            for start in range(classes - 1, end):
+                candidate = cost[classes - 1][start] + deviation(start, end)
+                if candidate < cost[classes][end]:
+                    cost[classes][end], cut[classes][end] = candidate, start
+    bounds, end = [], n
+    for classes in range(count, 0, -1):
+        bounds.append(float(ordered[end - 1]))
+        end = cut[classes][end]
+    return bounds[::-1]
+
+
+def class_breaks(values: Sequence[float], method: str, count: int) -> List[float]:
+    """``[min, upper bound of class 0, ..., max]``; ties can merge classes, so there may be fewer than ``count``."""
+
+    ordered = np.sort(np.asarray(values, dtype=np.float64))
+    if not len(ordered):
+        return []
+    count = max(1, min(count, len(ordered)))
+    if method == "equal-interval":
+        bounds = np.linspace(ordered[0], ordered[-1], count + 1)[1:]
+    elif method == "jenks":
+        bounds = _jenks(ordered, count)
+    else:
+        bounds = np.quantile(ordered, np.linspace(0, 1, count + 1))[1:]
+    breaks = [round(float(ordered[0]), 2)]
+    for bound in (round(float(bound), 2) for bound in bounds):
+        if bound > breaks[-1] or len(breaks) == 1:
+            breaks.append(bound)
+    return [int(value) if value.is_integer() else value for value in breaks]
+
+
+def class_colors(count: int) -> List[str]:
+    """``count`` colours along the dashboard's map scale, lowest class first."""
+
+    steps = [index / (count - 1) if count > 1 else 1.0 for index in range(count)]
+    return ["#%02x%02x%02x" % (30, 60 + int(100 * t), 30 + int(200 * t)) for t in steps]
+
+
+def classify(
+    state_summary: Dict[str, Dict[str, float]],
+    boundaries: Sequence[Tuple[str, str]],
+    metric: str,
+    method: str,
+    count: int,
+) -> Dict[str, object]:
+    """Class breaks and per-feature class indexes for ``metric``.
+
+    ``boundaries`` are the (feature id, state name) pairs of the boundary
+    file in feature order; ``classes`` and ``values`` follow that order, so
+    the map styles feature ``i`` with ``colors[classes[i]]`` (``NO_DATA`` for
+    states without initiatives under the filters). Every state with data is
+    classified, whether or not the boundary file draws it.
+    """
+
+    field, scale = CHOROPLETH_METRICS[metric]
+    values = {
+        join_key(state): round(summary.get(field, 0) * scale, 2) for state, summary in state_summary.items()
+    }
+    breaks = class_breaks(list(values.values()), method, count)
+    inner = np.asarray(breaks[1:-1])
+    feature_values: List[Optional[float]] = [values.get(join_key(name)) for _, name in boundaries]
+    classes = [
+        NO_DATA if value is None else int(np.searchsorted(inner, value, side="left"))
+        for value in feature_values
+    ]
+    return {
+        "metric": metric,
+        "method": method,
+        "breaks": breaks,
+        "colors": class_colors(max(len(breaks) - 1, 1)) if breaks else [],
+        "classes": classes,
+        "values": feature_values,
+    }
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import hashlib
+from functools import wraps
+from typing import Dict, Tuple
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_payload_cache
+
+_SAFE_METHODS = ("GET", "HEAD")
+
+
+def _options() -> Dict[str, object]:
+    return getattr(settings, "DASHBOARD_HTTP_CACHE", {})
+
+
+def _validators(request, version: int, vary_on_accept: bool) -> Tuple[str, int]:
+    """(ETag, Last-Modified) for ``request`` against data ``version``.
+
+    The ETag covers the path and the query with parameters sorted, so
+    ``?year=2024&state=Goa`` and ``?state=Goa&year=2024`` share one entry.
+    """
+
+    query = urlencode(sorted((key, value) for key in request.GET for value in request.GET.getlist(key)))
+    parts = [str(version), request.path, query]
+    if vary_on_accept:
+        parts.append(request.META.get("HTTP_ACCEPT", ""))
+    digest = hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:24]
+    return quote_etag(digest), get_payload_cache().last_modified(version)
+
+
+def _finish(response, etag: str, last_modified: int, vary_on_accept: bool):
+    if response.status_code not in (200, 304):
+        return response
+    response.setdefault("ETag", etag)
+    response.setdefault("Last-Modified", http_date(last_modified))
+    options = _options()
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=int(options.get("MAX_AGE", 0)),
+        s_maxage=int(options.get("SHARED_MAX_AGE", 0)),
+    )
+    patch_vary_headers(response, ("Accept", "Accept-Encoding") if vary_on_accept else ("Accept-Encoding",))
+    return response
+
+
+def conditional_get(view=None, *, vary_on_accept: bool = False):
+    """Validate GETs against the dataset version before running the view.
+
+    Responses carry an ETag and Last-Modified derived from the payload
+    cache's data version and the normalized query, plus ``Cache-Control``
+    (``DASHBOARD_HTTP_CACHE``) and ``Vary``. A matching ``If-None-Match`` /
+    ``If-Modified-Since`` gets a 304 without calling the view, so nothing is
+    computed or serialized. Works on sync and ``async def`` views, and on DRF
+    actions through ``method_decorator`` (``vary_on_accept`` for views that
+    negotiate the renderer).
+    """
+
+    def decorate(func):
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_inner(request, *args, **kwargs):
+                if request.method not in _SAFE_METHODS or not _options().get("ENABLED", True):
+                    return await func(request, *args, **kwargs)
+                version = await get_payload_cache().aversion()
+                etag, last_modified = _validators(request, version, vary_on_accept)
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = await func(request, *args, **kwargs)
+                return _finish(response, etag, last_modified, vary_on_accept)
+
+            return async_inner
+
+        @wraps(func)
+        def inner(request, *args, **kwargs):
+            if request.method not in _SAFE_METHODS or not _options().get("ENABLED", True):
+                return func(request, *args, **kwargs)
+            etag, last_modified = _validators(request, get_payload_cache().version, vary_on_accept)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = func(request, *args, **kwargs)
+            return _finish(response, etag, last_modified, vary_on_accept)
+
+        return inner
+
+    return decorate(view) if view is not None else decorate
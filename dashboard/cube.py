@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .dimensions import canonical_name
+from .models import Initiative, InitiativeAggregate
+
+# Cube dimensions in key order, and the value meaning "all" for each.
+CUBE_DIMENSIONS = ("year", "state", "scheme", "category")
+ALL = {"year": 0, "state": "", "scheme": "", "category": ""}
+GRAND_TOTAL = {name: ALL[name] for name in CUBE_DIMENSIONS}
+
+CUBE_METRICS = ("progress", "schools_impacted", "students_impacted", "scholarships_awarded", "budget_utilized")
+_INTEGER_METRICS = ("schools_impacted", "students_impacted", "scholarships_awarded")
+
+Key = Tuple[object, ...]
+
+
+def _rollups(key: Key) -> Iterable[Key]:
+    """The cell itself and every rollup it contributes to (2**4 keys)."""
+
+    for mask in product((False, True), repeat=len(CUBE_DIMENSIONS)):
+        yield tuple(ALL[name] if rolled else value for name, value, rolled in zip(CUBE_DIMENSIONS, key, mask))
+
+
+def _empty() -> Dict[str, float]:
+    cell: Dict[str, float] = {name: 0 for name in CUBE_METRICS}
+    cell["count"] = 0
+    return cell
+
+
+def _accumulate(cells: Dict[Key, Dict[str, float]], key: Key, values: Dict[str, float], sign: int = 1) -> None:
+    for rollup in _rollups(key):
+        cell = cells.setdefault(rollup, _empty())
+        for name in (*CUBE_METRICS, "count"):
+            cell[name] += sign * values[name]
+
+
+# --- full refresh ---
+
+
+def refresh_cube() -> int:
+    """Rebuild every cell from one GROUP BY over the initiative table.
+
+    Returns the number of cells written. The swap happens in one transaction,
+    so readers see either the old cube or the new one.
+    """
+
+    base = (
+        Initiative.objects.values("year", "state__name", "scheme__name", "category")
+        .annotate(count=Count("id"), **{f"sum_{name}": Sum(name) for name in CUBE_METRICS})
+        .order_by()
+    )
+    cells: Dict[Key, Dict[str, float]] = {}
+    for row in base:
+        values = {name: row[f"sum_{name}"] or 0 for name in CUBE_METRICS}
+        values["count"] = row["count"]
+        _accumulate(cells, (row["year"], row["state__name"], row["scheme__name"], row["category"]), values)
+    objects = [
+        InitiativeAggregate(**dict(zip(CUBE_DIMENSIONS, key)), **cell)
+        for key, cell in cells.items()
+    ]
+    with transaction.atomic():
+        InitiativeAggregate.objects.all().delete()
+        InitiativeAggregate.objects.bulk_create(objects, batch_size=1000)
+    return len(objects)
+
+
+def cube_is_built() -> bool:
+    return InitiativeAggregate.objects.filter(**GRAND_TOTAL).exists()
+
+
+# --- incremental maintenance (signal handlers) ---
+
+
+def _initiative_key(values: Dict[str, object]) -> Key:
+    return tuple(values[name] for name in CUBE_DIMENSIONS)
+
+
+def snapshot(instance: Initiative) -> Optional[Dict[str, object]]:
+    """The stored cube-relevant values of ``instance`` before it is changed."""
+
+    if instance.pk is None:
+        return None
+    row = (
+        Initiative.objects.filter(pk=instance.pk)
+        .values("year", "state__name", "scheme__name", "category", *CUBE_METRICS)
+        .first()
+    )
+    if row is None:
+        return None
+    row["state"] = row.pop("state__name")
+    row["scheme"] = row.pop("scheme__name")
+    row["count"] = 1
+    return row
+
+
+def current_values(instance: Initiative) -> Dict[str, object]:
+    values: Dict[str, object] = {name: getattr(instance, name) for name in ("year", "category", *CUBE_METRICS)}
+    values["state"] = instance.state.name
+    values["scheme"] = instance.scheme.name
+    values["count"] = 1
+    return values
+
+
+def apply_change(old: Optional[Dict[str, object]], new: Optional[Dict[str, object]]) -> None:
+    """Move one initiative's contribution from ``old`` to ``new`` in every affected cell.
+
+    Does nothing until the cube has been built once (``refresh_cube``), so a
+    partially maintained cube is never mistaken for a complete one.
+    """
+
+    if not cube_is_built():
+        return
+    deltas: Dict[Key, Dict[str, float]] = {}
+    if old is not None:
+        _accumulate(deltas, _initiative_key(old), old, sign=-1)
+    if new is not None:
+        _accumulate(deltas, _initiative_key(new), new)
+    deltas = {key: delta for key, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+    with transaction.atomic():
+        InitiativeAggregate.objects.bulk_create(
+            [InitiativeAggregate(**dict(zip(CUBE_DIMENSIONS, key))) for key in deltas],
+            ignore_conflicts=True,
+        )
+        for key, delta in deltas.items():
+            InitiativeAggregate.objects.filter(**dict(zip(CUBE_DIMENSIONS, key))).update(
+                **{name: F(name) + delta[name] for name in (*CUBE_METRICS, "count")}
+            )
+        InitiativeAggregate.objects.filter(count__lte=0).delete()
+
+
+# --- queries ---
+
+
+def _cell_filter(filters: Dict[str, Optional[str]], group_by: Sequence[str] = (), states: Sequence[str] = ()) -> Q:
+    """Cells holding the totals for ``filters``, one per value of ``group_by``."""
+
+    lookup: Dict[str, object] = {}
+    query = Q()
+    for name in CUBE_DIMENSIONS:
+        value = filters.get(name)
+        if name in ("state", "scheme"):
+            # Cells are keyed by name; filters may carry a slug.
+            value = canonical_name(name, value)
+        if name == "state" and states:
+            query &= Q(state__in=[canonical_name("state", state) for state in states])
+        elif value:
+            lookup[name] = int(value) if name == "year" else value
+        elif name in group_by:
+            query &= ~Q(**{name: ALL[name]})
+        else:
+            lookup[name] = ALL[name]
+    return query & Q(**lookup)
+
+
+def _totals(cell: InitiativeAggregate) -> Dict[str, float]:
+    totals: Dict[str, float] = {name: getattr(cell, name) for name in CUBE_METRICS}
+    for name in _INTEGER_METRICS:
+        totals[name] = int(totals[name])
+    totals["count"] = cell.count
+    return totals
+
+
+def cube_totals_by(
+    filters: Dict[str, Optional[str]], group_by: Sequence[str] = (), states: Sequence[str] = ()
+) -> Optional[Dict[Key, Dict[str, float]]]:
+    """Totals keyed by the ``group_by`` values, read from the cube in one query.
+
+    ``states`` restricts (and implies grouping by) state; state and scheme
+    keys are canonical names whatever form the filters used. Returns None
+    when the cube has not been built, so callers fall back to live
+    aggregation; once it is built, an empty result means no initiatives match.
+    """
+
+    requested = _cell_filter(filters, group_by, states)
+    wants_grand_total = not group_by and not states and not any(filters.get(name) for name in CUBE_DIMENSIONS)
+    # The grand-total cell rides along in the same query as the "cube is built" marker.
+    cells: List[InitiativeAggregate] = list(InitiativeAggregate.objects.filter(requested | Q(**GRAND_TOTAL)))
+    built = False
+    grouped: Dict[Key, Dict[str, float]] = {}
+    for cell in cells:
+        if all(getattr(cell, name) == value for name, value in GRAND_TOTAL.items()):
+            built = True
+            if not wants_grand_total:
+                continue
+        grouped[tuple(getattr(cell, name) for name in group_by)] = _totals(cell)
+    return grouped if built else None
+
+
+def cube_totals(filters: Dict[str, Optional[str]]) -> Optional[Dict[str, float]]:
+    """Totals for one filter set: a single-cell lookup. None when the cube is not built."""
+
+    grouped = cube_totals_by(filters)
+    if grouped is None:
+        return None
+    return grouped.get((), _empty())
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 
 MONTHS = [
     "Jan",
@@ -127,8 +127,11 @@ def _seeded_random(*parts: str) -> random.Random:
     return random.Random(seed)
 
 
-def _synthetic_values(state: str, scheme: str, year: int) -> Dict[str, object]:
-    r = _seeded_random(state, scheme, str(year))
+def _synthetic_values(state: str, scheme: str, year: int, district: int = 0) -> Dict[str, object]:
+    if district:
+        r = _seeded_random(state, scheme, str(year), str(district))
+    else:
+        r = _seeded_random(state, scheme, str(year))
     # scale knobs per scheme type
     category = SCHEME_CATEGORY_HINT.get(scheme, r.choice(list(CATEGORIES)))
     base_students = r.randint(8000, 60000)
@@ -150,47 +153,7 @@ def _synthetic_values(state: str, scheme: str, year: int) -> Dict[str, object]:
     }
 
 
-INITIATIVES: List[Dict[str, object]] = []
-_id = 1
-for year in YEARS:
-    for state in INDIAN_STATES:
-        for scheme in SCHEMES:
-            values = _synthetic_values(state, scheme, year)
-            INITIATIVES.append({
-                "id": _id,
-                "name": f"{scheme} - {state}",
-                "state": state,
-                "scheme": scheme,
-                "category": values["category"],
-                "year": year,
-                "status": values["status"],
-                "progress": values["progress"],
-                "schools_impacted": values["schools_impacted"],
-                "students_impacted": values["students_impacted"],
-                "scholarships_awarded": values["scholarships_awarded"],
-                "budget_utilized": values["budget_utilized"],
-            })
-            _id += 1
-
-
-ENROLLMENT_DATA: List[Dict[str, object]] = []
-for year in YEARS:
-    for index, month in enumerate(MONTHS, start=1):
-        base_primary = 4100 + (index * 120)
-        base_secondary = 2300 + (index * 95)
-        growth_factor = 1 + (0.03 * (year - 2023))
-        ENROLLMENT_DATA.append(
-            {
-                "year": year,
-                "month": month,
-                "primary": int(base_primary * growth_factor),
-                "secondary": int(base_secondary * growth_factor * 0.83),
-            }
-        )
-
-
-SCHOLARSHIP_DATA: List[Dict[str, object]] = []
-state_weights = {
+STATE_SCHOLARSHIP_WEIGHTS = {
     "Karnataka": 1.0,
     "Tamil Nadu": 1.2,
     "Maharashtra": 1.5,
@@ -199,15 +162,111 @@ state_weights = {
     "West Bengal": 0.9,
 }
 
-for year in YEARS:
-    for state, weight in state_weights.items():
-        SCHOLARSHIP_DATA.append(
+
+class DemoDataset:
+    """Deterministic synthetic dataset, generated on demand.
+
+    Every row is a pure function of (district, year, state, scheme), so
+    nothing is built at import time. ``districts`` > 1 adds sub-state district rows for load testing;
+    district 0 is the regular per-state dataset, whose ids (1..N) are the
+    same at every scale.
+    """
+
+    def __init__(self, districts: int = 1) -> None:
+        self.districts = max(1, int(districts))
+        self.years: List[int] = list(YEARS)
+        self.states: List[str] = list(INDIAN_STATES)
+        self.schemes: List[str] = list(SCHEMES)
+        self.base_count = len(self.years) * len(self.states) * len(self.schemes)
+
+    def __len__(self) -> int:
+        return self.base_count * self.districts
+
+    def iter_initiatives(self, first_district: int = 0) -> Iterator[Dict[str, object]]:
+        """Yield every initiative, in id order.
+
+        ``first_district`` skips lower districts, e.g. to top up a database
+        already seeded at a smaller scale.
+        """
+
+        per_year = len(self.states) * len(self.schemes)
+        for district in range(first_district, self.districts):
+            for year_index, year_value in enumerate(self.years):
+                for state_index, state_name in enumerate(self.states):
+                    for scheme_index, scheme_name in enumerate(self.schemes):
+                        values = _synthetic_values(state_name, scheme_name, year_value, district)
+                        ordinal = year_index * per_year + state_index * len(self.schemes) + scheme_index
+                        name = f"{scheme_name} - {state_name}"
+                        yield {
+                            "id": district * self.base_count + ordinal + 1,
+                            "name": f"{name} (District {district})" if district else name,
+                            "state": state_name,
+                            "scheme": scheme_name,
+                            "category": values["category"],
+                            "year": year_value,
+                            "status": values["status"],
+                            "progress": values["progress"],
+                            "schools_impacted": values["schools_impacted"],
+                            "students_impacted": values["students_impacted"],
+                            "scholarships_awarded": values["scholarships_awarded"],
+                            "budget_utilized": values["budget_utilized"],
+                        }
+
+    def enrollment(self, year: Optional[int] = None) -> List[Dict[str, object]]:
+        entries = []
+        for year_value in self.years if year is None else [year]:
+            growth_factor = 1 + (0.03 * (year_value - 2023))
+            for index, month in enumerate(MONTHS, start=1):
+                base_primary = 4100 + (index * 120)
+                base_secondary = 2300 + (index * 95)
+                entries.append(
+                    {
+                        "year": year_value,
+                        "month": month,
+                        "primary": int(base_primary * growth_factor),
+                        "secondary": int(base_secondary * growth_factor * 0.83),
+                    }
+                )
+        return entries
+
+    def scholarships(self, year: Optional[int] = None) -> List[Dict[str, object]]:
+        return [
             {
-                "year": year,
+                "year": year_value,
                 "state": state,
-                "beneficiaries": int(850 * weight * (0.9 + 0.06 * (year - 2023))),
+                "beneficiaries": int(850 * weight * (0.9 + 0.06 * (year_value - 2023))),
             }
-        )
+            for year_value in (self.years if year is None else [year])
+            for state, weight in STATE_SCHOLARSHIP_WEIGHTS.items()
+        ]
+
+
+_DATASET: Optional[DemoDataset] = None
+
+
+def get_dataset() -> DemoDataset:
+    """Process-wide dataset; ``DASHBOARD_DEMO_SCALE`` sets the districts per state."""
+
+    global _DATASET
+    if _DATASET is None:
+        from django.conf import settings
+
+        _DATASET = DemoDataset(districts=getattr(settings, "DASHBOARD_DEMO_SCALE", 1))
+    return _DATASET
+
+
+def __getattr__(name: str):
+    # INITIATIVES / ENROLLMENT_DATA / SCHOLARSHIP_DATA used to be built at import
+    # time; they are now materialized (and kept) only if something asks for them.
+    builders = {
+        "INITIATIVES": lambda: list(get_dataset().iter_initiatives()),
+        "ENROLLMENT_DATA": lambda: get_dataset().enrollment(),
+        "SCHOLARSHIP_DATA": lambda: get_dataset().scholarships(),
+    }
+    if name not in builders:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = builders[name]()
+    return value
 
 
 def aggregate_initiatives_by_state(initiatives: Iterable[Dict[str, object]]) -> Dict[str, Dict[str, float]]:
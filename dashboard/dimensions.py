@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.utils.text import slugify
+
+from .cache import get_payload_cache
+
+
+class DimensionResolver:
+    """Maps a state/scheme name or slug to its canonical name and primary key.
+
+    The lookup table is built once from the dimension table (plus the demo
+    names, which have no pk) and reused until the data version changes or
+    ``invalidate`` is called, so request handling never re-slugifies every
+    row or joins through the dimension table just to filter on it.
+    """
+
+    def __init__(self, model_name: str, demo_names: Sequence[str]) -> None:
+        self.model_name = model_name
+        self.demo_names = list(demo_names)
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._keys: Dict[str, Tuple[Optional[int], str]] = {}
+        self._names_by_pk: Dict[int, str] = {}
+
+    def _rows(self) -> List[Tuple[int, str, str]]:
+        from django.apps import apps
+
+        model = apps.get_model("dashboard", self.model_name)
+        try:
+            return list(model.objects.values_list("id", "name", "slug"))
+        except Exception:
+            return []  # table missing (e.g. before migrate): demo names only
+
+    def _table(self) -> Dict[str, Tuple[Optional[int], str]]:
+        version = get_payload_cache().version
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    keys: Dict[str, Tuple[Optional[int], str]] = {}
+                    for name in self.demo_names:
+                        keys[name] = keys[slugify(name)] = (None, name)
+                    names_by_pk: Dict[int, str] = {}
+                    for pk, name, slug in self._rows():
+                        names_by_pk[pk] = name
+                        for key in (name, slug, slugify(name)):
+                            if key:
+                                keys[key] = (pk, name)
+                    self._keys, self._names_by_pk, self._version = keys, names_by_pk, version
+        return self._keys
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def resolve(self, value: Optional[str]) -> Optional[Tuple[Optional[int], str]]:
+        """``(pk, name)`` for a name or slug; pk is None for demo-only names."""
+
+        if not value:
+            return None
+        table = self._table()
+        return table.get(value) or table.get(slugify(value))
+
+    def name(self, value: Optional[str]) -> Optional[str]:
+        resolved = self.resolve(value)
+        return resolved[1] if resolved else None
+
+    def pk(self, value: Optional[str]) -> Optional[int]:
+        resolved = self.resolve(value)
+        return resolved[0] if resolved else None
+
+    def name_for_pk(self, pk: int) -> Optional[str]:
+        self._table()
+        return self._names_by_pk.get(pk)
+
+    def names(self) -> List[str]:
+        return sorted({name for _, name in self._table().values()})
+
+
+_RESOLVERS: Dict[str, DimensionResolver] = {}
+_RESOLVERS_LOCK = threading.Lock()
+
+
+def get_resolver(dimension: str) -> DimensionResolver:
+    """Process-wide resolver for ``"state"`` or ``"scheme"``."""
+
+    resolver = _RESOLVERS.get(dimension)
+    if resolver is None:
+        from .data import INDIAN_STATES, SCHEMES
+
+        with _RESOLVERS_LOCK:
+            resolver = _RESOLVERS.get(dimension)
+            if resolver is None:
+                model_name, demo_names = {"state": ("State", INDIAN_STATES), "scheme": ("Scheme", SCHEMES)}[dimension]
+                resolver = _RESOLVERS[dimension] = DimensionResolver(model_name, demo_names)
+    return resolver
+
+
+def invalidate_dimensions() -> None:
+    for resolver in list(_RESOLVERS.values()):
+        resolver.invalidate()
+
+
+def canonical_name(dimension: str, value: Optional[str]) -> Optional[str]:
+    """The stored name for a ``dimension`` name or slug; unknown values pass through."""
+
+    if not value:
+        return value
+    return get_resolver(dimension).name(value) or value
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework import renderers
+
+from .profiling import timed
+
+try:  # optional: several times faster than the stdlib encoder on large payloads
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+_JS_UNSAFE = (("\u2028".encode("utf-8"), b"\\u2028"), ("\u2029".encode("utf-8"), b"\\u2029"))
+
+
+def encoder_name() -> str:
+    """``"orjson"`` or ``"stdlib"``, per ``DASHBOARD_JSON_ENCODER`` and what is installed."""
+
+    choice = str(getattr(settings, "DASHBOARD_JSON_ENCODER", "auto")).lower()
+    if choice == "stdlib" or orjson is None:
+        return "stdlib"
+    return "orjson"
+
+
+def dumps(data: object, encoder: type = DjangoJSONEncoder) -> bytes:
+    """Compact UTF-8 JSON for ``data``.
+
+    Uses orjson when available, handing anything it cannot encode natively
+    (Decimal, lazy translations, ...) to ``encoder().default``; otherwise the
+    stdlib encoder with the same compact output. U+2028/2029 are escaped so
+    the result is also valid JavaScript.
+    """
+
+    if encoder_name() == "orjson":
+        content = orjson.dumps(data, default=encoder().default)
+    else:
+        content = json.dumps(data, cls=encoder, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    for raw, escaped in _JS_UNSAFE:
+        if raw in content:
+            content = content.replace(raw, escaped)
+    return content
+
+
+class JsonResponse(HttpResponse):
+    """``django.http.JsonResponse`` on ``dumps``, reporting encode time as ``serialize``."""
+
+    def __init__(self, data, safe: bool = True, encoder: type = DjangoJSONEncoder, **kwargs) -> None:
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault("content_type", "application/json")
+        with timed("serialize"):
+            content = dumps(data, encoder)
+        super().__init__(content=content, **kwargs)
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """DRF JSON renderer using ``dumps`` for compact output, timed as ``serialize``.
+
+    Indented output (the browsable API, ``; indent=`` media types) and
+    non-default ``UNICODE_JSON``/``COMPACT_JSON`` settings keep DRF's own path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed("serialize"):
+            if data is None:
+                return b""
+            fast = self.compact and not self.ensure_ascii
+            if fast and self.get_indent(accepted_media_type, renderer_context or {}) is None:
+                return dumps(data, self.encoder_class)
+            return super().render(data, accepted_media_type, renderer_context)
+
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import csv
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
+
+
+class _Echo:
+    """Pseudo-buffer whose write() hands the formatted CSV line straight back."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_chunks(
+    header: Sequence[str],
+    initiatives: Iterable[Dict[str, object]],
+    to_row: Callable[[Dict[str, object]], List[object]],
+    rows_per_chunk: int = 500,
+) -> Iterator[str]:
+    """Render CSV incrementally: the header first, then batches of rows."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    batch: List[str] = []
+    for init in initiatives:
+        batch.append(writer.writerow(to_row(init)))
+        if len(batch) >= rows_per_chunk:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+REPORT_CSV_HEADER = [
+    "Initiative",
+    "State",
+    "Scheme",
+    "Category",
+    "Year",
+    "Status",
+    "Progress",
+    "Schools Impacted",
+    "Students Impacted",
+    "Scholarships Awarded",
+    "Budget Utilized (Cr)",
+]
+
+
+def report_csv_row(init: Dict[str, object]) -> List[object]:
+    return [
+        init["name"],
+        init["state"],
+        init["scheme"],
+        init["category"],
+        init["year"],
+        init["status"],
+        f"{float(init['progress'])*100:.0f}%",
+        init["schools_impacted"],
+        init["students_impacted"],
+        init["scholarships_awarded"],
+        init["budget_utilized"],
+    ]
+
+
+EXPORT_CSV_HEADER = ["name", "state", "scheme", "category", "year", "progress", "schools", "students", "scholarships", "budget"]
+
+
+def export_csv_row(init: Dict[str, object]) -> List[object]:
+    return [
+        init["name"], init["state"], init["scheme"], init["category"], init["year"],
+        f"{float(init['progress'])*100:.0f}%", init["schools_impacted"], init["students_impacted"], init["scholarships_awarded"], init["budget_utilized"]
+    ]
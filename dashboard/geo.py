@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import math
+import os
+import posixpath
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.text import slugify
+
+try:  # optional: whitenoise[brotli]; without it only .gz variants are written
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Static paths (relative to the static root) of the built manifest, and the
+# raw file served when no boundaries have been built.
+MANIFEST = "geo/manifest.json"
+FALLBACK = "geo/india_states_demo.geojson"
+OBJECT_NAME = "states"
+
+# Property names tried, in order, for a feature's state name.
+NAME_FIELDS = ("state", "NAME_1", "st_nm", "State_Name")
+
+# Web-mercator tile size; one pixel at zoom z spans 360 / (TILE_SIZE * 2**z) degrees of longitude.
+TILE_SIZE = 256
+
+Point = Tuple[int, int]
+Ring = List[Point]
+
+
+def pixel_degrees(zoom: int) -> float:
+    return 360.0 / (TILE_SIZE * 2 ** zoom)
+
+
+def _polygons(geometry: Optional[Dict[str, object]]) -> List[List[Sequence[Sequence[float]]]]:
+    if not geometry:
+        return []
+    if geometry.get("type") == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry.get("type") == "MultiPolygon":
+        return list(geometry["coordinates"])
+    return []
+
+
+def _feature_name(properties: Dict[str, object], fields: Sequence[str]) -> str:
+    for field in fields:
+        value = properties.get(field)
+        if value:
+            return str(value).strip()
+    return ""
+
+
+def _ring_area(points: Sequence[Point]) -> float:
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(points, points[1:])) / 2.0
+
+
+class Topology:
+    """State boundaries as shared arcs on an integer grid.
+
+    Coordinates are quantized first, so borders traced twice (once per
+    neighbour) become the same points. Every ring is then cut at junctions,
+    the points where neighbouring rings diverge, and identical arcs are
+    stored once; a ring refers to arc ``i``, or ``~i`` for arc ``i`` reversed.
+    Simplifying an arc therefore moves both sides of a border together and
+    never opens gaps or overlaps between states.
+    """
+
+    def __init__(self, collection: Dict[str, object], quantization: int = 10000,
+                 name_fields: Sequence[str] = NAME_FIELDS) -> None:
+        features: Dict[str, Dict[str, object]] = {}
+        for feature in collection.get("features", []):
+            name = _feature_name(feature.get("properties") or {}, name_fields)
+            polygons = _polygons(feature.get("geometry"))
+            if not name or not polygons:
+                continue
+            # Several features for one state (islands, exclaves) merge into one MultiPolygon.
+            entry = features.setdefault(slugify(name), {"state": name, "polygons": []})
+            entry["polygons"].extend(polygons)
+        if not features:
+            raise ValueError("no polygon features with a state name")
+
+        xs = [x for entry in features.values() for polygon in entry["polygons"] for ring in polygon for x, _ in ring]
+        ys = [y for entry in features.values() for polygon in entry["polygons"] for ring in polygon for _, y in ring]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        x0, y0, x1, y1 = self.bbox
+        self.quantization = quantization
+        self.scale = ((x1 - x0) / (quantization - 1) or 1.0, (y1 - y0) / (quantization - 1) or 1.0)
+
+        rings: Dict[str, List[List[Ring]]] = {
+            feature_id: [[ring for ring in map(self._quantize, polygon) if len(ring) >= 3] for polygon in entry["polygons"]]
+            for feature_id, entry in features.items()
+        }
+        self.names = {feature_id: entry["state"] for feature_id, entry in features.items()}
+        self.arcs: List[List[Point]] = []
+        self._index: Dict[Tuple[Point, ...], int] = {}
+        junctions = self._junctions(ring for polygons in rings.values() for polygon in polygons for ring in polygon)
+        # feature id -> polygons -> rings -> arc references
+        self.geometries: Dict[str, List[List[List[int]]]] = {
+            feature_id: [[self._cut(ring, junctions) for ring in polygon] for polygon in polygons if polygon]
+            for feature_id, polygons in rings.items()
+        }
+
+    def _quantize(self, coordinates: Sequence[Sequence[float]]) -> Ring:
+        x0, y0 = self.bbox[0], self.bbox[1]
+        sx, sy = self.scale
+        ring: Ring = []
+        for x, y, *_ in coordinates:
+            point = (int(round((x - x0) / sx)), int(round((y - y0) / sy)))
+            if ring and ring[-1] == point:
+                continue
+            if len(ring) > 1 and ring[-2] == point:
+                # Detail finer than the grid folds back on itself (A, B, A);
+                # cancel the fold so it does not register as a junction.
+                ring.pop()
+                continue
+            ring.append(point)
+        if len(ring) > 1 and ring[0] == ring[-1]:
+            ring.pop()
+        return ring
+
+    @staticmethod
+    def _junctions(rings: Iterable[Ring]) -> set:
+        """Points whose neighbours differ between the rings passing through them."""
+
+        neighbours: Dict[Point, Tuple[Point, Point]] = {}
+        junctions = set()
+        for ring in rings:
+            for i, point in enumerate(ring):
+                before, after = ring[i - 1], ring[(i + 1) % len(ring)]
+                pair = (before, after) if before <= after else (after, before)
+                seen = neighbours.setdefault(point, pair)
+                if seen != pair:
+                    junctions.add(point)
+        return junctions
+
+    def _arc(self, points: List[Point]) -> int:
+        key = tuple(points)
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        index = self._index.get(key[::-1])
+        if index is not None:
+            return ~index
+        self._index[key] = len(self.arcs)
+        self.arcs.append(points)
+        return len(self.arcs) - 1
+
+    def _cut(self, ring: Ring, junctions: set) -> List[int]:
+        cuts = [i for i, point in enumerate(ring) if point in junctions]
+        if not cuts:
+            # A ring touching no other ring is one closed arc. Start it at its
+            # smallest point so an identical ring (an enclave's hole) matches.
+            ring = _rotated(ring)
+            return [self._arc(ring + ring[:1])]
+        start = cuts[0]
+        ring = ring[start:] + ring[:start] + [ring[start]]
+        cuts = [i - start for i in cuts] + [len(ring) - 1]
+        return [self._arc(ring[a:b + 1]) for a, b in zip(cuts, cuts[1:])]
+
+    def simplify(self, tolerance: float) -> List[np.ndarray]:
+        """Every arc simplified to within ``tolerance`` degrees (Douglas-Peucker)."""
+
+        units = tolerance / min(self.scale)
+        return [_douglas_peucker(np.asarray(arc, dtype=np.int64), units) for arc in self.arcs]
+
+    def level(self, tolerance: float) -> Tuple[List[np.ndarray], Dict[str, List[List[List[int]]]]]:
+        """(arcs, geometries) at ``tolerance``: collapsed rings dropped, unused arcs pruned.
+
+        A ring that simplifies to no area (one whose arcs collapse onto the
+        same line) is dropped, and a polygon whose exterior ring collapses is
+        dropped with its holes.
+        """
+
+        arcs = self.simplify(tolerance)
+        geometries: Dict[str, List[List[List[int]]]] = {}
+        for feature_id, polygons in self.geometries.items():
+            kept = []
+            for exterior, *holes in polygons:
+                if _ring_area(_stitch(arcs, exterior)) != 0:
+                    kept.append([list(refs) for refs in (exterior, *holes) if _ring_area(_stitch(arcs, refs)) != 0])
+            geometries[feature_id] = kept
+
+        used = sorted({ref if ref >= 0 else ~ref for polygons in geometries.values()
+                       for polygon in polygons for refs in polygon for ref in refs})
+        remap = {old: new for new, old in enumerate(used)}
+        for polygons in geometries.values():
+            for polygon in polygons:
+                for refs in polygon:
+                    refs[:] = [remap[ref] if ref >= 0 else ~remap[~ref] for ref in refs]
+        return [arcs[i] for i in used], geometries
+
+    def topojson(self, arcs: List[np.ndarray], geometries: Dict[str, List[List[List[int]]]]) -> Dict[str, object]:
+        """One level (from ``level``) as TopoJSON: quantized, delta-encoded arcs."""
+
+        encoded = []
+        for arc in arcs:
+            deltas = np.diff(arc, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+            encoded.append(deltas.tolist())
+        return {
+            "type": "Topology",
+            "bbox": list(self.bbox),
+            "transform": {"scale": list(self.scale), "translate": list(self.bbox[:2])},
+            "objects": {OBJECT_NAME: {"type": "GeometryCollection", "geometries": [
+                _geometry(feature_id, self.names[feature_id], polygons, {"arcs": polygons})
+                for feature_id, polygons in geometries.items()
+            ]}},
+            "arcs": encoded,
+        }
+
+    def geojson(self, arcs: List[np.ndarray], geometries: Dict[str, List[List[List[int]]]]) -> Dict[str, object]:
+        """One level (from ``level``) as a GeoJSON FeatureCollection, each state a feature."""
+
+        x0, y0 = self.bbox[0], self.bbox[1]
+        sx, sy = self.scale
+        # Enough decimals to keep the grid's resolution, and no more.
+        digits = max(0, math.ceil(-math.log10(min(sx, sy))))
+
+        def ring(refs: List[int]) -> List[List[float]]:
+            return [[round(x0 + x * sx, digits), round(y0 + y * sy, digits)] for x, y in _stitch(arcs, refs)]
+
+        features = []
+        for feature_id, polygons in geometries.items():
+            coordinates = [[ring(refs) for refs in polygon] for polygon in polygons]
+            feature = _geometry(feature_id, self.names[feature_id], polygons, {"coordinates": coordinates})
+            geometry = {key: feature.pop(key) for key in ("type", "coordinates") if key in feature}
+            feature.update({"type": "Feature", "geometry": geometry if geometry.get("type") else None})
+            features.append(feature)
+        return {"type": "FeatureCollection", "bbox": list(self.bbox), "features": features}
+
+
+def _rotated(ring: Ring) -> Ring:
+    start = ring.index(min(ring))
+    return ring[start:] + ring[:start]
+
+
+def _stitch(arcs: List[np.ndarray], refs: List[int]) -> List[Point]:
+    points: List[Point] = []
+    for ref in refs:
+        arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+        points.extend(map(tuple, arc[1:].tolist() if points else arc.tolist()))
+    return points
+
+
+def _geometry(feature_id: str, name: str, polygons: List[list], body: Dict[str, object]) -> Dict[str, object]:
+    """Polygon/MultiPolygon (or null) geometry carrying ``body`` under the id and state name."""
+
+    key, value = next(iter(body.items()))
+    if not polygons:
+        kind, value = None, None
+    elif len(polygons) == 1:
+        kind, value = "Polygon", value[0]
+    else:
+        kind = "MultiPolygon"
+    geometry = {"type": kind, "id": feature_id, "properties": {"state": name}}
+    if kind is not None:
+        geometry[key] = value
+    return geometry
+
+
+def _douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """``points`` reduced to those deviating more than ``tolerance`` from the simplified line.
+
+    Endpoints are kept. A closed arc (a whole ring) keeps at least four
+    points, so islands shrink to a quadrilateral rather than vanish.
+    """
+
+    count = len(points)
+    if count <= 2 or tolerance <= 0:
+        return points
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    closed = bool((points[0] == points[-1]).all())
+    stack = [(0, count - 1, 2 if closed else 0)]
+    while stack:
+        first, last, forced = stack.pop()
+        if last - first < 2:
+            continue
+        inner = points[first + 1:last].astype(np.float64)
+        start, end = points[first].astype(np.float64), points[last].astype(np.float64)
+        direction = end - start
+        length = math.hypot(*direction)
+        offsets = inner - start
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(direction[0] * offsets[:, 1] - direction[1] * offsets[:, 0]) / length
+        farthest = int(distances.argmax())
+        if forced or distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split, max(forced - 1, 0)))
+            stack.append((split, last, max(forced - 1, 0)))
+    return points[keep]
+
+
+def _write(directory: str, stem: str, extension: str, content: bytes) -> Tuple[str, Dict[str, int]]:
+    """Write ``content`` under a content-hashed name with .gz/.br siblings; return (name, sizes)."""
+
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    name = f"{stem}.{digest}.{extension}"
+    path = os.path.join(directory, name)
+    sizes = {"raw": len(content)}
+    variants = {"gzip": (".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants["br"] = (".br", lambda data: brotli.compress(data, quality=11))
+    with open(path, "wb") as handle:
+        handle.write(content)
+    for encoding, (suffix, compress) in variants.items():
+        compressed = compress(content)
+        # Same rule as WhiteNoise's compressor: only keep variants that pay for themselves.
+        if len(compressed) < len(content) * 0.95:
+            with open(path + suffix, "wb") as handle:
+                handle.write(compressed)
+            sizes[encoding] = len(compressed)
+    return name, sizes
+
+
+def build(source: Dict[str, object], directory: str, stem: str, zooms: Sequence[int],
+          quantization: int = 10000, tolerance_px: float = 1.0,
+          name_fields: Sequence[str] = NAME_FIELDS) -> Dict[str, object]:
+    """Write per-zoom TopoJSON and GeoJSON for ``source`` into ``directory``; return the manifest.
+
+    Each zoom level is simplified to ``tolerance_px`` pixels at that zoom.
+    Files are named by content hash so they can be cached as immutable;
+    files listed by the previous manifest and not rebuilt are removed.
+    """
+
+    topology = Topology(source, quantization, name_fields)
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, os.path.basename(MANIFEST))
+    previous = _read(manifest_path) or {}
+
+    levels = []
+    for zoom in sorted(set(zooms)):
+        simplified = topology.level(tolerance_px * pixel_degrees(zoom))
+        level: Dict[str, object] = {"zoom": zoom, "sizes": {}}
+        for extension, document in (("topojson", topology.topojson(*simplified)), ("geojson", topology.geojson(*simplified))):
+            content = json.dumps(document, separators=(",", ":")).encode("utf-8")
+            level[extension], level["sizes"][extension] = _write(directory, f"{stem}.z{zoom}", extension, content)
+        levels.append(level)
+
+    manifest = {
+        "object": OBJECT_NAME,
+        "features": len(topology.names),
+        # Feature order of every level, which /api/v1/map classes follow.
+        "states": [[feature_id, name] for feature_id, name in topology.names.items()],
+        "bbox": list(topology.bbox),
+        "quantization": quantization,
+        "levels": levels,
+    }
+    with open(manifest_path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+
+    current = {level[extension] for level in levels for extension in ("topojson", "geojson")}
+    for level in previous.get("levels", []):
+        for extension in ("topojson", "geojson"):
+            name = level.get(extension)
+            if name and name not in current:
+                for suffix in ("", ".gz", ".br"):
+                    try:
+                        os.remove(os.path.join(directory, name + suffix))
+                    except OSError:
+                        pass
+    return manifest
+
+
+def _read(path: Optional[str]) -> Optional[Dict[str, object]]:
+    if not path:
+        return None
+    try:
+        with open(path, "rb") as handle:
+            return json.loads(handle.read())
+    except (OSError, ValueError):
+        return None
+
+
+_manifest: Dict[str, object] = {}
+
+
+def _fallback_states() -> List[Tuple[str, str]]:
+    collection = _read(finders.find(FALLBACK)) or {}
+    names = [_feature_name(feature.get("properties") or {}, NAME_FIELDS) for feature in collection.get("features", [])]
+    return [(slugify(name), name) for name in names]
+
+
+def _load() -> Dict[str, object]:
+    """The current manifest, re-read when the file changes."""
+
+    global _manifest
+    path = finders.find(MANIFEST)
+    try:
+        stamp = os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        stamp = None
+    if _manifest.get("key") == (path, stamp):
+        return _manifest
+
+    built = _read(path) if stamp is not None else None
+    if built:
+        directory = posixpath.dirname(MANIFEST)
+        data = {
+            "object": built.get("object", OBJECT_NAME),
+            "bbox": built.get("bbox"),
+            "levels": [
+                {"zoom": level["zoom"], **{extension: static(posixpath.join(directory, level[extension]))
+                                           for extension in ("topojson", "geojson")}}
+                for level in built.get("levels", [])
+            ],
+        }
+        states = [tuple(state) for state in built.get("states", [])]
+    else:
+        data = {"object": None, "bbox": None, "levels": [{"zoom": None, "geojson": static(FALLBACK)}]}
+        states = _fallback_states()
+    etag = hashlib.sha1(json.dumps([data, states], sort_keys=True).encode("utf-8")).hexdigest()[:24]
+    # Swapped in whole, so concurrent readers never see a half-updated entry.
+    _manifest = {"key": (path, stamp), "etag": etag, "data": {**data, "version": etag}, "states": states}
+    return _manifest
+
+
+def manifest() -> Tuple[str, Dict[str, object]]:
+    """(ETag, client manifest): which boundary file to load at each zoom.
+
+    Levels are ascending by zoom with static URLs for the TopoJSON and the
+    GeoJSON of each. Without a built manifest the raw demo GeoJSON is the
+    only level (``zoom`` null: use at every zoom). ``version`` changes with
+    the boundary files.
+    """
+
+    loaded = _load()
+    return loaded["etag"], loaded["data"]
+
+
+def boundaries() -> Tuple[str, List[Tuple[str, str]]]:
+    """(manifest version, [(feature id, state name)]) in the boundary files' feature order."""
+
+    loaded = _load()
+    return loaded["etag"], loaded["states"]
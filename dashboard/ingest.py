@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.utils.text import slugify
+
+from .models import Initiative, Scheme, State
+
+# Natural key of an initiative; re-loading a row with the same key updates it.
+NATURAL_KEY = ("name", "state", "scheme", "year")
+VALUE_FIELDS = (
+    "category", "status", "progress", "schools_impacted", "students_impacted",
+    "scholarships_awarded", "budget_utilized",
+)
+REQUIRED_COLUMNS = ("name", "state", "scheme", "year")
+
+# Short column names used by the CSV export, mapped onto model fields.
+COLUMN_ALIASES = {
+    "schools": "schools_impacted",
+    "students": "students_impacted",
+    "scholarships": "scholarships_awarded",
+    "budget": "budget_utilized",
+}
+
+
+class IngestError(ValueError):
+    """Raised for a source row that cannot be loaded."""
+
+
+VALUE_DEFAULTS: Dict[str, object] = {
+    "category": "", "status": "", "progress": 0.0, "schools_impacted": 0, "students_impacted": 0,
+    "scholarships_awarded": 0, "budget_utilized": 0.0,
+}
+
+
+def _progress(value: object) -> float:
+    text = str(value).strip()
+    # Exports write progress as "70%"; the model stores 0.0-1.0.
+    return float(text[:-1]) / 100 if text.endswith("%") else float(text)
+
+
+_COERCE: Dict[str, Callable[[object], object]] = {
+    "category": lambda value: str(value).strip(),
+    "status": lambda value: str(value).strip(),
+    "progress": _progress,
+    "schools_impacted": lambda value: int(float(value)),
+    "students_impacted": lambda value: int(float(value)),
+    "scholarships_awarded": lambda value: int(float(value)),
+    "budget_utilized": float,
+}
+
+
+def normalize_row(raw: Dict[str, object]) -> Dict[str, object]:
+    """Coerce one source record into model field values.
+
+    Value columns absent from the source are left out, so an upsert keeps
+    whatever the database already holds for them.
+    """
+
+    row = {COLUMN_ALIASES.get(key.strip().lower(), key.strip().lower()): value for key, value in raw.items() if key}
+    missing = [column for column in REQUIRED_COLUMNS if not row.get(column)]
+    if missing:
+        raise IngestError(f"missing {', '.join(missing)} in {raw!r}")
+    try:
+        result: Dict[str, object] = {
+            "name": str(row["name"]).strip(),
+            "state": str(row["state"]).strip(),
+            "scheme": str(row["scheme"]).strip(),
+            "year": int(row["year"]),
+        }
+        for name in VALUE_FIELDS:
+            if row.get(name) not in (None, ""):
+                result[name] = _COERCE[name](row[name])
+    except (TypeError, ValueError) as exc:
+        raise IngestError(f"bad value in {raw!r}: {exc}") from exc
+    return result
+
+
+def read_csv(path: Path) -> Iterator[Dict[str, object]]:
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        yield from csv.DictReader(handle)
+
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, object]]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_demo() -> Iterator[Dict[str, object]]:
+    from .data import get_dataset
+
+    yield from get_dataset().iter_initiatives()
+
+
+def read_source(source: str) -> Iterator[Dict[str, object]]:
+    """Records from ``demo`` or a .csv / .jsonl (.ndjson) file."""
+
+    if source == "demo":
+        return read_demo()
+    path = Path(source)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return read_csv(path)
+    if suffix in (".jsonl", ".ndjson"):
+        return read_jsonl(path)
+    raise IngestError(f"unsupported source {source!r} (expected 'demo', .csv or .jsonl)")
+
+
+def _chunks(rows: Iterable[Dict[str, object]], size: int) -> Iterator[List[Dict[str, object]]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class DimensionIds:
+    """name -> pk maps for states and schemes, creating missing ones in bulk."""
+
+    def __init__(self) -> None:
+        from .data import STATE_COORDINATES
+
+        self.coordinates = STATE_COORDINATES
+        self.states: Dict[str, int] = dict(State.objects.values_list("name", "id"))
+        self.schemes: Dict[str, int] = dict(Scheme.objects.values_list("name", "id"))
+
+    def ensure(self, rows: List[Dict[str, object]]) -> None:
+        new_states = {row["state"] for row in rows} - self.states.keys()
+        if new_states:
+            State.objects.bulk_create(
+                [
+                    State(
+                        name=name,
+                        slug=slugify(name),
+                        lat=self.coordinates.get(name, {}).get("lat"),
+                        lng=self.coordinates.get(name, {}).get("lng"),
+                    )
+                    for name in sorted(new_states)
+                ],
+                ignore_conflicts=True,
+            )
+            self.states.update(State.objects.filter(name__in=new_states).values_list("name", "id"))
+        new_schemes = {row["scheme"] for row in rows} - self.schemes.keys()
+        if new_schemes:
+            Scheme.objects.bulk_create(
+                [Scheme(name=name, slug=slugify(name)) for name in sorted(new_schemes)],
+                ignore_conflicts=True,
+            )
+            self.schemes.update(Scheme.objects.filter(name__in=new_schemes).values_list("name", "id"))
+
+    def backfill_coordinates(self) -> int:
+        """Fill lat/lng for known states that were created without them."""
+
+        missing = list(State.objects.filter(lat__isnull=True, name__in=list(self.coordinates)))
+        for state in missing:
+            state.lat = self.coordinates[state.name]["lat"]
+            state.lng = self.coordinates[state.name]["lng"]
+        return State.objects.bulk_update(missing, ["lat", "lng"]) if missing else 0
+
+
+def _dedupe(rows: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    # One statement may not upsert the same key twice; the last record wins.
+    latest = {tuple(row[key] for key in NATURAL_KEY): row for row in rows}
+    return list(latest.values()) if len(latest) != len(rows) else rows
+
+
+def _by_shape(rows: List[Dict[str, object]]) -> Dict[Tuple[str, ...], List[Dict[str, object]]]:
+    """Group a chunk by the value fields each row provides.
+
+    An upsert updates the same columns for every row, so each group gets its
+    own statement: a row updates exactly the columns it carries, whatever
+    its neighbours in the chunk look like.
+    """
+
+    shapes: Dict[Tuple[str, ...], List[Dict[str, object]]] = {}
+    for row in rows:
+        shapes.setdefault(tuple(name for name in VALUE_FIELDS if name in row), []).append(row)
+    return shapes
+
+
+def _bulk_upsert(rows: List[Dict[str, object]], dims: DimensionIds, batch_size: int) -> None:
+    for update_fields, group in _by_shape(rows).items():
+        Initiative.objects.bulk_create(
+            [
+                Initiative(
+                    name=row["name"],
+                    state_id=dims.states[row["state"]],
+                    scheme_id=dims.schemes[row["scheme"]],
+                    year=row["year"],
+                    **{name: row.get(name, default) for name, default in VALUE_DEFAULTS.items()},
+                )
+                for row in group
+            ],
+            batch_size=batch_size,
+            # With nothing to update, conflicting rows are simply left alone.
+            ignore_conflicts=not update_fields,
+            update_conflicts=bool(update_fields),
+            unique_fields=["name", "state", "scheme", "year"] if update_fields else None,
+            update_fields=list(update_fields) or None,
+        )
+
+
+_COPY_COLUMNS = ("name", "state_id", "scheme_id", "year") + VALUE_FIELDS
+
+
+def copy_supported() -> bool:
+    """COPY needs PostgreSQL through psycopg 3 (``cursor.copy``)."""
+
+    if connection.vendor != "postgresql":
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    return is_psycopg3
+
+
+def _copy_upsert(rows: List[Dict[str, object]], dims: DimensionIds) -> None:
+    """Stream the chunk into a temp table with COPY, then upsert it in one statement.
+
+    Rows whose values did not change are skipped, so re-running a load writes
+    (and bloats) nothing.
+    """
+
+    table = Initiative._meta.db_table
+    columns = ", ".join(_COPY_COLUMNS)
+    with connection.cursor() as cursor:
+        # Only the loaded columns: LIKE would copy ``id`` as NOT NULL without
+        # its identity default, and COPY leaves it out.
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS initiative_load ON COMMIT DELETE ROWS "
+            f"AS SELECT {columns} FROM {table} WITH NO DATA"
+        )
+        for present, group in _by_shape(rows).items():
+            if present:
+                updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in present)
+                changed = " OR ".join(f"{table}.{name} IS DISTINCT FROM EXCLUDED.{name}" for name in present)
+                conflict = f"DO UPDATE SET {updates} WHERE {changed}"
+            else:
+                conflict = "DO NOTHING"
+            # ON COMMIT only empties it when the outermost transaction ends; a load
+            # inside one (or several chunks or shapes in one) would re-insert earlier rows.
+            cursor.execute("TRUNCATE initiative_load")
+            with cursor.cursor.copy(f"COPY initiative_load ({columns}) FROM STDIN") as copy:
+                for row in group:
+                    copy.write_row((
+                        row["name"], dims.states[row["state"]], dims.schemes[row["scheme"]], row["year"],
+                        *(row.get(name, VALUE_DEFAULTS[name]) for name in VALUE_FIELDS),
+                    ))
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM initiative_load "
+                f"ON CONFLICT (name, state_id, scheme_id, year) {conflict}"
+            )
+
+
+@dataclass
+class LoadStats:
+    rows: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def load_initiatives(
+    records: Iterable[Dict[str, object]],
+    chunk_size: int = 5000,
+    batch_size: int = 1000,
+    use_copy: Optional[bool] = None,
+    progress: Optional[Callable[[LoadStats], None]] = None,
+    max_errors: int = 20,
+) -> LoadStats:
+    """Upsert initiatives on their natural key, one transaction per chunk.
+
+    ``use_copy`` defaults to COPY whenever the database supports it. Rows
+    that fail to parse are skipped and counted; once more than
+    ``max_errors`` have failed the load aborts with ``IngestError``.
+    """
+
+    stats = LoadStats()
+    dims = DimensionIds()
+    if use_copy is None:
+        use_copy = copy_supported()
+
+    def parsed() -> Iterator[Dict[str, object]]:
+        for record in records:
+            try:
+                yield normalize_row(record)
+            except IngestError as exc:
+                stats.skipped += 1
+                stats.errors.append(str(exc))
+                if stats.skipped > max_errors:
+                    raise IngestError(f"aborting after {stats.skipped} bad rows; last: {exc}") from exc
+
+    for chunk in _chunks(parsed(), chunk_size):
+        chunk = _dedupe(chunk)
+        with transaction.atomic():
+            dims.ensure(chunk)
+            if use_copy:
+                _copy_upsert(chunk, dims)
+            else:
+                _bulk_upsert(chunk, dims, batch_size)
+        stats.rows += len(chunk)
+        stats.chunks += 1
+        if progress is not None:
+            progress(stats)
+    dims.backfill_coordinates()
+    return stats
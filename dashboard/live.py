@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from django.conf import settings
+
+from .cache import FilterKey, get_payload_cache, normalize_filters
+from .encoding import dumps
+
+logger = logging.getLogger(__name__)
+
+# A snapshot is {"kpis": {card: value}, "map": [choropleth row with "state"]}.
+Snapshot = Dict[str, object]
+SnapshotFunc = Callable[[Dict[str, Optional[str]]], Awaitable[Snapshot]]
+
+RETRY_MS = 3000
+QUEUE_SIZE = 16
+
+
+def _options() -> Dict[str, float]:
+    return getattr(settings, "DASHBOARD_LIVE", {})
+
+
+def encode_event(event: str, version: int, data: Dict[str, object]) -> bytes:
+    """One server-sent event; the id is the data version, the client's resume cursor."""
+
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (version, event.encode("ascii"), dumps(data))
+
+
+def diff(previous: Snapshot, current: Snapshot) -> Optional[Dict[str, object]]:
+    """Changed KPI cards, changed map rows and removed states; None when nothing changed."""
+
+    kpis = {name: value for name, value in current["kpis"].items() if previous["kpis"].get(name) != value}
+    before = {row["state"]: row for row in previous["map"]}
+    after = {row["state"]: row for row in current["map"]}
+    changed = [row for state, row in after.items() if before.get(state) != row]
+    removed = [state for state in before if state not in after]
+    if not (kpis or changed or removed):
+        return None
+    return {"kpis": kpis, "map": changed, "removed": removed}
+
+
+class _Group:
+    """The subscribers to one filter set and the last snapshot they were sent."""
+
+    def __init__(self, filters: Dict[str, Optional[str]]) -> None:
+        self.filters = filters
+        self.queues: Set["asyncio.Queue[bytes]"] = set()
+        self.version: Optional[int] = None
+        self.snapshot: Optional[Snapshot] = None
+        self.event = b""  # ``snapshot`` encoded once for every new subscriber
+        self.started: Optional["asyncio.Future[None]"] = None
+
+    def publish(self, version: int, snapshot: Snapshot) -> Optional[bytes]:
+        """Adopt ``snapshot``; return the encoded delta from the previous one, if any."""
+
+        delta = diff(self.snapshot, snapshot) if self.snapshot is not None else None
+        self.version, self.snapshot = version, snapshot
+        self.event = encode_event("snapshot", version, snapshot)
+        return encode_event("delta", version, delta) if delta is not None else None
+
+
+class LiveHub:
+    """Fans data changes out to the live streams of one event loop.
+
+    Streams subscribe to a group per filter set. A single watcher task polls
+    the data version (a memory read for the local cache, one cache read per
+    interval for a shared one, however many clients are connected). On a
+    change every group is recomputed once and its delta encoded once; each
+    subscriber's queue receives the same bytes.
+    """
+
+    def __init__(self, compute: SnapshotFunc) -> None:
+        self.compute = compute
+        self.groups: Dict[FilterKey, _Group] = {}
+        self.watcher: Optional["asyncio.Task[None]"] = None
+
+    async def _start(self, group: _Group) -> None:
+        try:
+            version = await get_payload_cache().aversion()
+            group.publish(version, await self.compute(group.filters))
+        except BaseException:
+            # Forget the failed group; the next subscriber starts a fresh one.
+            key = normalize_filters(group.filters)
+            if self.groups.get(key) is group:
+                del self.groups[key]
+            raise
+
+    async def _advance(self, group: _Group, version: int) -> None:
+        message = group.publish(version, await self.compute(group.filters))
+        if message is None:
+            return
+        for queue in group.queues:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A stalled client gets the current snapshot instead of a backlog of deltas.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(group.event)
+
+    async def _watch(self) -> None:
+        while self.groups:
+            await asyncio.sleep(float(_options().get("POLL_INTERVAL", 1)))
+            try:
+                version = await get_payload_cache().aversion()
+                stale = [group for group in self.groups.values() if group.version not in (None, version)]
+                if stale:
+                    await asyncio.gather(*(self._advance(group, version) for group in stale))
+            except Exception:
+                logger.exception("Live update failed; retrying on the next poll")
+
+    def subscribe(self, filters: Dict[str, Optional[str]]) -> Tuple[_Group, "asyncio.Queue[bytes]"]:
+        key = normalize_filters(filters)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = _Group(filters)
+            group.started = asyncio.ensure_future(self._start(group))
+        queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+        group.queues.add(queue)
+        if self.watcher is None or self.watcher.done():
+            # A fresh context, so the watcher's queries are not billed to this request's profile.
+            self.watcher = contextvars.Context().run(asyncio.ensure_future, self._watch())
+        return group, queue
+
+    def unsubscribe(self, group: _Group, queue: "asyncio.Queue[bytes]") -> None:
+        group.queues.discard(queue)
+        key = normalize_filters(group.filters)
+        if not group.queues and self.groups.get(key) is group:
+            del self.groups[key]
+        if not self.groups:
+            if self.watcher is not None:
+                self.watcher.cancel()
+            _HUBS.pop(id(asyncio.get_running_loop()), None)
+
+
+_HUBS: Dict[int, LiveHub] = {}
+
+
+def _hub(compute: SnapshotFunc) -> LiveHub:
+    loop_id = id(asyncio.get_running_loop())  # queues and tasks belong to one loop
+    hub = _HUBS.get(loop_id)
+    if hub is None:
+        hub = _HUBS[loop_id] = LiveHub(compute)
+    return hub
+
+
+async def live_events(
+    compute: SnapshotFunc, filters: Dict[str, Optional[str]], since: Optional[int], once: bool = False
+) -> AsyncIterator[bytes]:
+    """Server-sent events for ``filters``: a ``snapshot``, then ``delta`` events.
+
+    The snapshot is skipped when ``since`` is already the current version.
+    Comment lines keep idle connections open. Streams end after
+    ``MAX_STREAM_SECONDS`` and the browser reconnects with its last event
+    id; with ``once`` the stream ends after the first event or after
+    ``LONG_POLL_TIMEOUT``, for long-polling.
+    """
+
+    options = _options()
+    loop = asyncio.get_running_loop()
+    idle = float(options.get("LONG_POLL_TIMEOUT", 25) if once else options.get("HEARTBEAT", 15))
+    deadline = loop.time() + float(options.get("MAX_STREAM_SECONDS", 300))
+    hub = _hub(compute)
+    group, queue = hub.subscribe(filters)
+    try:
+        yield b"retry: %d\n\n" % RETRY_MS
+        try:
+            await asyncio.shield(group.started)
+        except Exception:
+            # The browser reconnects after RETRY_MS and subscribes to a new group.
+            logger.exception("Live snapshot failed for %s", filters)
+            return
+        if since != group.version:
+            yield group.event
+            if once:
+                return
+        while loop.time() < deadline:
+            try:
+                message = await asyncio.wait_for(queue.get(), min(idle, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                if once:
+                    return
+                yield b": keep-alive\n\n"
+                continue
+            yield message
+            if once:
+                return
+    finally:
+        hub.unsubscribe(group, queue)
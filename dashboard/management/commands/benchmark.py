@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# (name, URL) pairs exercised at every scale. Exports are filtered so their
+# size tracks one state-year rather than the whole table.
+ENDPOINTS = (
+    ("overview", "/"),
+    ("dashboard-data", "/api/data/"),
+    ("dashboard-data-filtered", "/api/data/?state=Goa&year=2024"),
+    ("kpis", "/api/v1/kpis"),
+    ("kpis-filtered", "/api/v1/kpis?state=Kerala&scheme=SWAYAM"),
+    ("map", "/api/v1/map"),
+    ("initiatives-page", "/api/v1/initiatives?sort=-progress&page=3"),
+    ("compare-trends", "/api/v1/compare/trends?left=Goa&right=Kerala"),
+    ("search", "/api/v1/search?query=pm+sch"),
+    ("export-csv", "/api/v1/exports/data.csv?state=Goa&year=2024"),
+    ("report-download", "/reports/download/?state=Goa&year=2024"),
+    ("db-initiatives", "/api/v1/db/initiatives/"),
+    ("db-initiatives-flat", "/api/v1/db/initiatives/?pagination=cursor&fields=id,name,state,year"),
+    ("db-states", "/api/v1/db/states/"),
+)
+
+CLIENTS = ("test", "gunicorn")
+
+_SERVER_TIMING_QUERIES = re.compile(r'\bdb;dur=[\d.]+;desc="(\d+) queries"')
+
+# One sample: (status, elapsed ms, response bytes, queries or None).
+Sample = Tuple[int, float, int, Optional[int]]
+
+
+def _proc_status_kb(pid: int, field: str) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            for line in handle:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _smaps_kb(pid: int) -> Dict[str, int]:
+    """Pss and Private_* totals of a process, in KiB (Linux 4.14+)."""
+    fields: Dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as handle:
+            for line in handle:
+                name, _, rest = line.partition(":")
+                if name == "Pss" or name.startswith("Private_"):
+                    fields[name] = int(rest.split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    return fields
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else ():
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as handle:
+                # The command name may contain spaces; fields resume after its ")".
+                fields = handle.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def _own_memory() -> Dict[str, Optional[int]]:
+    peak = _proc_status_kb(os.getpid(), "VmHWM")
+    if peak is None:
+        # ru_maxrss is in KiB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak //= 1024
+    return {"rss_kb": _proc_status_kb(os.getpid(), "VmRSS"), "peak_rss_kb": peak}
+
+
+def _server_memory(pid: int) -> Dict[str, Optional[int]]:
+    workers = _children(pid)
+    rss = [_proc_status_kb(p, "VmRSS") for p in [pid, *workers]]
+    peaks = [_proc_status_kb(p, "VmHWM") for p in workers]
+    # RSS counts pages shared with the master in every worker; the private
+    # (copied or worker-allocated) and proportional set sizes do not.
+    smaps = [_smaps_kb(p) for p in workers]
+    private = [item.get("Private_Clean", 0) + item.get("Private_Dirty", 0) for item in smaps if item]
+    pss = [item["Pss"] for item in smaps if "Pss" in item]
+    return {
+        "workers": len(workers),
+        "rss_kb": sum(value for value in rss if value) or None,
+        "peak_rss_kb": max((value for value in peaks if value), default=None),
+        "worker_private_kb": round(sum(private) / len(private)) if private else None,
+        "worker_pss_kb": round(sum(pss) / len(pss)) if pss else None,
+    }
+
+
+def _summarize(samples: List[Sample], wall_seconds: float, cold: Sample) -> Dict[str, object]:
+    from dashboard.profiling import percentile
+
+    ordered = sorted(sample[1] for sample in samples)
+    queries = [sample[3] for sample in samples if sample[3] is not None]
+    return {
+        "requests": len(samples),
+        "statuses": sorted({sample[0] for sample in samples} | {cold[0]}),
+        "cold_ms": round(cold[1], 2),
+        "cold_queries": cold[3],
+        "p50_ms": percentile(ordered, 0.50),
+        "p95_ms": percentile(ordered, 0.95),
+        "p99_ms": percentile(ordered, 0.99),
+        "mean_ms": round(sum(ordered) / len(ordered), 2),
+        "throughput_rps": round(len(samples) / wall_seconds, 1) if wall_seconds > 0 else None,
+        "bytes": max(sample[2] for sample in samples),
+        "queries": max(queries) if queries else None,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database at several multiples of the demo data and measure "
+        "latency percentiles, throughput, memory and query counts of the main pages "
+        "and API endpoints, through the Django test client and a local gunicorn"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="1,100,1000", help="Comma-separated multiples of the demo data.")
+        parser.add_argument("--requests", type=int, default=20, help="Timed requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per endpoint after the cold one.")
+        parser.add_argument("--client", choices=(*CLIENTS, "both"), default="both")
+        parser.add_argument("--endpoint", action="append", default=[], help="Only run these endpoints (repeatable).")
+        parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes.")
+        parser.add_argument(
+            "--server", choices=("asgi", "wsgi"), default="asgi",
+            help="Run gunicorn with uvicorn workers on the ASGI app (as deployed) or sync workers on WSGI.",
+        )
+        parser.add_argument(
+            "--no-preload", action="store_true",
+            help="Let each gunicorn worker import the app itself instead of forking a warmed-up master.",
+        )
+        parser.add_argument("--concurrency", type=int, default=4, help="Concurrent requests against gunicorn.")
+        parser.add_argument("--output", help="Results file (default: var/benchmarks/<timestamp>.json).")
+        parser.add_argument("--baseline", help="Earlier results file to compare against.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95 slowdown.")
+        parser.add_argument(
+            "--min-delta-ms", type=float, default=5.0, help="Ignore p95 slowdowns smaller than this."
+        )
+        parser.add_argument("--keepdb", action="store_true", help="Keep (and reuse) the benchmark database.")
+
+    def handle(self, *args, **options):
+        try:
+            scales = sorted({int(value) for value in options["scales"].split(",") if value.strip()})
+        except ValueError:
+            raise CommandError("--scales must be comma-separated integers")
+        if not scales or scales[0] < 1:
+            raise CommandError("--scales must be positive")
+        endpoints = [item for item in ENDPOINTS if not options["endpoint"] or item[0] in options["endpoint"]]
+        unknown = set(options["endpoint"]) - {name for name, _ in ENDPOINTS}
+        if unknown:
+            raise CommandError(f"unknown endpoint(s): {', '.join(sorted(unknown))}")
+
+        clients = list(CLIENTS) if options["client"] == "both" else [options["client"]]
+        if "gunicorn" in clients and shutil.which("gunicorn") is None:
+            if options["client"] == "gunicorn":
+                raise CommandError("gunicorn is not installed")
+            self.stderr.write(self.style.WARNING("gunicorn is not installed; running the test client only"))
+            clients.remove("gunicorn")
+
+        baseline = self._load(options["baseline"]) if options["baseline"] else None
+        output = Path(options["output"] or Path(settings.BASE_DIR) / "var" / "benchmarks" / (
+            datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json"
+        ))
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        old_name = self._setup_database(output.parent, options["keepdb"])
+        runs = []
+        try:
+            for scale in scales:
+                rows = self._seed(scale)
+                for client in clients:
+                    self.stdout.write(self.style.MIGRATE_HEADING(f"{client} client, {scale}x demo data ({rows} rows)"))
+                    if client == "test":
+                        endpoint_results, memory = self._run_test_client(endpoints, options)
+                    else:
+                        endpoint_results, memory = self._run_gunicorn(endpoints, options)
+                    runs.append({"client": client, "scale": scale, "rows": rows, **memory, "endpoints": endpoint_results})
+                    self._print_run(runs[-1])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+
+        report = {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "python": sys.version.split()[0],
+            "requests": options["requests"],
+            "warmup": options["warmup"],
+            "concurrency": options["concurrency"],
+            "workers": options["workers"],
+            "server": options["server"],
+            "preload": not options["no_preload"],
+            "runs": runs,
+        }
+        output.write_text(json.dumps(report, indent=2))
+        self.stdout.write(f"Results written to {output}")
+        if baseline is not None:
+            self._compare(report, baseline, options["tolerance"], options["min_delta_ms"])
+
+    # --- database ---
+
+    def _setup_database(self, directory: Path, keepdb: bool) -> str:
+        old_name = connection.settings_dict["NAME"]
+        if connection.vendor == "sqlite":
+            # A file, not :memory:, so a gunicorn process can open the same data.
+            connection.settings_dict["TEST"]["NAME"] = str(directory / "benchmark.sqlite3")
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+        return old_name
+
+    def _seed(self, scale: int) -> int:
+        from dashboard.cache import bump_data_version
+        from dashboard.cube import refresh_cube
+        from dashboard.data import DemoDataset
+        from dashboard.ingest import load_initiatives
+        from dashboard.models import Initiative
+        from dashboard.search import reset_search_index
+
+        dataset = DemoDataset(districts=scale)
+        seeded = Initiative.objects.count() // dataset.base_count
+        if seeded > scale:
+            raise CommandError(f"the kept database already holds {seeded}x the demo data; drop --keepdb")
+        if seeded < scale:
+            stats = load_initiatives(dataset.iter_initiatives(first_district=seeded))
+            self.stdout.write(f"Seeded {stats.rows} rows in {stats.elapsed:.1f}s ({stats.rows_per_second:,.0f} rows/s)")
+        refresh_cube()
+        bump_data_version()
+        reset_search_index()
+        return Initiative.objects.count()
+
+    # --- clients ---
+
+    def _run_test_client(self, endpoints, options) -> Tuple[Dict[str, object], Dict[str, Optional[int]]]:
+        from django.test import Client
+
+        client = Client(raise_request_exception=False, HTTP_HOST="localhost")
+
+        def fetch(url: str) -> Sample:
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(url)
+                body = b"".join(response.streaming_content) if response.streaming else response.content
+                elapsed = (time.perf_counter() - started) * 1000
+            return response.status_code, elapsed, len(body), len(queries)
+
+        results = {}
+        for name, url in endpoints:
+            cold = fetch(url)
+            for _ in range(options["warmup"]):
+                fetch(url)
+            samples = [fetch(url) for _ in range(max(1, options["requests"]))]
+            # Serial requests: throughput is simply the inverse of the mean latency.
+            results[name] = {"url": url, **_summarize(samples, sum(s[1] for s in samples) / 1000, cold)}
+        return results, _own_memory()
+
+    def _run_gunicorn(self, endpoints, options) -> Tuple[Dict[str, object], Dict[str, Optional[int]]]:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        env = dict(
+            os.environ,
+            DASHBOARD_BENCH_DATABASE=json.dumps(connection.settings_dict, default=str),
+            DASHBOARD_PRELOAD="0" if options["no_preload"] else "1",
+        )
+        command = [
+            shutil.which("gunicorn"), "-c", "python:mhrd_dashboard.gunicorn_conf",
+            f"dashboard.benchmark_{options['server']}:application",
+            "--bind", f"127.0.0.1:{port}", "--workers", str(max(1, options["workers"])),
+            "--worker-class", "uvicorn.workers.UvicornWorker" if options["server"] == "asgi" else "sync",
+            "--log-level", "warning",
+        ]
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            command,
+            cwd=str(settings.BASE_DIR), env=env, stderr=subprocess.PIPE, text=True,
+        )
+        base = f"http://127.0.0.1:{port}"
+        try:
+            self._wait_until_ready(server, base + "/api/v1/health")
+            startup_ms = round((time.perf_counter() - started) * 1000, 1)
+            results = {}
+            with ThreadPoolExecutor(max_workers=max(1, options["concurrency"])) as pool:
+                for name, url in endpoints:
+                    cold = self._http_get(base + url)
+                    list(pool.map(self._http_get, [base + url] * options["warmup"]))
+                    started = time.perf_counter()
+                    samples = list(pool.map(self._http_get, [base + url] * max(1, options["requests"])))
+                    wall = time.perf_counter() - started
+                    results[name] = {"url": url, **_summarize(samples, wall, cold)}
+            return results, {"startup_ms": startup_ms, **_server_memory(server.pid)}
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+
+    @staticmethod
+    def _http_get(url: str) -> Sample:
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=120) as response:
+                status, body, timing = response.status, response.read(), response.headers.get("Server-Timing", "")
+        except urllib.error.HTTPError as exc:
+            status, body, timing = exc.code, exc.read(), exc.headers.get("Server-Timing", "")
+        elapsed = (time.perf_counter() - started) * 1000
+        match = _SERVER_TIMING_QUERIES.search(timing or "")
+        return status, elapsed, len(body), int(match.group(1)) if match else None
+
+    @staticmethod
+    def _wait_until_ready(server: subprocess.Popen, url: str, timeout: float = 60.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {server.returncode}:\n{server.stderr.read()}")
+            try:
+                with urllib.request.urlopen(url, timeout=5):
+                    return
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        raise CommandError(f"gunicorn did not answer {url} within {timeout:.0f}s")
+
+    # --- reporting ---
+
+    def _print_run(self, run: Dict[str, object]) -> None:
+        self.stdout.write(
+            f"  {'endpoint':<24} {'cold':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'queries':>8} {'bytes':>10}"
+        )
+        for name, result in run["endpoints"].items():
+            queries = "-" if result["queries"] is None else f"{result['cold_queries']}/{result['queries']}"
+            line = (
+                f"  {name:<24} {result['cold_ms']:>8.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['throughput_rps'] or 0:>8.1f} {queries:>8} {result['bytes']:>10}"
+            )
+            failed = any(status >= 400 for status in result["statuses"])
+            self.stdout.write(self.style.ERROR(line) if failed else line)
+        if "workers" in run:
+            self.stdout.write(
+                f"  started in {run['startup_ms']:,.0f} ms, peak RSS per worker {run['peak_rss_kb'] or 0:,} KiB, "
+                f"RSS of master and {run['workers']} workers {run['rss_kb'] or 0:,} KiB"
+            )
+            if run["worker_pss_kb"] is not None:
+                self.stdout.write(
+                    f"  per worker: private {run['worker_private_kb']:,} KiB, PSS {run['worker_pss_kb']:,} KiB"
+                )
+        else:
+            self.stdout.write(f"  peak RSS {run['peak_rss_kb'] or 0:,} KiB, current RSS {run['rss_kb'] or 0:,} KiB")
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, object]:
+        try:
+            with open(path) as handle:
+                return json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"cannot read baseline {path}: {exc}") from exc
+
+    def _compare(self, report, baseline, tolerance: float, min_delta_ms: float) -> None:
+        previous = {(run["client"], run["scale"]): run for run in baseline.get("runs", [])}
+        regressions = compared = 0
+        for run in report["runs"]:
+            before = previous.get((run["client"], run["scale"]))
+            if before is None:
+                continue
+            for name, result in run["endpoints"].items():
+                old = before["endpoints"].get(name)
+                if old is None:
+                    continue
+                compared += 1
+                label = f"{run['client']} {run['scale']}x {name}"
+                slower = result["p95_ms"] - old["p95_ms"]
+                if result["p95_ms"] > old["p95_ms"] * (1 + tolerance) and slower > min_delta_ms:
+                    regressions += 1
+                    self.stdout.write(self.style.ERROR(
+                        f"SLOWER   {label}: p95 {old['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms"
+                    ))
+                for field in ("cold_queries", "queries"):
+                    if None not in (result[field], old.get(field)) and result[field] > old[field]:
+                        regressions += 1
+                        self.stdout.write(self.style.ERROR(
+                            f"QUERIES  {label}: {field} {old[field]} -> {result[field]}"
+                        ))
+        if not compared:
+            self.stderr.write(self.style.WARNING("the baseline shares no client/scale/endpoint with this run"))
+        elif regressions:
+            raise CommandError(f"{regressions} regression(s) against the baseline")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"No regressions across {compared} endpoint comparisons"))
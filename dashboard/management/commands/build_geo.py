@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.geo import MANIFEST, NAME_FIELDS, build
+
+
+class Command(BaseCommand):
+    help = (
+        "Build per-zoom simplified GeoJSON and quantized TopoJSON (with .gz/.br variants) "
+        "from a state boundary GeoJSON, and the manifest /api/v1/geo serves"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Boundary GeoJSON FeatureCollection, one or more features per state")
+        parser.add_argument(
+            "--output",
+            default=os.path.join(settings.BASE_DIR, "static", os.path.dirname(MANIFEST)),
+            help="Directory for the built files; must be the geo/ directory of a static files root",
+        )
+        parser.add_argument("--name", help="File name stem (default: the source file name)")
+        parser.add_argument("--zooms", type=int, nargs="+", default=[4, 6, 8],
+                            help="Map zoom levels to build a simplification for")
+        parser.add_argument("--quantization", type=int, default=10000,
+                            help="Grid size per axis for TopoJSON coordinates")
+        parser.add_argument("--tolerance", type=float, default=1.0,
+                            help="Simplification tolerance in screen pixels at each zoom")
+        parser.add_argument("--name-field", action="append", dest="name_fields",
+                            help=f"Property holding the state name (repeatable; default: {', '.join(NAME_FIELDS)})")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options["source"], "rb") as handle:
+                source = json.loads(handle.read())
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read {options['source']}: {exc}")
+        if options["quantization"] < 2:
+            raise CommandError("--quantization must be at least 2")
+
+        stem = options["name"] or os.path.splitext(os.path.basename(options["source"]))[0]
+        try:
+            manifest = build(
+                source,
+                options["output"],
+                stem,
+                options["zooms"],
+                quantization=options["quantization"],
+                tolerance_px=options["tolerance"],
+                name_fields=options["name_fields"] or NAME_FIELDS,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        raw = os.path.getsize(options["source"])
+        for level in manifest["levels"]:
+            sizes = level["sizes"]
+            self.stdout.write(
+                f"  zoom {level['zoom']:>2}: " + ", ".join(
+                    f"{extension} {sizes[extension]['raw'] / 1024:.1f} KB"
+                    + "".join(f" / {encoding} {sizes[extension][encoding] / 1024:.1f} KB"
+                              for encoding in ("gzip", "br") if encoding in sizes[extension])
+                    for extension in ("topojson", "geojson")
+                )
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {len(manifest['levels'])} levels for {manifest['features']} states "
+            f"from {raw / 1024:.1f} KB in {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+from itertools import combinations
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+FILTERS = ("year", "state", "scheme", "category")
+
+# How each backend reports a full scan of a table in EXPLAIN output.
+SEQ_SCAN_PATTERNS = {
+    "postgresql": r"Seq Scan on {table}\b",
+    "sqlite": r"\bSCAN {table}\b",
+}
+
+# How each backend reports an index range seek on the leading keyset column,
+# rather than a walk of a whole index from its first entry.
+KEYSET_SEEK_PATTERNS = {
+    "postgresql": r"Index (?:Only )?Scan (?:using|on) \w+(?: on {table})?.*\n\s+Index Cond: \({field} >=",
+    "sqlite": r"\bSEARCH {table} USING (?:COVERING )?INDEX \w+ \({field}>",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every API filter combination on Initiative and fail if any plan "
+        "falls back to a sequential scan of the initiative table, or if a keyset "
+        "page walks its index from the start"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", action="store_true", help="Load the demo data first if the table is empty.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan, not only failures.")
+
+    def handle(self, *args, **options):
+        from dashboard.api import InitiativeViewSet
+        from dashboard.models import Initiative
+        from dashboard.pagination import KeysetPagination
+        from dashboard.queries import initiative_queryset
+
+        vendor = connection.vendor
+        if vendor not in SEQ_SCAN_PATTERNS:
+            raise CommandError(f"unsupported database backend {vendor!r}")
+        if not Initiative.objects.exists():
+            if not options["seed"]:
+                raise CommandError("the initiative table is empty; seed it or pass --seed")
+            call_command("load_initiatives", "demo", stdout=self.stdout, stderr=self.stderr)
+
+        sample = Initiative.objects.select_related("state", "scheme").order_by("id").first()
+        values = {
+            "year": str(sample.year),
+            "state": sample.state.name,
+            "scheme": sample.scheme.name,
+            "category": sample.category,
+        }
+        seq_scan = re.compile(SEQ_SCAN_PATTERNS[vendor].format(table=re.escape(Initiative._meta.db_table)))
+        factory = RequestFactory()
+
+        queries = []
+        for size in range(1, len(FILTERS) + 1):
+            for names in combinations(FILTERS, size):
+                filters = {name: (values[name] if name in names else None) for name in FILTERS}
+                label = "&".join(f"{name}={values[name]}" for name in names)
+                queries.append((f"views  {label}", initiative_queryset(filters)))
+                viewset = InitiativeViewSet()
+                viewset.request = Request(factory.get("/api/initiatives/", {name: values[name] for name in names}))
+                queries.append((f"api    {label}", viewset.get_queryset()))
+
+        paginator = KeysetPagination()
+        key = [getattr(sample, field) for field in paginator.ordering]
+        viewset = InitiativeViewSet()
+        viewset.request = Request(factory.get("/api/initiatives/"))
+        keyset = paginator.page_queryset(viewset.get_queryset(), key, paginator.page_size)
+        keyset_seek = re.compile(
+            KEYSET_SEEK_PATTERNS[vendor].format(
+                table=re.escape(Initiative._meta.db_table),
+                field=re.escape(Initiative._meta.get_field(paginator.ordering[0]).column),
+            )
+        )
+
+        failures = []
+        with connection.cursor() as cursor:
+            if vendor == "postgresql":
+                # Tiny seeded tables are cheaper to scan, so make the planner show
+                # whether an index *can* serve the query rather than whether it would.
+                cursor.execute("SET enable_seqscan = off")
+        try:
+            for label, qs in queries:
+                plan = qs.explain()
+                if seq_scan.search(plan):
+                    failures.append(label)
+                    self.stdout.write(self.style.ERROR(f"SEQ SCAN  {label}"))
+                    self.stdout.write(plan)
+                else:
+                    self.stdout.write(f"ok        {label}")
+                    if options["verbose_plans"]:
+                        self.stdout.write(plan)
+            plan = keyset.explain()
+            if keyset_seek.search(plan):
+                self.stdout.write("ok        api    keyset cursor")
+                if options["verbose_plans"]:
+                    self.stdout.write(plan)
+            else:
+                failures.append("keyset cursor")
+                self.stdout.write(self.style.ERROR("NO SEEK   api    keyset cursor"))
+                self.stdout.write(plan)
+        finally:
+            if vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("RESET enable_seqscan")
+
+        if failures:
+            raise CommandError(f"{len(failures)} of {len(queries) + 1} plans scan the whole initiative table or index")
+        self.stdout.write(self.style.SUCCESS(f"All {len(queries)} filter combinations and the keyset cursor use an index"))
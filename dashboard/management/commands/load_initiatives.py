@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.cache import bump_data_version
+from dashboard.cube import refresh_cube
+from dashboard.ingest import IngestError, LoadStats, copy_supported, load_initiatives, read_source
+from dashboard.search import reset_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load initiatives from CSV/JSONL files or the demo data, upserting on "
+        "(name, state, scheme, year) so re-runs are idempotent"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("sources", nargs="+", help="'demo', or paths to .csv / .jsonl files.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per transaction.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per INSERT when not using COPY.")
+        parser.add_argument("--no-copy", action="store_true", help="Use bulk_create even on PostgreSQL.")
+        parser.add_argument("--max-errors", type=int, default=20, help="Abort after this many unparseable rows.")
+
+    def handle(self, *args, **options):
+        use_copy = copy_supported() and not options["no_copy"]
+        self.stdout.write(f"Loading with {'COPY' if use_copy else 'bulk_create'}, {options['chunk_size']} rows per transaction")
+        total = LoadStats()
+        try:
+            for source in options["sources"]:
+                stats = load_initiatives(
+                    read_source(source),
+                    chunk_size=max(1, options["chunk_size"]),
+                    batch_size=max(1, options["batch_size"]),
+                    use_copy=use_copy,
+                    progress=self._progress(source),
+                    max_errors=options["max_errors"],
+                )
+                for error in stats.errors:
+                    self.stderr.write(f"{source}: skipped {error}")
+                self.stdout.write(
+                    f"{source}: {stats.rows} rows in {stats.elapsed:.2f}s "
+                    f"({stats.rows_per_second:,.0f} rows/s), {stats.skipped} skipped"
+                )
+                total.rows += stats.rows
+                total.skipped += stats.skipped
+        except (IngestError, OSError) as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            # bulk writes bypass model signals, so rebuild derived data here.
+            cells = refresh_cube()
+            self.stdout.write(f"Refreshed aggregate cube: {cells} cells")
+            bump_data_version()
+            reset_search_index()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {total.rows} initiatives in {total.elapsed:.2f}s ({total.rows_per_second:,.0f} rows/s)"
+        ))
+
+    def _progress(self, source: str):
+        def report(stats: LoadStats) -> None:
+            self.stdout.write(
+                f"  {source}: chunk {stats.chunks}, {stats.rows} rows, {stats.rows_per_second:,.0f} rows/s"
+            )
+        return report
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+# Worker processes are spawned and re-import this module before Django is set
+# up, so dashboard models are only imported inside functions.
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def _run(report_id: str) -> str:
+    from dashboard.reports import run_report
+
+    try:
+        return run_report(report_id)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Process queued report jobs, building CSV/PDF artifacts in a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=getattr(settings, "DASHBOARD_REPORT_WORKERS", 2),
+            help="Number of worker processes building reports.",
+        )
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain the queue and exit instead of polling forever.")
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=getattr(settings, "DASHBOARD_REPORTS_STALE_AFTER", 900),
+            help="Requeue reports left 'running' for longer than this many seconds.",
+        )
+        parser.add_argument(
+            "--requeue-interval",
+            type=float,
+            default=60.0,
+            help="Seconds between checks for stale reports while the worker runs.",
+        )
+
+    def handle(self, *args, **options):
+        from dashboard.models import Report
+        from dashboard.reports import beat, claim_next_report, heartbeat_interval, requeue_stale_reports
+
+        processes = max(1, options["processes"])
+        stale_after = timedelta(seconds=options["stale_after"])
+        next_requeue = next_beat = 0.0
+
+        # Spawned children set Django up themselves and open their own DB connections.
+        context = multiprocessing.get_context("spawn")
+        pending = {}
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context, initializer=_init_worker) as pool:
+            while True:
+                # Reports in flight here keep beating, so no other worker takes them for stale.
+                if pending and time.monotonic() >= next_beat:
+                    beat(pending.values())
+                    next_beat = time.monotonic() + heartbeat_interval()
+                # Checked on a timer, so a report orphaned by another worker's crash is retried too.
+                if time.monotonic() >= next_requeue:
+                    requeued = requeue_stale_reports(stale_after)
+                    if requeued:
+                        self.stdout.write(f"Requeued {requeued} stale report(s).")
+                    next_requeue = time.monotonic() + options["requeue_interval"]
+
+                while len(pending) < processes:
+                    report = claim_next_report()
+                    if report is None:
+                        break
+                    self.stdout.write(f"Running {report.report_id} (attempt {report.attempts})")
+                    pending[pool.submit(_run, report.report_id)] = report.report_id
+
+                if not pending:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                done, _ = wait(pending, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                for future in done:
+                    report_id = pending.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception as exc:  # worker process died
+                        Report.objects.filter(report_id=report_id, status=Report.STATUS_RUNNING).update(
+                            status=Report.STATUS_FAILED, error=f"worker error: {exc!r}"
+                        )
+                        self.stderr.write(f"{report_id}: worker error {exc!r}")
+                        continue
+                    style = self.style.SUCCESS if status == "ready" else self.style.ERROR
+                    self.stdout.write(style(f"{report_id}: {status}"))
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from dashboard.cache import bump_data_version
+from dashboard.cube import refresh_cube
+
+
+class Command(BaseCommand):
+    help = "Rebuild the pre-aggregated initiative cube (every year/state/scheme/category cell and rollup)"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        cells = refresh_cube()
+        bump_data_version()
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed aggregate cube: {cells} cells in {time.perf_counter() - started:.2f}s"
+        ))
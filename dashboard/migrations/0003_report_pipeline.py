@@ -0,0 +1,47 @@
+# Generated by Django 4.2.5 on 2026-10-17 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_report'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='artifacts',
+            field=models.JSONField(blank=True, default=dict, help_text='format -> file name under DASHBOARD_REPORTS_ROOT'),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='report',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='report',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('ready', 'Ready'), ('failed', 'Failed')], default='queued', max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['status', 'created_at'], name='dashboard_r_status_1036ac_idx'),
+        ),
+    ]
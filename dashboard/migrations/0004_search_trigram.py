@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# Trigram support for the Postgres search backend. Other databases use the
+# in-process index, so these statements only run on PostgreSQL.
+
+FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS dashboard_initiative_name_trgm ON dashboard_initiative USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS dashboard_state_name_trgm ON dashboard_state USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS dashboard_scheme_name_trgm ON dashboard_scheme USING gin (name gin_trgm_ops)",
+]
+
+BACKWARD = [
+    "DROP INDEX IF EXISTS dashboard_scheme_name_trgm",
+    "DROP INDEX IF EXISTS dashboard_state_name_trgm",
+    "DROP INDEX IF EXISTS dashboard_initiative_name_trgm",
+]
+
+
+def _run(statements):
+    def apply(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_report_pipeline'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FORWARD), _run(BACKWARD)),
+    ]
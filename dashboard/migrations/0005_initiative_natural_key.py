@@ -0,0 +1,34 @@
+# Generated by Django 4.2.5 on 2026-10-17 03:37
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def drop_duplicate_initiatives(apps, schema_editor):
+    # get_or_create imports never produced duplicates, but hand-entered rows
+    # may have; keep the oldest row for each natural key.
+    Initiative = apps.get_model('dashboard', 'Initiative')
+    duplicates = (
+        Initiative.objects.values('name', 'state', 'scheme', 'year')
+        .annotate(keep=Min('id'), rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    for group in duplicates:
+        Initiative.objects.filter(
+            name=group['name'], state=group['state'], scheme=group['scheme'], year=group['year'],
+        ).exclude(id=group['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_search_trigram'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_initiatives, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='initiative',
+            constraint=models.UniqueConstraint(fields=('name', 'state', 'scheme', 'year'), name='initiative_natural_key'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.5 on 2026-10-17 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_initiative_natural_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InitiativeAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(default=0)),
+                ('state', models.CharField(blank=True, default='', max_length=100)),
+                ('scheme', models.CharField(blank=True, default='', max_length=150)),
+                ('category', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.IntegerField(default=0)),
+                ('progress', models.FloatField(default=0, help_text='Sum of initiative progress')),
+                ('schools_impacted', models.BigIntegerField(default=0)),
+                ('students_impacted', models.BigIntegerField(default=0)),
+                ('scholarships_awarded', models.BigIntegerField(default=0)),
+                ('budget_utilized', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='initiativeaggregate',
+            constraint=models.UniqueConstraint(fields=('year', 'state', 'scheme', 'category'), name='initiative_aggregate_cell'),
+        ),
+    ]
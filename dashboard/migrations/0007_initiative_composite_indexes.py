@@ -0,0 +1,25 @@
+# Generated by Django 4.2.5 on 2026-10-17 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_initiative_aggregate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='initiative',
+            index=models.Index(fields=['year', 'state'], name='initiative_year_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='initiative',
+            index=models.Index(fields=['year', 'scheme'], name='initiative_year_scheme_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='initiative',
+            index=models.Index(fields=['state', 'scheme', 'year'], name='initiative_st_sch_year_idx'),
+        ),
+    ]
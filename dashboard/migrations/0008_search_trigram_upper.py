@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# ``name__icontains`` compiles to ``UPPER("name"::text) LIKE UPPER(%s)``, which
+# the plain ``gin (name gin_trgm_ops)`` indexes of 0004 cannot serve. Index the
+# expression the search backend actually filters on. PostgreSQL only, as 0004.
+
+TABLES = ("dashboard_initiative", "dashboard_state", "dashboard_scheme")
+
+FORWARD = [
+    statement
+    for table in TABLES
+    for statement in (
+        f"CREATE INDEX IF NOT EXISTS {table}_name_upper_trgm ON {table} USING gin ((UPPER(name::text)) gin_trgm_ops)",
+        f"DROP INDEX IF EXISTS {table}_name_trgm",
+    )
+]
+
+BACKWARD = [
+    statement
+    for table in TABLES
+    for statement in (
+        f"CREATE INDEX IF NOT EXISTS {table}_name_trgm ON {table} USING gin (name gin_trgm_ops)",
+        f"DROP INDEX IF EXISTS {table}_name_upper_trgm",
+    )
+]
+
+
+def _run(statements):
+    def apply(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_initiative_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FORWARD), _run(BACKWARD)),
+    ]
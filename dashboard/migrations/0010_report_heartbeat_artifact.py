@@ -0,0 +1,32 @@
+# Generated by Django 4.2.5 on 2026-10-17 05:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='last sign of life from the process building it', null=True),
+        ),
+        migrations.CreateModel(
+            name='ReportArtifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format', models.CharField(max_length=8)),
+                ('content', models.BinaryField()),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='dashboard.report')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='reportartifact',
+            constraint=models.UniqueConstraint(fields=('report', 'format'), name='report_artifact_format'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.5 on 2026-10-17 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_report_heartbeat_artifact'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='initiative',
+            index=models.Index(fields=['year', 'state', 'id'], name='initiative_year_state_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='initiative',
+            name='initiative_year_state_idx',
+        ),
+    ]
@@ -47,24 +47,108 @@ class Initiative(models.Model):
             models.Index(fields=["year"]),
             models.Index(fields=["category"]),
             models.Index(fields=["status"]),
+            # Composite indexes matching the dashboard filter combinations.
+            # Also the keyset pagination order; its (year, state) prefix serves the filters.
+            models.Index(fields=["year", "state", "id"], name="initiative_year_state_id_idx"),
+            models.Index(fields=["year", "scheme"], name="initiative_year_scheme_idx"),
+            models.Index(fields=["state", "scheme", "year"], name="initiative_st_sch_year_idx"),
+        ]
+        constraints = [
+            # Natural key used by the bulk loader's upserts.
+            models.UniqueConstraint(fields=["name", "state", "scheme", "year"], name="initiative_natural_key"),
         ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.name} ({self.year})"
 
 
+class InitiativeAggregate(models.Model):
+    """Materialized initiative totals for one (year, state, scheme, category) cell.
+
+    Rollup levels are stored as extra cells: year 0 and empty names mean
+    "all", so the all-India total is the (0, '', '', '') cell. Maintained by
+    ``dashboard.cube``.
+    """
+
+    year = models.IntegerField(default=0)
+    state = models.CharField(max_length=100, blank=True, default='')
+    scheme = models.CharField(max_length=150, blank=True, default='')
+    category = models.CharField(max_length=100, blank=True, default='')
+    count = models.IntegerField(default=0)
+    progress = models.FloatField(default=0, help_text='Sum of initiative progress')
+    schools_impacted = models.BigIntegerField(default=0)
+    students_impacted = models.BigIntegerField(default=0)
+    scholarships_awarded = models.BigIntegerField(default=0)
+    budget_utilized = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["year", "state", "scheme", "category"], name="initiative_aggregate_cell"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.year or '*'} / {self.state or '*'} / {self.scheme or '*'} / {self.category or '*'}"
+
+
+class DataVersion(models.Model):
+    """The dashboard data version, one row shared by every process.
+
+    ``dashboard.cache`` bumps it when the data changes and each worker
+    re-reads it at most every ``DASHBOARD_CACHE['VERSION_TTL']`` seconds.
+    """
+
+    version = models.BigIntegerField()
+
+    def __str__(self) -> str:  # pragma: no cover
+        return str(self.version)
+
+
 class Report(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_READY, 'Ready'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
     report_id = models.SlugField(max_length=64, unique=True)
-    status = models.CharField(max_length=32, default='queued')
+    status = models.CharField(max_length=32, default=STATUS_QUEUED, choices=STATUS_CHOICES)
     params = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text='last sign of life from the process building it')
+    finished_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    artifacts = models.JSONField(default=dict, blank=True, help_text='format -> file name under DASHBOARD_REPORTS_ROOT')
 
     class Meta:
         indexes = [
             models.Index(fields=["created_at"]),
             models.Index(fields=["status"]),
+            models.Index(fields=["status", "created_at"]),
         ]
         ordering = ["-created_at"]
 
     def __str__(self) -> str:  # pragma: no cover
         return self.report_id
+
+
+class ReportArtifact(models.Model):
+    """A copy of a finished report file, for web hosts that do not share the worker's disk."""
+
+    report = models.ForeignKey(Report, related_name="files", on_delete=models.CASCADE)
+    format = models.CharField(max_length=8)
+    content = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["report", "format"], name="report_artifact_format"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.report_id}.{self.format}"
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import base64
+import json
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Forward-only keyset pagination over a unique, indexed ordering.
+
+    Each page is ``WHERE (key) > (last key) ORDER BY key LIMIT n``, so deep
+    pages cost the same as the first one and no COUNT(*) is issued. Rows may
+    be model instances or ``values()`` dicts; either way they must carry
+    every ``ordering`` field.
+    """
+
+    ordering: Sequence[str] = ("year", "state_id", "id")
+    cursor_query_param = "cursor"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def __init__(self) -> None:
+        self.request = None
+        self.next_key: Optional[List[object]] = None
+
+    def encode_cursor(self, key: List[object]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, request) -> Optional[List[object]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            key = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound("Invalid cursor")
+        if not isinstance(key, list) or len(key) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        return key
+
+    def _typed_key(self, key: List[object], model) -> List[object]:
+        """Convert each cursor element with its ordering field, so a tampered cursor is a 404, not a 500."""
+        typed = []
+        for field, value in zip(self.ordering, key):
+            if value is None or isinstance(value, (bool, list, dict)):
+                raise NotFound("Invalid cursor")
+            try:
+                typed.append(model._meta.get_field(field).to_python(value))
+            except (FieldDoesNotExist, ValidationError):
+                raise NotFound("Invalid cursor")
+        return typed
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def _after(self, key: List[object]) -> Q:
+        # (a, b, c) > (x, y, z)  ==  a > x OR (a = x AND (b > y OR (b = y AND c > z)))
+        condition = Q(**{f"{self.ordering[-1]}__gt": key[-1]})
+        for field, value in zip(reversed(self.ordering[:-1]), reversed(key[:-1])):
+            condition = Q(**{f"{field}__gt": value}) | (Q(**{field: value}) & condition)
+        # Implied by the OR chain, but only this bound lets the index seek past earlier pages.
+        return Q(**{f"{self.ordering[0]}__gte": key[0]}) & condition
+
+    def _key(self, row) -> List[object]:
+        if isinstance(row, dict):
+            return [row[field] for field in self.ordering]
+        return [getattr(row, field) for field in self.ordering]
+
+    def page_queryset(self, queryset, key: Optional[List[object]], size: int):
+        """The rows after ``key`` in ``ordering``, one more than ``size`` to detect a next page."""
+        if key is not None:
+            queryset = queryset.filter(self._after(self._typed_key(key, queryset.model)))
+        return queryset.order_by(*self.ordering)[: size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        rows = list(self.page_queryset(queryset, self.decode_cursor(request), size))
+        self.next_key = self._key(rows[size - 1]) if len(rows) > size else None
+        return rows[:size]
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_key is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_key))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+
+
+class RendererBusy(Exception):
+    """Raised when the render queue is full; callers should ask clients to retry."""
+
+
+@dataclass
+class PdfResult:
+    content: bytes
+    cache_hit: bool
+    queue_ms: float = 0.0
+    render_ms: float = 0.0
+
+
+# --- renderer process side (no Django needed) ---
+
+_FETCH_CACHE: Dict[str, dict] = {}
+
+
+def _cached_url_fetcher(url: str, *args, **kwargs) -> dict:
+    """Fetch stylesheets/fonts once per renderer process instead of once per PDF."""
+
+    cached = _FETCH_CACHE.get(url)
+    if cached is None:
+        from weasyprint import default_url_fetcher  # type: ignore
+
+        result = default_url_fetcher(url, *args, **kwargs)
+        if "file_obj" in result:
+            result["string"] = result.pop("file_obj").read()
+        cached = _FETCH_CACHE[url] = result
+    return dict(cached)
+
+
+def write_pdf(html: str, base_url: str) -> bytes:
+    """Render ``html`` to PDF bytes in the current process."""
+
+    from weasyprint import HTML  # type: ignore
+
+    return HTML(string=html, base_url=base_url, url_fetcher=_cached_url_fetcher).write_pdf()
+
+
+def _warm_renderer() -> None:
+    # Importing WeasyPrint and laying out one page loads fonts and the
+    # default user-agent stylesheets before the first real job arrives.
+    write_pdf("<p>warm-up</p>", "/")
+
+
+def _render_job(html: str, base_url: str, submitted_at: float) -> Tuple[bytes, float, float]:
+    started_at = time.time()
+    content = write_pdf(html, base_url)
+    return content, started_at - submitted_at, time.time() - started_at
+
+
+# --- web process side ---
+
+
+@lru_cache(maxsize=1)
+def weasyprint_available() -> bool:
+    # WeasyPrint imports fine only when its native libraries (Pango) are present.
+    try:
+        import weasyprint  # type: ignore  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def payload_key(template_name: str, context: Dict[str, object]) -> str:
+    """Content address of a rendered PDF: template plus the data it shows."""
+
+    blob = json.dumps(context, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{template_name}\0{blob}".encode("utf-8")).hexdigest()
+
+
+class PdfRenderer:
+    """Pool of warm renderer processes with a content-addressed PDF cache.
+
+    Nothing is spawned until the first cache miss, and each process only
+    when no idle one is free; after ``idle_timeout`` seconds without a
+    render the pool shuts down again. At most ``max_pending`` renders are
+    queued or running; beyond that ``render`` raises ``RendererBusy`` after
+    ``wait_timeout`` seconds instead of tying up the calling web worker.
+    """
+
+    def __init__(self, processes: int = 2, max_pending: int = 8, wait_timeout: float = 2.0,
+                 render_timeout: float = 60.0, cache_dir: Optional[str] = None, max_cached_files: int = 500,
+                 idle_timeout: float = 300.0) -> None:
+        self.processes = max(1, processes)
+        self.wait_timeout = wait_timeout
+        self.render_timeout = render_timeout
+        self.idle_timeout = idle_timeout
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(settings.BASE_DIR) / "var" / "pdf-cache"
+        self.max_cached_files = max_cached_files
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._idle_timer: Optional[threading.Timer] = None
+        # Files in the cache as last seen by this process; None until first counted.
+        self._cached_files: Optional[int] = None
+        self.renders = 0
+        self.cache_hits = 0
+        self.rejected = 0
+        self.failures = 0
+        self.queue_ms_total = 0.0
+        self.render_ms_total = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "PdfRenderer":
+        options = getattr(settings, "DASHBOARD_PDF", {})
+        return cls(**{name.lower(): value for name, value in options.items()})
+
+    def start(self) -> None:
+        """Create the pool; each process spawns (and warms up) when a render first needs it."""
+
+        with self._lock:
+            if self._pool is not None:
+                return
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_renderer,
+            )
+
+    def _stop_if_idle(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _touch(self) -> None:
+        # Restart the idle countdown after every render.
+        if self.idle_timeout <= 0:
+            return
+        timer = threading.Timer(self.idle_timeout, self._stop_if_idle)
+        timer.daemon = True
+        with self._lock:
+            previous, self._idle_timer = self._idle_timer, timer
+        if previous is not None:
+            previous.cancel()
+        timer.start()
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pdf"
+
+    def _store(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+        # Lookups go straight to the content-hash path. Only eviction lists the
+        # directory, and it frees a tenth of the cache at a time, so the listing
+        # happens once per that many stores rather than on every one.
+        with self._lock:
+            if self._cached_files is None:
+                self._cached_files = sum(1 for _ in self.cache_dir.glob("*/*.pdf"))
+            else:
+                self._cached_files += 1
+            if self._cached_files <= self.max_cached_files:
+                return
+            keep = self.max_cached_files - max(1, self.max_cached_files // 10)
+            files = sorted(self.cache_dir.glob("*/*.pdf"), key=lambda item: item.stat().st_mtime)
+            for stale in files[: max(0, len(files) - keep)]:
+                stale.unlink(missing_ok=True)
+            self._cached_files = min(len(files), keep)
+
+    def render(self, template_name: str, context: Dict[str, object], base_url: str,
+               build_html: Callable[[], str]) -> PdfResult:
+        """Return the PDF for ``context``; ``build_html`` is only called on a cache miss."""
+
+        path = self._cache_path(payload_key(template_name, context))
+        if path.is_file():
+            self.cache_hits += 1
+            return PdfResult(path.read_bytes(), cache_hit=True)
+        html = build_html()
+
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            self.rejected += 1
+            raise RendererBusy("PDF render queue is full")
+        try:
+            self.start()
+            future = self._pool.submit(_render_job, html, base_url, time.time())
+            content, queue_s, render_s = future.result(timeout=self.render_timeout)
+        except FutureTimeout:
+            self.failures += 1
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            self.failures += 1
+            with self._lock:
+                self._pool = None  # respawn on the next render
+            raise
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._slots.release()
+
+        self._touch()
+        self.renders += 1
+        self.queue_ms_total += queue_s * 1000
+        self.render_ms_total += render_s * 1000
+        self._store(path, content)
+        return PdfResult(content, cache_hit=False, queue_ms=queue_s * 1000, render_ms=render_s * 1000)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "processes": self.processes,
+            "started": self._pool is not None,
+            "renders": self.renders,
+            "cache_hits": self.cache_hits,
+            "rejected": self.rejected,
+            "failures": self.failures,
+            "avg_queue_ms": round(self.queue_ms_total / self.renders, 2) if self.renders else 0,
+            "avg_render_ms": round(self.render_ms_total / self.renders, 2) if self.renders else 0,
+        }
+
+
+_RENDERER: Optional[PdfRenderer] = None
+_RENDERER_LOCK = threading.Lock()
+
+
+def get_pdf_renderer() -> Optional[PdfRenderer]:
+    """Return the process-wide renderer, or None when WeasyPrint is not installed."""
+
+    global _RENDERER
+    if _RENDERER is None and weasyprint_available():
+        with _RENDERER_LOCK:
+            if _RENDERER is None:
+                _RENDERER = PdfRenderer.from_settings()
+    return _RENDERER
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import math
+import os
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    """Timings gathered while one request is handled."""
+
+    __slots__ = ("started", "db_queries", "db_ms", "sections", "paths", "profilers", "_lock")
+
+    def __init__(self, sampled: bool = False) -> None:
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.sections: Dict[str, float] = defaultdict(float)
+        self.paths: List[str] = []
+        # One cProfile per thread that worked on a sampled request; None when not sampled.
+        self.profilers: Optional[List[cProfile.Profile]] = [] if sampled else None
+        # Async views run sub-queries of one request on several threads.
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def add_query(self, duration_ms: float) -> None:
+        with self._lock:
+            self.db_queries += 1
+            self.db_ms += duration_ms
+
+    def add_section(self, section: str, duration_ms: float) -> None:
+        with self._lock:
+            self.sections[section] += duration_ms
+
+    def add_profiler(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            self.profilers.append(profiler)
+
+
+_CURRENT: ContextVar[Optional[RequestProfile]] = ContextVar("dashboard_request_profile", default=None)
+
+
+@contextmanager
+def timed(section: str) -> Iterator[None]:
+    """Add the time spent in the block to ``section`` of the current request."""
+
+    profile = _CURRENT.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_section(section, (time.perf_counter() - started) * 1000)
+
+
+def record_path(path: str) -> None:
+    """Note which data path ("cube", "db", "memory") answered part of the request."""
+
+    profile = _CURRENT.get()
+    if profile is not None:
+        with profile._lock:
+            if path not in profile.paths:
+                profile.paths.append(path)
+
+
+T = TypeVar("T")
+
+
+def run_profiled(func: Callable[..., T], *args) -> T:
+    """Call ``func``, under a cProfile of this thread when the current request is sampled.
+
+    cProfile only sees the thread that enables it. Under ASGI a request's
+    work runs on pool threads, so the helpers that hand it to them call this
+    there, and the middleware merges the per-thread profiles.
+    """
+
+    profile = _CURRENT.get()
+    if profile is None or profile.profilers is None:
+        return func(*args)
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler is active on this interpreter
+        return func(*args)
+    try:
+        return func(*args)
+    finally:
+        profiler.disable()
+        profile.add_profiler(profiler)
+
+
+def _query_timer(execute, sql, params, many, context):
+    profile = _CURRENT.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query((time.perf_counter() - started) * 1000)
+
+
+def install_query_timer(sender, connection, **kwargs) -> None:
+    """``connection_created`` receiver: time every query run on ``connection``.
+
+    Installed per connection rather than per request so queries that async
+    views run in worker threads, on those threads' connections, are still
+    charged to the request whose context started them.
+    """
+
+    if _query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_timer)
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return round(ordered[index], 2)
+
+
+class LatencyStats:
+    """Rolling window of request latencies per URL name."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._queries: Dict[str, Deque[int]] = {}
+        self._paths: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, name: str, total_ms: float, queries: int, paths: List[str]) -> None:
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self.window)
+                self._queries[name] = deque(maxlen=self.window)
+            self._samples[name].append(total_ms)
+            self._queries[name].append(queries)
+            self._counts[name] += 1
+            for path in paths or ("none",):
+                self._paths[name][path] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            result: Dict[str, Dict[str, object]] = {}
+            for name, samples in sorted(self._samples.items()):
+                ordered = sorted(samples)
+                queries = self._queries[name]
+                result[name] = {
+                    "requests": self._counts[name],
+                    "p50_ms": percentile(ordered, 0.50),
+                    "p95_ms": percentile(ordered, 0.95),
+                    "p99_ms": percentile(ordered, 0.99),
+                    "avg_queries": round(sum(queries) / len(queries), 2),
+                    "paths": dict(self._paths[name]),
+                }
+            return result
+
+
+_STATS = LatencyStats()
+
+
+def latency_stats() -> Dict[str, Dict[str, object]]:
+    return _STATS.snapshot()
+
+
+def _options() -> Dict[str, object]:
+    return getattr(settings, "DASHBOARD_PROFILING", {})
+
+
+class ProfilingMiddleware:
+    """Per-request wall time, DB query count/time, serialization time and data path.
+
+    Adds them as a ``Server-Timing`` header, feeds per-URL-name rolling
+    p50/p95/p99, and, when ``PROFILE_SAMPLE_RATE`` > 0, runs cProfile on that
+    fraction of requests and dumps the stats of those slower than
+    ``SLOW_REQUEST_MS`` into ``PROFILE_DIR``. Works in both the sync and the
+    async handler. Under ASGI only the sync work async views hand to threads
+    through ``run_profiled`` is sampled; sync views and the event loop's own
+    time are not, so profile those under WSGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        options = _options()
+        self.enabled = bool(options.get("ENABLED", True))
+        self.sample_rate = float(options.get("PROFILE_SAMPLE_RATE", 0.0))
+        self.slow_ms = float(options.get("SLOW_REQUEST_MS", 500))
+        self.profile_dir = Path(str(options.get("PROFILE_DIR", Path(settings.BASE_DIR) / "var" / "profiles")))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        profile = RequestProfile(self._sampled())
+        token = _CURRENT.set(profile)
+        try:
+            response = run_profiled(self.get_response, request)
+        finally:
+            _CURRENT.reset(token)
+        return self._finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        profile = RequestProfile(self._sampled())
+        token = _CURRENT.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _CURRENT.reset(token)
+        return self._finish(request, response, profile)
+
+    def _sampled(self) -> bool:
+        return bool(self.sample_rate) and random.random() < self.sample_rate
+
+    def _finish(self, request, response, profile: RequestProfile):
+        total_ms = profile.elapsed_ms()
+        match = getattr(request, "resolver_match", None)
+        name = (match.view_name if match else None) or "unresolved"
+        _STATS.add(name, total_ms, profile.db_queries, profile.paths)
+        self._add_server_timing(response, profile, total_ms)
+        if profile.profilers and total_ms >= self.slow_ms:
+            self._dump(profile.profilers, name, total_ms)
+        return response
+
+    @staticmethod
+    def _add_server_timing(response, profile: RequestProfile, total_ms: float) -> None:
+        entries = [f'db;dur={profile.db_ms:.1f};desc="{profile.db_queries} queries"']
+        for section, duration in list(profile.sections.items()):
+            entries.append(f"{section};dur={duration:.1f}")
+        if profile.paths:
+            entries.append(f'path;desc="{"+".join(profile.paths)}"')
+        app_ms = max(0.0, total_ms - profile.db_ms - sum(profile.sections.values()))
+        entries.append(f"app;dur={app_ms:.1f}")
+        entries.append(f"total;dur={total_ms:.1f}")
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = ", ".join(([existing] if existing else []) + entries)
+
+    def _dump(self, profilers: List[cProfile.Profile], name: str, total_ms: float) -> None:
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            safe_name = "".join(char if char.isalnum() or char in "-_" else "_" for char in name)
+            path = self.profile_dir / f"{safe_name}-{int(time.time() * 1000)}-{os.getpid()}.prof"
+            stats = pstats.Stats(profilers[0])
+            for profiler in profilers[1:]:
+                stats.add(profiler)
+            stats.dump_stats(str(path))
+            logger.warning("Slow request %s took %.0f ms; profile written to %s", name, total_ms, path)
+        except OSError:
+            logger.exception("Could not write profile for slow request %s", name)
+
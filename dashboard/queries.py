@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.db.models import Count, Sum
+
+from .cache import get_payload_cache
+from .cube import cube_totals, cube_totals_by
+from .dimensions import canonical_name, get_resolver
+from .profiling import record_path
+from .store import get_store
+
+
+logger = logging.getLogger(__name__)
+
+
+try:
+    from .models import Initiative as InitiativeModel  # type: ignore
+except Exception:
+    InitiativeModel = None
+
+
+def log_fallback(what: str) -> None:
+    # Fallbacks keep pages up, but a failing or missing table must stay visible.
+    logger.warning("%s failed on the database path; serving in-memory data", what, exc_info=True)
+
+
+METRIC_FIELDS = ("progress", "schools_impacted", "students_impacted", "scholarships_awarded", "budget_utilized")
+
+
+def initiative_queryset(filters: Dict[str, Optional[str]]):
+    """Return the filtered Initiative queryset, or None when models are unavailable."""
+    if InitiativeModel is None:
+        return None
+    qs = InitiativeModel.objects.all()
+    if filters["year"]:
+        qs = qs.filter(year=int(filters["year"]))
+    # Filter on the FK ids directly; names/slugs resolve through a cached table.
+    for dimension in ("state", "scheme"):
+        if filters[dimension]:
+            pk = get_resolver(dimension).pk(filters[dimension])
+            qs = qs.filter(**{f"{dimension}_id": pk}) if pk is not None else qs.none()
+    if filters["category"]:
+        qs = qs.filter(category=filters["category"])
+    return qs
+
+
+def metric_aggregates() -> Dict[str, object]:
+    aggregates: Dict[str, object] = {f"sum_{field}": Sum(field) for field in METRIC_FIELDS}
+    aggregates["count"] = Count("id")
+    return aggregates
+
+
+def db_totals(row: Dict[str, object]) -> Dict[str, float]:
+    """Map an aggregate()/annotate() row onto the store's totals shape."""
+    totals: Dict[str, float] = {field: row[f"sum_{field}"] or 0 for field in METRIC_FIELDS}
+    totals["count"] = row["count"]
+    return totals
+
+
+def select_rows(filters: Dict[str, Optional[str]]) -> Sequence[int]:
+    """Resolve filters to row ids of the in-memory store via its posting lists."""
+    return get_store().select(
+        year=int(filters["year"]) if filters["year"] else None,
+        state=canonical_name("state", filters["state"]),
+        scheme=canonical_name("scheme", filters["scheme"]),
+        category=filters["category"],
+    )
+
+
+EXPORT_FIELDS = (
+    "id", "name", "state__name", "scheme__name", "category", "year", "status",
+    "progress", "schools_impacted", "students_impacted", "scholarships_awarded", "budget_utilized",
+)
+EXPORT_KEYS = (
+    "id", "name", "state", "scheme", "category", "year", "status",
+    "progress", "schools_impacted", "students_impacted", "scholarships_awarded", "budget_utilized",
+)
+
+
+def iter_initiatives(filters: Dict[str, Optional[str]], chunk_size: int = 2000) -> Iterator[Dict[str, object]]:
+    """Yield matching initiatives lazily, ``chunk_size`` rows at a time.
+
+    On the DB path rows come from a server-side cursor (where the backend
+    supports one), so memory stays flat regardless of the table size.
+    """
+    qs = None
+    try:
+        qs = initiative_queryset(filters)
+        if qs is not None and not qs.exists():
+            qs = None
+    except Exception:
+        log_fallback("Initiative export")
+        qs = None
+    if qs is not None:
+        record_path("db")
+        for values in qs.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+            yield dict(zip(EXPORT_KEYS, values))
+        return
+    record_path("memory")
+    store = get_store()
+    rows = select_rows(filters)
+    for start in range(0, len(rows), chunk_size):
+        yield from store.rows(rows[start:start + chunk_size])
+
+
+# -------- Initiatives window ---------
+# Pages shown by the initiatives table and /api/v1/initiatives. ``sort`` is a
+# field name, ``-field`` for descending; ties break on id.
+INITIATIVE_FIELDS = (*EXPORT_KEYS, "progress_pct")
+INITIATIVES_SORT = "id"
+INITIATIVES_PAGE_SIZE = 25
+INITIATIVES_MAX_PAGE_SIZE = 500
+DEFAULT_WINDOW: Dict[str, object] = {
+    "page": 1, "page_size": INITIATIVES_PAGE_SIZE, "sort": INITIATIVES_SORT, "fields": INITIATIVE_FIELDS,
+}
+
+
+def _window_columns(rows: List[Tuple[object, ...]]) -> Dict[str, List[object]]:
+    return {key: [values[index] for values in rows] for index, key in enumerate(EXPORT_KEYS)}
+
+
+def _db_window(
+    filters: Dict[str, Optional[str]], field: str, descending: bool, offset: int, limit: Optional[int]
+) -> Optional[Tuple[int, Dict[str, List[object]]]]:
+    """(total, page columns) from one COUNT and one ordered LIMIT/OFFSET query, or None."""
+    try:
+        qs = initiative_queryset(filters)
+        if qs is not None:
+            total = qs.count()
+            if total:
+                record_path("db")
+                lookup = EXPORT_FIELDS[EXPORT_KEYS.index(field)]
+                ordering = [f"-{lookup}" if descending else lookup] + (["id"] if lookup != "id" else [])
+                rows = qs.order_by(*ordering).values_list(*EXPORT_FIELDS)
+                return total, _window_columns(list(rows[offset:] if limit is None else rows[offset:offset + limit]))
+    except Exception:
+        log_fallback("Initiatives window")
+    return None
+
+
+def initiatives_window(
+    filters: Dict[str, Optional[str]],
+    page: int = 1,
+    page_size: Optional[int] = INITIATIVES_PAGE_SIZE,
+    sort: str = INITIATIVES_SORT,
+    fields: Sequence[str] = INITIATIVE_FIELDS,
+    layout: str = "rows",
+) -> Dict[str, object]:
+    """One sorted page of the matching initiatives plus the total match count.
+
+    Only the page is read: a COUNT and a LIMIT/OFFSET query on the DB path, a
+    sort over the selected row ids on the store. ``page_size=None`` returns
+    every match (print and PDF views). ``results`` is a list of dicts, or
+    ``{field: [values]}`` for ``layout="columns"``.
+    """
+    field, descending = sort.lstrip("-"), sort.startswith("-")
+    if field == "progress_pct":
+        field = "progress"
+    offset = (page - 1) * page_size if page_size else 0
+    found = _db_window(filters, field, descending, offset, page_size)
+    if found is None:
+        record_path("memory")
+        store = get_store()
+        rows = select_rows(filters)
+        ordered = store.order(rows, field, descending)
+        found = len(rows), store.columns(ordered[offset:] if page_size is None else ordered[offset:offset + page_size])
+    total, columns = found
+    columns["progress_pct"] = [round(progress * 100, 2) for progress in columns["progress"]]
+    results: object = {name: columns[name] for name in fields}
+    if layout != "columns":
+        results = [dict(zip(fields, values)) for values in zip(*results.values())]
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size or total,
+        "pages": -(-total // page_size) if page_size else 1,
+        "sort": sort,
+        "results": results,
+    }
+
+
+def summary_from_totals(totals: Dict[str, float]) -> Dict[str, object]:
+    count = int(totals["count"])
+    avg_progress_ratio = round(totals["progress"] / count, 2) if count else 0
+    return {
+        "schools": int(totals["schools_impacted"]),
+        "students": int(totals["students_impacted"]),
+        "scholarships": int(totals["scholarships_awarded"]),
+        "avg_progress_ratio": avg_progress_ratio,
+        "avg_progress_pct": round(avg_progress_ratio * 100, 2),
+        "initiatives": count,
+    }
+
+
+def state_summary_from_totals(grouped: Dict[object, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Shape per-state totals like ``aggregate_initiatives_by_state`` does."""
+    summary: Dict[str, Dict[str, float]] = {}
+    for state, totals in grouped.items():
+        count = int(totals["count"])
+        summary[str(state)] = {
+            "schools": int(totals["schools_impacted"]),
+            "students": int(totals["students_impacted"]),
+            "scholarships": int(totals["scholarships_awarded"]),
+            "progress_sum": totals["progress"],
+            "initiatives": count,
+            "avg_progress": round(totals["progress"] / count, 2) if count else 0,
+        }
+    return summary
+
+
+def summarize(filters: Dict[str, Optional[str]]) -> Dict[str, object]:
+    """KPI summary cards: one cube cell lookup, else one aggregate() query; no rows fetched."""
+    try:
+        totals = cube_totals(filters)
+        if totals is not None:
+            record_path("cube")
+            return summary_from_totals(totals)
+        qs = initiative_queryset(filters)
+        if qs is not None:
+            totals = db_totals(qs.aggregate(**metric_aggregates()))
+            if totals["count"]:
+                record_path("db")
+                return summary_from_totals(totals)
+    except Exception:
+        log_fallback("KPI summary")
+    record_path("memory")
+    return summary_from_totals(get_store().totals(select_rows(filters)))
+
+
+def summarize_states(filters: Dict[str, Optional[str]]) -> Dict[str, Dict[str, float]]:
+    """Per-state totals from the cube's state cells, else one GROUP BY state query."""
+    try:
+        cells = cube_totals_by(filters, ("state",))
+        if cells is not None:
+            record_path("cube")
+            return state_summary_from_totals({key[0]: totals for key, totals in sorted(cells.items())})
+        qs = initiative_queryset(filters)
+        if qs is not None:
+            states = get_resolver("state")
+            grouped = {
+                states.name_for_pk(row["state_id"]): db_totals(row)
+                for row in qs.values("state_id").annotate(**metric_aggregates()).order_by()
+            }
+            if grouped:
+                record_path("db")
+                return state_summary_from_totals(dict(sorted(grouped.items())))
+    except Exception:
+        log_fallback("Per-state summary")
+    record_path("memory")
+    return state_summary_from_totals(get_store().totals_by("state", select_rows(filters)))
+
+
+def print_payload(filters: Dict[str, Optional[str]]) -> Dict[str, object]:
+    """KPI summary plus every matching initiative, for the print, PDF and report outputs."""
+    return {
+        "summary": get_payload_cache().get_or_compute("summary", filters, lambda: summarize(filters)),
+        "initiatives": initiatives_window(filters, page_size=None),
+        "filters": filters,
+    }
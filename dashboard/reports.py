@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .exports import REPORT_CSV_HEADER, csv_chunks, report_csv_row
+from .models import Report, ReportArtifact
+from .pdf import RendererBusy, get_pdf_renderer, weasyprint_available, write_pdf
+from .queries import iter_initiatives, print_payload
+
+logger = logging.getLogger(__name__)
+
+REPORT_FORMATS = ("csv", "pdf")
+
+
+def reports_root() -> Path:
+    root = Path(getattr(settings, "DASHBOARD_REPORTS_ROOT", Path(settings.BASE_DIR) / "var" / "reports"))
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def report_id_for(params: Dict[str, object]) -> str:
+    """Stable id for a parameter set, identical across processes."""
+
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"rpt_{int(digest[:12], 16) % 10_000_000}"
+
+
+def report_filters(report: Report) -> Dict[str, Optional[str]]:
+    raw = report.params.get("filters") if isinstance(report.params, dict) else None
+    raw = raw if isinstance(raw, dict) else {}
+    return {key: (str(raw[key]) if raw.get(key) else None) for key in ("year", "state", "scheme", "category")}
+
+
+def artifact_path(report: Report, fmt: str) -> Optional[Path]:
+    name = (report.artifacts or {}).get(fmt)
+    if not name:
+        return None
+    path = reports_root() / name
+    if not path.is_file():
+        # Built on another host: copy it out of the database once, then serve it from disk.
+        content = ReportArtifact.objects.filter(report=report, format=fmt).values_list("content", flat=True).first()
+        if content is None:
+            return None
+        _write_bytes(path, bytes(content))
+    return path
+
+
+def enqueue_report(params: Dict[str, object]) -> Report:
+    """Queue a report for ``params`` unless an identical one is already pending."""
+
+    report_id = report_id_for(params)
+    with transaction.atomic():
+        report, created = Report.objects.select_for_update().get_or_create(
+            report_id=report_id, defaults={"params": params, "status": Report.STATUS_QUEUED}
+        )
+        if not created and report.status not in (Report.STATUS_QUEUED, Report.STATUS_RUNNING):
+            report.params = params
+            report.status = Report.STATUS_QUEUED
+            report.error = ""
+            report.started_at = None
+            report.finished_at = None
+            report.save(update_fields=["params", "status", "error", "started_at", "finished_at"])
+    return report
+
+
+def claim_next_report() -> Optional[Report]:
+    """Atomically move the oldest queued report to ``running`` and return it."""
+
+    while True:
+        with transaction.atomic():
+            report = (
+                Report.objects.select_for_update(skip_locked=True)
+                .filter(status=Report.STATUS_QUEUED)
+                .order_by("created_at")
+                .first()
+            )
+            if report is None:
+                return None
+            # The status guard keeps claims exclusive on backends without row locks.
+            claimed = Report.objects.filter(pk=report.pk, status=Report.STATUS_QUEUED).update(
+                status=Report.STATUS_RUNNING,
+                started_at=timezone.now(),
+                heartbeat_at=timezone.now(),
+                attempts=report.attempts + 1,
+            )
+        if claimed:
+            report.refresh_from_db()
+            return report
+
+
+def requeue_stale_reports(older_than: timedelta) -> int:
+    """Return reports stuck in ``running`` (e.g. after a worker crash) to the queue.
+
+    Staleness is judged by the last heartbeat, so a report that is still
+    being built, however long it takes, is left to the process building it.
+    """
+
+    cutoff = timezone.now() - older_than
+    silent = Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    return Report.objects.filter(silent, status=Report.STATUS_RUNNING).update(status=Report.STATUS_QUEUED)
+
+
+def beat(report_ids: Iterable[str]) -> None:
+    """Record that the reports in ``report_ids`` are still being built."""
+
+    Report.objects.filter(report_id__in=list(report_ids), status=Report.STATUS_RUNNING).update(
+        heartbeat_at=timezone.now()
+    )
+
+
+def stale_after() -> timedelta:
+    return timedelta(seconds=getattr(settings, "DASHBOARD_REPORTS_STALE_AFTER", 900))
+
+
+def heartbeat_interval() -> float:
+    return stale_after().total_seconds() / 3
+
+
+@contextmanager
+def heartbeat(report_id: str) -> Iterator[None]:
+    """Beat for ``report_id`` from a side thread while the block builds it."""
+
+    stop = threading.Event()
+
+    def run() -> None:
+        try:
+            while not stop.wait(heartbeat_interval()):
+                beat([report_id])
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=run, name=f"heartbeat-{report_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def drain_queue() -> int:
+    """Requeue stale reports, then build queued ones in this thread until none are left.
+
+    Used by the web process when DASHBOARD_REPORTS_INLINE is set; PDFs go
+    through the shared renderer pool rather than this process's GIL.
+    """
+
+    requeue_stale_reports(stale_after())
+    processed = 0
+    while True:
+        report = claim_next_report()
+        if report is None:
+            return processed
+        with heartbeat(report.report_id):
+            run_report(report.report_id, render_in_process=False)
+        processed += 1
+
+
+_inline_lock = threading.Lock()
+_inline_pending = False
+_inline_thread: Optional[threading.Thread] = None
+
+
+def _drain_inline() -> None:
+    global _inline_pending, _inline_thread
+    try:
+        while True:
+            with _inline_lock:
+                if not _inline_pending:
+                    _inline_thread = None
+                    return
+                _inline_pending = False
+            try:
+                drain_queue()
+            except Exception:
+                logger.exception("Inline report processing failed")
+    finally:
+        connections.close_all()
+
+
+def process_inline() -> None:
+    """Drain the queue on a background thread of this process, for deploys that opt out of the worker.
+
+    One thread per process; a report queued while it runs is picked up before it exits.
+    """
+
+    global _inline_pending, _inline_thread
+    with _inline_lock:
+        _inline_pending = True
+        if _inline_thread is None:
+            _inline_thread = threading.Thread(target=_drain_inline, name="reports-inline", daemon=True)
+            _inline_thread.start()
+
+
+def _write_atomically(path: Path, chunks) -> None:
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+    os.replace(tmp, path)
+
+
+def _write_bytes(path: Path, content: bytes) -> None:
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def _render_pdf(filters: Dict[str, Optional[str]], payload: Dict[str, object], in_process: bool) -> Optional[bytes]:
+    if not weasyprint_available():
+        return None
+    if filters["scheme"] and not filters["state"]:
+        template_name, context = "dashboard/scheme_print.html", {"scheme": filters["scheme"], "payload": payload}
+    else:
+        template_name, context = "dashboard/state_print.html", {"state": filters["state"] or "All States", "payload": payload}
+    if in_process:
+        # Report worker processes are already off the web path.
+        return write_pdf(render_to_string(template_name, context), str(settings.BASE_DIR))
+    renderer = get_pdf_renderer()
+    while True:
+        try:
+            return renderer.render(
+                template_name, context, str(settings.BASE_DIR), lambda: render_to_string(template_name, context)
+            ).content
+        except RendererBusy:
+            time.sleep(1)  # a background job can wait for interactive PDFs to drain
+
+
+def run_report(report_id: str, render_in_process: bool = True) -> str:
+    """Build every artifact for a claimed report and record the outcome.
+
+    Each file is written under DASHBOARD_REPORTS_ROOT and copied into
+    ``ReportArtifact``, so a web host without that disk can still serve it.
+    """
+
+    report = Report.objects.get(report_id=report_id)
+    filters = report_filters(report)
+    root = reports_root()
+    artifacts: Dict[str, str] = {}
+    try:
+        csv_name = f"{report.report_id}.csv"
+        _write_atomically(root / csv_name, csv_chunks(REPORT_CSV_HEADER, iter_initiatives(filters), report_csv_row))
+        artifacts["csv"] = csv_name
+
+        pdf = _render_pdf(filters, print_payload(filters), render_in_process)
+        if pdf is not None:
+            pdf_name = f"{report.report_id}.pdf"
+            _write_bytes(root / pdf_name, pdf)
+            artifacts["pdf"] = pdf_name
+        for fmt, name in artifacts.items():
+            ReportArtifact.objects.update_or_create(
+                report=report, format=fmt, defaults={"content": (root / name).read_bytes()}
+            )
+    except Exception as exc:
+        report.status = Report.STATUS_FAILED
+        report.error = f"{type(exc).__name__}: {exc}"
+    else:
+        report.status = Report.STATUS_READY
+        report.error = ""
+    report.artifacts = artifacts
+    report.finished_at = timezone.now()
+    report.save(update_fields=["status", "error", "artifacts", "finished_at"])
+    return report.status
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Optional
+
+from django.utils import translation
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.response import Response
+
+
+@lru_cache(maxsize=8)
+def _schema(version: Optional[str], language: Optional[str]) -> Dict[str, object]:
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(api_version=version)
+    return generator.get_schema(request=None, public=True)
+
+
+def openapi_schema(version: Optional[str] = None) -> Dict[str, object]:
+    """The public OpenAPI document, generated once per version and language.
+
+    The URLconf and serializers do not change while the process runs, so
+    neither does the schema; generating it walks every view and serializer.
+    """
+
+    return _schema(version, translation.get_language())
+
+
+class SchemaView(SpectacularAPIView):
+    """``SpectacularAPIView`` serving ``openapi_schema`` instead of regenerating it per request."""
+
+    def _get_schema_response(self, request):
+        if self.urlconf is not None or self.patterns is not None or not self.serve_public:
+            return super()._get_schema_response(request)
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        return Response(
+            data=openapi_schema(version),
+            headers={"Content-Disposition": f'inline; filename="{self._get_filename(request, version)}"'},
+        )
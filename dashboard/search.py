@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+KINDS = ("initiative", "state", "scheme")
+
+# Field weights: a hit in the initiative name outranks one in its state/scheme.
+FIELD_WEIGHTS = {"name": 3.0, "state": 2.0, "scheme": 2.0}
+EXACT_BONUS = 2.0
+
+
+def tokenize(text: object) -> List[str]:
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+class _Postings:
+    """Append-only doc ordinals with a parallel weight column."""
+
+    __slots__ = ("docs", "weights")
+
+    def __init__(self) -> None:
+        self.docs = array("i")
+        self.weights = array("f")
+
+
+class SearchIndex:
+    """Token inverted index over initiatives, states and schemes.
+
+    Every query token is matched as a prefix (for typeahead) against a sorted
+    vocabulary; posting lists are intersected with numpy and ranked by field
+    weight, with exact token matches scoring double. Documents can be added
+    or removed at any time; removals are tombstones.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.vocabulary: List[str] = []
+        self.postings: Dict[str, _Postings] = {}
+        self.keys: List[Tuple[str, object]] = []
+        self.payloads: List[Dict[str, object]] = []
+        self.kinds = array("b")
+        self.years = array("i")
+        self.categories = array("h")
+        self.alive = bytearray()
+        self.ordinals: Dict[Tuple[str, object], int] = {}
+        self.category_codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def add(self, kind: str, key: object, fields: Dict[str, object], payload: Dict[str, object]) -> None:
+        with self._lock:
+            self.remove(kind, key)
+            ordinal = len(self.keys)
+            self.keys.append((kind, key))
+            self.payloads.append(payload)
+            self.kinds.append(KINDS.index(kind))
+            self.years.append(int(payload.get("year") or 0))
+            category = str(payload.get("category") or "")
+            self.categories.append(self.category_codes.setdefault(category, len(self.category_codes)))
+            self.alive.append(1)
+            self.ordinals[(kind, key)] = ordinal
+            weights: Dict[str, float] = {}
+            for field, text in fields.items():
+                for token in tokenize(text):
+                    weights[token] = max(weights.get(token, 0.0), FIELD_WEIGHTS.get(field, 1.0))
+            for token, weight in weights.items():
+                postings = self.postings.get(token)
+                if postings is None:
+                    postings = self.postings[token] = _Postings()
+                    bisect.insort(self.vocabulary, token)
+                postings.docs.append(ordinal)
+                postings.weights.append(weight)
+
+    def remove(self, kind: str, key: object) -> None:
+        with self._lock:
+            ordinal = self.ordinals.pop((kind, key), None)
+            if ordinal is not None:
+                self.alive[ordinal] = 0
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + "\uffff")
+        return self.vocabulary[start:end]
+
+    def _token_scores(self, prefix: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Doc ordinals matching ``prefix`` and their best score for it."""
+
+        docs_parts = []
+        score_parts = []
+        for token in self._expand(prefix):
+            postings = self.postings[token]
+            if not postings.docs:
+                continue
+            docs_parts.append(np.frombuffer(postings.docs, dtype=np.int32))
+            weights = np.frombuffer(postings.weights, dtype=np.float32)
+            score_parts.append(weights * EXACT_BONUS if token == prefix else weights)
+        if not docs_parts:
+            empty = np.empty(0, dtype=np.int32)
+            return empty, np.empty(0, dtype=np.float32)
+        docs = np.concatenate(docs_parts)
+        scores = np.concatenate(score_parts)
+        # Keep the best score per document when several expansions match it.
+        order = np.lexsort((-scores, docs))
+        docs, scores = docs[order], scores[order]
+        first = np.ones(len(docs), dtype=bool)
+        first[1:] = docs[1:] != docs[:-1]
+        return docs[first], scores[first]
+
+    def search(
+        self,
+        query: str,
+        kind: str = "initiative",
+        limit: int = 20,
+        offset: int = 0,
+        year: Optional[int] = None,
+        category: Optional[str] = None,
+    ) -> Tuple[int, List[Dict[str, object]]]:
+        """Return ``(total, page)`` for documents of ``kind`` matching every query token."""
+
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return 0, []
+        with self._lock:
+            docs: Optional[np.ndarray] = None
+            scores: Optional[np.ndarray] = None
+            for token in sorted(tokens, key=len, reverse=True):
+                token_docs, token_scores = self._token_scores(token)
+                if docs is None:
+                    docs, scores = token_docs, token_scores
+                else:
+                    docs, left, right = np.intersect1d(docs, token_docs, assume_unique=True, return_indices=True)
+                    scores = scores[left] + token_scores[right]
+                if not len(docs):
+                    return 0, []
+            mask = np.frombuffer(self.alive, dtype=np.uint8)[docs].astype(bool)
+            mask &= np.frombuffer(self.kinds, dtype=np.int8)[docs] == KINDS.index(kind)
+            if year:
+                mask &= np.frombuffer(self.years, dtype=np.int32)[docs] == int(year)
+            if category:
+                code = self.category_codes.get(category)
+                if code is None:
+                    return 0, []
+                mask &= np.frombuffer(self.categories, dtype=np.int16)[docs] == code
+            docs, scores = docs[mask], scores[mask]
+            total = len(docs)
+            wanted = offset + limit
+            if wanted <= 0 or offset >= total:
+                return total, []
+            # Highest score first, ties in insertion (id) order, folded into one
+            # sort key so the partial top-k selection stays deterministic.
+            rank = docs - scores.astype(np.float64) * (len(self.keys) + 1)
+            if wanted < total:
+                top = np.argpartition(rank, wanted - 1)[:wanted]
+                docs, rank = docs[top], rank[top]
+            order = np.argsort(rank, kind="stable")[offset:wanted]
+            return total, [self.payloads[ordinal] for ordinal in docs[order].tolist()]
+
+
+def _initiative_doc(item: Dict[str, object]) -> Tuple[Dict[str, object], Dict[str, object]]:
+    payload = {
+        "id": item["id"],
+        "name": item["name"],
+        "state": item["state"],
+        "scheme": item["scheme"],
+        "year": item["year"],
+        "category": item["category"],
+    }
+    fields = {"name": item["name"], "state": item["state"], "scheme": item["scheme"]}
+    return fields, payload
+
+
+def build_index(initiatives: Iterable[Dict[str, object]], states: Iterable[str], schemes: Iterable[str]) -> SearchIndex:
+    from django.utils.text import slugify
+
+    index = SearchIndex()
+    for name in states:
+        index.add("state", name, {"name": name}, {"name": name, "slug": slugify(name)})
+    for name in schemes:
+        index.add("scheme", name, {"name": name}, {"name": name, "slug": slugify(name)})
+    for item in initiatives:
+        fields, payload = _initiative_doc(item)
+        index.add("initiative", item["id"], fields, payload)
+    return index
+
+
+_INDEX: Optional[SearchIndex] = None
+_INDEX_FROM_DB = False
+_INDEX_LOCK = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """Process-wide index over the DB when it has initiatives, else the demo data."""
+
+    global _INDEX, _INDEX_FROM_DB
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                from .data import INDIAN_STATES, SCHEMES, get_dataset
+                from .models import Initiative, Scheme, State
+
+                initiatives: Iterable[Dict[str, object]] = get_dataset().iter_initiatives()
+                states: Iterable[str] = INDIAN_STATES
+                schemes: Iterable[str] = SCHEMES
+                from_db = False
+                try:
+                    if Initiative.objects.exists():
+                        initiatives = (
+                            {"id": row[0], "name": row[1], "state": row[2], "scheme": row[3], "year": row[4], "category": row[5]}
+                            for row in Initiative.objects.values_list(
+                                "id", "name", "state__name", "scheme__name", "year", "category"
+                            ).order_by("id").iterator(chunk_size=5000)
+                        )
+                        states = list(State.objects.order_by("name").values_list("name", flat=True))
+                        schemes = list(Scheme.objects.order_by("name").values_list("name", flat=True))
+                        from_db = True
+                except Exception:
+                    from_db = False
+                _INDEX = build_index(initiatives, states, schemes)
+                _INDEX_FROM_DB = from_db
+    return _INDEX
+
+
+def index_initiative(obj) -> None:
+    """Signal hook: reflect a saved Initiative in an already-built index."""
+
+    if _INDEX is None:
+        return
+    if not _INDEX_FROM_DB:
+        # The DB just became the source of truth; rebuild from it on next use.
+        reset_search_index()
+        return
+    item = {
+        "id": obj.id, "name": obj.name, "state": obj.state.name, "scheme": obj.scheme.name,
+        "year": obj.year, "category": obj.category,
+    }
+    fields, payload = _initiative_doc(item)
+    _INDEX.add("initiative", obj.id, fields, payload)
+
+
+def unindex_initiative(obj) -> None:
+    if _INDEX is not None and _INDEX_FROM_DB:
+        _INDEX.remove("initiative", obj.id)
+
+
+def reset_search_index() -> None:
+    """Drop the index; it is rebuilt on next use (e.g. after a bulk import)."""
+
+    global _INDEX
+    with _INDEX_LOCK:
+        _INDEX = None
+
+
+class PostgresSearchBackend:
+    """Ranks initiatives with pg_trgm similarity.
+
+    Every query token must occur in the initiative's name or in its state's
+    or scheme's name. States and schemes matching a token are looked up first
+    in their own (small) tables, so the initiative filter is an OR of the
+    ``UPPER(name)`` trigram index and the state/scheme foreign key indexes
+    instead of a LIKE evaluated on every joined row.
+    """
+
+    @staticmethod
+    def _ids_matching(model, token: str) -> List[int]:
+        return list(model.objects.filter(name__icontains=token).values_list("id", flat=True))
+
+    def matching(self, query: str, year: Optional[int] = None, category: Optional[str] = None):
+        from django.db.models import Q
+
+        from .models import Initiative, Scheme, State
+
+        qs = Initiative.objects.all()
+        for token in tokenize(query):
+            qs = qs.filter(
+                Q(name__icontains=token)
+                | Q(state_id__in=self._ids_matching(State, token))
+                | Q(scheme_id__in=self._ids_matching(Scheme, token))
+            )
+        if year:
+            qs = qs.filter(year=int(year))
+        if category:
+            qs = qs.filter(category=category)
+        return qs
+
+    def search(self, query: str, limit: int, offset: int, year: Optional[int], category: Optional[str]):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        qs = self.matching(query, year, category)
+        total = qs.count()
+        rows = (
+            qs.annotate(rank=TrigramSimilarity("name", query))
+            .order_by("-rank", "id")
+            .values("id", "name", "state__name", "scheme__name", "year", "category")[offset:offset + limit]
+        )
+        return total, [
+            {
+                "id": row["id"], "name": row["name"], "state": row["state__name"],
+                "scheme": row["scheme__name"], "year": row["year"], "category": row["category"],
+            }
+            for row in rows
+        ]
+
+
+    def dimension_matches(self, query: str, kind: str, limit: int = 5) -> List[Dict[str, object]]:
+        """States or schemes whose name contains every query token, most similar first."""
+
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        from .models import Scheme, State
+
+        qs = {"state": State, "scheme": Scheme}[kind].objects.all()
+        for token in tokenize(query):
+            qs = qs.filter(name__icontains=token)
+        rows = qs.annotate(rank=TrigramSimilarity("name", query)).order_by("-rank", "name").values("name", "slug")
+        return list(rows[:limit])
+
+
+# 'auto' mode's answer, as (data version, DB has initiatives).
+_DB_HAS_INITIATIVES: Optional[Tuple[int, bool]] = None
+
+
+def use_postgres_backend() -> bool:
+    global _DB_HAS_INITIATIVES
+    backend = getattr(settings, "DASHBOARD_SEARCH_BACKEND", "auto")
+    if backend == "memory":
+        return False
+    if connection.vendor != "postgresql":
+        return False
+    if backend == "postgres":
+        return True
+    from .cache import get_payload_cache
+    from .models import Initiative
+
+    # Re-checked only when the data version moves, not on every search.
+    version = get_payload_cache().version
+    if _DB_HAS_INITIATIVES is None or _DB_HAS_INITIATIVES[0] != version:
+        try:
+            has_initiatives = Initiative.objects.exists()
+        except Exception:
+            has_initiatives = False
+        _DB_HAS_INITIATIVES = (version, has_initiatives)
+    return _DB_HAS_INITIATIVES[1]
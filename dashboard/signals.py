@@ -0,0 +1,73 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_data_version
+from .cube import apply_change, cube_is_built, current_values, refresh_cube, snapshot
+from .dimensions import invalidate_dimensions
+from .models import Initiative, Scheme, State
+from .search import index_initiative, reset_search_index, unindex_initiative
+
+
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=Scheme)
+@receiver(post_delete, sender=Scheme)
+def invalidate_dimension_lookups(sender, **kwargs):
+    invalidate_dimensions()
+
+
+# Cube handlers are registered first so cells are current before the data
+# version bump lets new payloads be computed and cached.
+@receiver(pre_save, sender=Initiative)
+def remember_cube_values(sender, instance, raw=False, **kwargs):
+    instance._cube_previous = None if raw else snapshot(instance)
+
+
+@receiver(post_save, sender=Initiative)
+def update_cube(sender, instance, raw=False, **kwargs):
+    if not raw:
+        apply_change(getattr(instance, "_cube_previous", None), current_values(instance))
+
+
+@receiver(post_delete, sender=Initiative)
+def remove_from_cube(sender, instance, **kwargs):
+    apply_change(current_values(instance), None)
+
+
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=Scheme)
+@receiver(post_delete, sender=Scheme)
+def rebuild_cube(sender, **kwargs):
+    # Cells are keyed by state/scheme name, so a rename or delete rebuilds them.
+    if cube_is_built():
+        refresh_cube()
+
+
+@receiver(post_save, sender=Initiative)
+@receiver(post_delete, sender=Initiative)
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=Scheme)
+@receiver(post_delete, sender=Scheme)
+def invalidate_dashboard_cache(sender, **kwargs):
+    bump_data_version()
+
+
+@receiver(post_save, sender=Initiative)
+def update_search_index(sender, instance, **kwargs):
+    index_initiative(instance)
+
+
+@receiver(post_delete, sender=Initiative)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_initiative(instance)
+
+
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=Scheme)
+@receiver(post_delete, sender=Scheme)
+def rebuild_search_index(sender, **kwargs):
+    reset_search_index()
+
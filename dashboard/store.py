@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Metric columns and their dtypes. Integer metrics are kept as 64-bit so
+# national-scale totals never overflow.
+METRIC_COLUMNS = {
+    "progress": np.float64,
+    "schools_impacted": np.int64,
+    "students_impacted": np.int64,
+    "scholarships_awarded": np.int64,
+    "budget_utilized": np.float64,
+}
+
+DIMENSIONS = ("year", "state", "scheme", "category", "status")
+
+
+class Dimension:
+    """Dictionary-encoded column with one posting list (row ids) per value."""
+
+    def __init__(self, name: str, raw: List[object]) -> None:
+        self.name = name
+        self.values: List[object] = []
+        self.codes: Dict[object, int] = {}
+        encoded = []
+        for value in raw:
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.values)
+                self.values.append(value)
+            encoded.append(code)
+        self.column = np.asarray(encoded, dtype=np.uint16)
+        order = np.argsort(self.column, kind="stable").astype(np.int64)
+        bounds = np.searchsorted(self.column[order], np.arange(len(self.values) + 1))
+        self.postings: List[np.ndarray] = [
+            order[bounds[code]:bounds[code + 1]] for code in range(len(self.values))
+        ]
+        # Sort position of each code's value, so ordering rows by this
+        # dimension is an argsort over small ints.
+        self.ranks = np.empty(len(self.values), dtype=np.int64)
+        self.ranks[sorted(range(len(self.values)), key=self.values.__getitem__)] = np.arange(len(self.values))
+
+    def lookup(self, value: object) -> Optional[int]:
+        return self.codes.get(value)
+
+
+class InitiativeStore:
+    """Column-oriented, read-only view over a set of initiatives.
+
+    Each metric lives in its own numpy array and every dimension is encoded
+    as small-int codes with a posting list per value, so filters become
+    posting-list intersections and KPI totals are vectorized reductions over
+    the selected row ids rather than Python scans over dicts.
+    """
+
+    def __init__(self, initiatives: Iterable[Dict[str, object]]) -> None:
+        items = list(initiatives)
+        self.ids = np.fromiter((item["id"] for item in items), dtype=np.int64, count=len(items))
+        self.names: List[str] = [str(item["name"]) for item in items]
+        self.dimensions: Dict[str, Dimension] = {
+            name: Dimension(name, [int(item[name]) if name == "year" else str(item[name]) for item in items])
+            for name in DIMENSIONS
+        }
+        self.metrics: Dict[str, np.ndarray] = {
+            name: np.fromiter((item[name] for item in items), dtype=dtype, count=len(items))
+            for name, dtype in METRIC_COLUMNS.items()
+        }
+        self.all_rows = np.arange(len(items), dtype=np.int64)
+        self._name_ranks: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def select(self, **criteria: object) -> np.ndarray:
+        """Return the ascending row ids matching every non-empty criterion.
+
+        A criterion is either a single value or a list/tuple/set of values,
+        in which case rows matching any of them are selected.
+        """
+
+        codes = []
+        for name, value in criteria.items():
+            if value is None or value == "":
+                continue
+            dimension = self.dimensions[name]
+            values = value if isinstance(value, (list, tuple, set, frozenset)) else (value,)
+            matched = sorted({code for code in map(dimension.lookup, values) if code is not None})
+            if not matched:
+                return self.all_rows[:0]
+            size = sum(len(dimension.postings[code]) for code in matched)
+            codes.append((size, dimension, matched))
+        if not codes:
+            return self.all_rows
+        codes.sort(key=lambda entry: entry[0])
+        _, dimension, matched = codes[0]
+        if len(matched) == 1:
+            rows = dimension.postings[matched[0]]
+        else:
+            rows = np.sort(np.concatenate([dimension.postings[code] for code in matched]))
+        # Probe the remaining (less selective) dimensions through their code
+        # columns instead of intersecting two large posting lists.
+        for _, other, other_matched in codes[1:]:
+            if len(other_matched) == 1:
+                rows = rows[other.column[rows] == other_matched[0]]
+            else:
+                rows = rows[np.isin(other.column[rows], other_matched)]
+        return rows
+
+    def _is_full(self, rows: np.ndarray) -> bool:
+        return rows is self.all_rows
+
+    def totals(self, rows: np.ndarray) -> Dict[str, float]:
+        """Sum every metric over ``rows``."""
+
+        full = self._is_full(rows)
+        result: Dict[str, float] = {
+            name: (column.sum() if full else column[rows].sum()).item()
+            for name, column in self.metrics.items()
+        }
+        result["count"] = len(rows)
+        return result
+
+    def totals_by(self, dimension_name: str, rows: np.ndarray) -> Dict[object, Dict[str, float]]:
+        """Sum every metric over ``rows`` grouped by a dimension value."""
+
+        grouped = self.totals_by_many((dimension_name,), rows)
+        return {key[0]: totals for key, totals in grouped.items()}
+
+    def totals_by_many(self, dimension_names: Sequence[str], rows: np.ndarray) -> Dict[Tuple[object, ...], Dict[str, float]]:
+        """Sum every metric over ``rows`` grouped by a tuple of dimension values.
+
+        The per-dimension codes are combined into a single mixed-radix code so
+        the whole GROUP BY is one ``bincount`` per metric.
+        """
+
+        dimensions = [self.dimensions[name] for name in dimension_names]
+        full = self._is_full(rows)
+        codes = np.zeros(len(rows), dtype=np.int64)
+        size = 1
+        for dimension in dimensions:
+            column = dimension.column if full else dimension.column[rows]
+            codes = codes * len(dimension.values) + column
+            size *= len(dimension.values)
+        counts = np.bincount(codes, minlength=size)
+        sums = {
+            name: np.bincount(codes, weights=column if full else column[rows], minlength=size)
+            for name, column in self.metrics.items()
+        }
+        grouped: Dict[Tuple[object, ...], Dict[str, float]] = {}
+        for code in np.flatnonzero(counts).tolist():
+            totals: Dict[str, float] = {}
+            for name, dtype in METRIC_COLUMNS.items():
+                value = sums[name][code].item()
+                totals[name] = int(round(value)) if dtype is np.int64 else value
+            totals["count"] = int(counts[code])
+            key = []
+            remainder = code
+            for dimension in reversed(dimensions):
+                remainder, part = divmod(remainder, len(dimension.values))
+                key.append(dimension.values[part])
+            grouped[tuple(reversed(key))] = totals
+        return grouped
+
+    def _sort_key(self, field: str, rows: np.ndarray) -> np.ndarray:
+        if field == "id":
+            return self.ids[rows]
+        if field == "name":
+            if self._name_ranks is None:
+                # Equal names share a rank so ties still fall back to id.
+                self._name_ranks = np.unique(np.asarray(self.names), return_inverse=True)[1].astype(np.int64)
+            return self._name_ranks[rows]
+        if field in self.dimensions:
+            dimension = self.dimensions[field]
+            return dimension.ranks[dimension.column[rows]]
+        return self.metrics[field][rows]
+
+    def order(self, rows: np.ndarray, field: str, descending: bool = False) -> np.ndarray:
+        """``rows`` sorted on ``field`` (``id``, ``name``, a dimension or a metric), ties by id."""
+
+        key = self._sort_key(field, rows)
+        return rows[np.lexsort((self.ids[rows], -key if descending else key))]
+
+    def columns(self, rows: np.ndarray) -> Dict[str, List[object]]:
+        """Selected rows column-major: ``{field: [value per row]}`` in initiative field order."""
+
+        dims = self.dimensions
+        decoded = {
+            name: [dims[name].values[code] for code in dims[name].column[rows].tolist()]
+            for name in DIMENSIONS
+        }
+        names = self.names
+        return {
+            "id": self.ids[rows].tolist(),
+            "name": [names[index] for index in rows.tolist()],
+            "state": decoded["state"],
+            "scheme": decoded["scheme"],
+            "category": decoded["category"],
+            "year": decoded["year"],
+            "status": decoded["status"],
+            **{name: column[rows].tolist() for name, column in self.metrics.items()},
+        }
+
+    def rows(self, rows: np.ndarray) -> List[Dict[str, object]]:
+        columns = self.columns(rows)
+        fields = list(columns)
+        return [dict(zip(fields, values)) for values in zip(*columns.values())]
+
+
+_STORE: Optional[InitiativeStore] = None
+
+
+def get_store() -> InitiativeStore:
+    """Return the process-wide store over the demo dataset, generated on first use."""
+
+    global _STORE
+    if _STORE is None:
+        from .data import get_dataset
+
+        _STORE = InitiativeStore(get_dataset().iter_initiatives())
+    return _STORE
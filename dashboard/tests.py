@@ -1,3 +1,764 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import gc
+import gzip
+import io
+import json
+import math
+import posixpath
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import pstats
+from pathlib import Path
+from unittest import mock, skipUnless
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .ingest import copy_supported, load_initiatives
+from .live import live_events
+from .models import Initiative, Report, Scheme, State
+from .pdf import PdfRenderer
+from . import reports
+from . import search
+from . import views
+from . import warmup
+from .choropleth import class_breaks
+from .cube import cube_totals, cube_totals_by, refresh_cube
+from .data import DemoDataset
+from .dimensions import get_resolver
+from .exports import EXPORT_CSV_HEADER, REPORT_CSV_HEADER
+from .queries import (
+    INITIATIVE_FIELDS, INITIATIVES_MAX_PAGE_SIZE, db_totals, initiative_queryset, metric_aggregates, select_rows,
+    summarize, summarize_states,
+)
+from .cache import _MISSING, LocalMemoryBackend, PayloadCache, bump_data_version
+from .search import PostgresSearchBackend
+from .store import InitiativeStore
+
+
+def _records(**overrides):
+    rows = [
+        {"name": "Samagra Shiksha - Goa", "state": "Goa", "scheme": "Samagra Shiksha", "year": 2024,
+         "category": "Infrastructure", "status": "On Track", "progress": "70%", "schools_impacted": 10,
+         "students_impacted": 1000, "scholarships_awarded": 5, "budget_utilized": 1.5},
+        {"name": "SWAYAM - Kerala", "state": "Kerala", "scheme": "SWAYAM", "year": 2023,
+         "category": "Digital", "status": "Completed", "progress": "1.0", "schools_impacted": 20,
+         "students_impacted": 3000, "scholarships_awarded": 0, "budget_utilized": 2.0},
+    ]
+    return [{**row, **overrides} for row in rows]
+
+
+class LoadInitiativesTests(TestCase):
+    def assertLoads(self, use_copy):
+        stats = load_initiatives(_records(), use_copy=use_copy)
+        self.assertEqual(stats.rows, 2)
+        goa = Initiative.objects.get(name="Samagra Shiksha - Goa")
+        self.assertEqual((goa.state.name, goa.scheme.name, goa.year), ("Goa", "Samagra Shiksha", 2024))
+        self.assertAlmostEqual(goa.progress, 0.7)
+
+        # Same natural key: updated in place, not duplicated.
+        load_initiatives(_records(students_impacted=5), use_copy=use_copy)
+        self.assertEqual(Initiative.objects.count(), 2)
+        self.assertEqual(set(Initiative.objects.values_list("students_impacted", flat=True)), {5})
+
+        # Columns missing from the source keep their stored values.
+        load_initiatives([{"name": "SWAYAM - Kerala", "state": "Kerala", "scheme": "SWAYAM", "year": 2023,
+                           "status": "Delayed"}], use_copy=use_copy)
+        kerala = Initiative.objects.get(name="SWAYAM - Kerala")
+        self.assertEqual((kerala.status, kerala.students_impacted), ("Delayed", 5))
+
+    def assertLoadsMixedShapes(self, use_copy):
+        load_initiatives(_records(), use_copy=use_copy)
+        # One chunk, three shapes: all columns, status only, and no value columns at all.
+        load_initiatives([
+            {**_records()[0], "students_impacted": 9, "status": "Delayed"},
+            {"name": "SWAYAM - Kerala", "state": "Kerala", "scheme": "SWAYAM", "year": 2023, "students_impacted": 4},
+            {"name": "SWAYAM - Goa", "state": "Goa", "scheme": "SWAYAM", "year": 2024},
+        ], use_copy=use_copy)
+        rows = {name: (status, students) for name, status, students
+                in Initiative.objects.values_list("name", "status", "students_impacted")}
+        self.assertEqual(rows, {
+            "Samagra Shiksha - Goa": ("Delayed", 9),
+            "SWAYAM - Kerala": ("Completed", 4),
+            "SWAYAM - Goa": ("", 0),
+        })
+
+    def test_bulk_upsert(self):
+        self.assertLoads(use_copy=False)
+
+    def test_bulk_upsert_mixed_shapes(self):
+        self.assertLoadsMixedShapes(use_copy=False)
+
+    @skipUnless(connection.vendor == "postgresql" and copy_supported(), "COPY needs PostgreSQL with psycopg 3")
+    def test_copy_upsert(self):
+        self.assertLoads(use_copy=True)
+
+    @skipUnless(connection.vendor == "postgresql" and copy_supported(), "COPY needs PostgreSQL with psycopg 3")
+    def test_copy_upsert_mixed_shapes(self):
+        self.assertLoadsMixedShapes(use_copy=True)
+
+    @skipUnless(connection.vendor == "postgresql" and copy_supported(), "COPY needs PostgreSQL with psycopg 3")
+    def test_copy_upserts_inside_one_transaction(self):
+        # TestCase runs this in a transaction, so the staging table is never committed away.
+        load_initiatives(_records(), use_copy=True)
+        load_initiatives(_records(students_impacted=7), chunk_size=1, use_copy=True)
+        self.assertEqual(list(Initiative.objects.values_list("students_impacted", flat=True)), [7, 7])
+
+    def test_bad_rows_are_skipped(self):
+        stats = load_initiatives(_records() + [{"name": "No state", "scheme": "SWAYAM", "year": 2024},
+                                               {**_records()[0], "name": "Bad year", "year": "soon"}])
+        self.assertEqual((stats.rows, stats.skipped), (2, 2))
+
+
+class InitiativeStoreTests(TestCase):
+    CRITERIA = [
+        {},
+        {"year": 2024},
+        {"state": "Kerala", "scheme": "SWAYAM"},
+        {"state": ["Goa", "Kerala", "Bihar"], "year": 2023},
+        {"category": "Digital Learning", "status": ["Completed", "Delayed"]},
+        {"scheme": ["SWAYAM", "PM eVIDYA"], "state": "Nowhere"},
+    ]
+
+    def setUp(self):
+        self.items = list(DemoDataset(districts=2).iter_initiatives())
+        self.store = InitiativeStore(self.items)
+
+    def scan(self, criteria):
+        def matches(item):
+            return all(
+                item[name] in (value if isinstance(value, list) else [value]) for name, value in criteria.items()
+            )
+
+        return [index for index, item in enumerate(self.items) if matches(item)]
+
+    def test_select_and_grouped_totals_match_a_full_scan(self):
+        for criteria in self.CRITERIA:
+            with self.subTest(criteria=criteria):
+                expected = self.scan(criteria)
+                rows = self.store.select(**criteria)
+                self.assertEqual(rows.tolist(), expected)
+
+                grouped = {}
+                for index in expected:
+                    item = self.items[index]
+                    cell = grouped.setdefault(
+                        (item["state"], item["year"]), {"count": 0, "students_impacted": 0, "progress": 0}
+                    )
+                    cell["count"] += 1
+                    cell["students_impacted"] += item["students_impacted"]
+                    cell["progress"] += item["progress"]
+                totals = self.store.totals_by_many(("state", "year"), rows)
+                self.assertEqual(set(totals), set(grouped))
+                for key, cell in grouped.items():
+                    self.assertEqual(totals[key]["count"], cell["count"])
+                    self.assertEqual(totals[key]["students_impacted"], cell["students_impacted"])
+                    self.assertAlmostEqual(totals[key]["progress"], cell["progress"])
+
+
+class CubeTests(TestCase):
+    FILTERS = [
+        {},
+        {"year": "2024"},
+        {"state": "Kerala"},
+        {"state": "Goa", "year": "2023"},
+        {"scheme": "SWAYAM", "category": "Digital"},
+        {"state": "Goa", "scheme": "SWAYAM"},
+        # Slugs select the same cells as names.
+        {"state": "goa", "scheme": "swayam"},
+        {"state": "kerala", "year": "2024"},
+    ]
+
+    def setUp(self):
+        load_initiatives(_records())
+        load_initiatives(_records(year=2023, name="Second", students_impacted=40, progress=0.25))
+        load_initiatives([{**_records()[1], "state": "Goa", "name": "SWAYAM - Goa"}])
+        bump_data_version()
+
+    def assertMatchesOrm(self):
+        for overrides in self.FILTERS:
+            filters = {"year": None, "state": None, "scheme": None, "category": None, **overrides}
+            with self.subTest(filters=overrides):
+                expected = db_totals(initiative_queryset(filters).aggregate(**metric_aggregates()))
+                totals = cube_totals(filters)
+                self.assertEqual(set(totals), set(expected))
+                for name, value in expected.items():
+                    self.assertAlmostEqual(totals[name], value)
+                by_state = {
+                    (row["state__name"],): db_totals(row)
+                    for row in initiative_queryset(filters).values("state__name").annotate(**metric_aggregates()).order_by()
+                }
+                self.assertEqual(
+                    {key: cell["count"] for key, cell in cube_totals_by(filters, ("state",)).items()},
+                    {key: cell["count"] for key, cell in by_state.items()},
+                )
+
+    def test_cube_totals_match_orm_aggregates(self):
+        self.assertIsNone(cube_totals({"year": None, "state": None, "scheme": None, "category": None}))
+        refresh_cube()
+        self.assertMatchesOrm()
+
+    def test_an_empty_cube_result_is_authoritative(self):
+        refresh_cube()
+        # Bihar is in the in-memory demo data but not in the database.
+        filters = {"year": None, "state": "bihar", "scheme": None, "category": None}
+        self.assertEqual(summarize(filters)["initiatives"], 0)
+        self.assertEqual(summarize_states(filters), {})
+        self.assertEqual(summarize({**filters, "state": "goa"})["initiatives"], 3)
+
+    def test_saves_and_deletes_keep_the_cube_current(self):
+        refresh_cube()
+        moved = Initiative.objects.get(name="Second", state__name="Goa")
+        moved.year, moved.students_impacted = 2024, 90
+        moved.save()
+        Initiative.objects.get(name="SWAYAM - Goa").delete()
+        self.assertMatchesOrm()
+
+
+class DatabaseAggregateViewTests(TransactionTestCase):
+    # The views aggregate on a worker thread with its own connection, so the rows must be committed.
+    FILTERS = [{}, {"year": 2023}, {"state": "goa"}, {"scheme": "SWAYAM", "category": "Digital"}]
+
+    def setUp(self):
+        load_initiatives(_records())
+        load_initiatives(_records(year=2023, name="Second", students_impacted=40, progress=0.25))
+        load_initiatives([{**_records()[1], "state": "Goa", "name": "SWAYAM - Goa"}])
+        bump_data_version()
+
+    def orm(self, params):
+        filters = {"year": None, "state": None, "scheme": None, "category": None, **params}
+        total = db_totals(initiative_queryset(filters).aggregate(**metric_aggregates()))
+        by_state = {
+            row["state__name"]: db_totals(row)
+            for row in initiative_queryset(filters).values("state__name").annotate(**metric_aggregates()).order_by()
+        }
+        return total, by_state
+
+    def assertMatchesOrm(self):
+        for params in self.FILTERS:
+            with self.subTest(params=params):
+                total, by_state = self.orm(params)
+                cards = self.client.get("/api/v1/kpis", params).json()["cards"]
+                self.assertEqual(
+                    (cards["initiatives"], cards["students"], cards["schools"], cards["avg_progress_pct"]),
+                    (total["count"], total["students_impacted"], total["schools_impacted"],
+                     round(round(total["progress"] / total["count"], 2) * 100, 2)),
+                )
+                rows = self.client.get("/api/v1/map", params).json()["choropleth"]
+                self.assertEqual(
+                    {row["state"]: (row["students"], row["scholarships"]) for row in rows},
+                    {state: (cell["students_impacted"], cell["scholarships_awarded"]) for state, cell in by_state.items()},
+                )
+
+    def test_live_aggregates_match_the_orm(self):
+        self.assertMatchesOrm()
+
+    def test_cube_aggregates_match_the_orm(self):
+        refresh_cube()
+        bump_data_version()
+        self.assertMatchesOrm()
+
+
+@skipUnless(connection.vendor == "postgresql", "the trigram search backend needs PostgreSQL")
+class PostgresSearchTests(TestCase):
+    def setUp(self):
+        load_initiatives(_records())
+
+    def test_every_token_matches_name_state_or_scheme(self):
+        total, rows = PostgresSearchBackend().search("kerala swayam", 10, 0, None, None)
+        self.assertEqual((total, rows[0]["name"]), (1, "SWAYAM - Kerala"))
+        self.assertEqual(PostgresSearchBackend().search("goa swayam", 10, 0, None, None)[0], 0)
+        self.assertEqual(PostgresSearchBackend().search("shiksha", 10, 0, 2023, None)[0], 0)
+
+    def test_name_filter_can_use_the_trigram_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        self.assertIn("name_upper_trgm", PostgresSearchBackend().matching("shiksha").explain())
+
+    @override_settings(DASHBOARD_SEARCH_BACKEND="auto")
+    def test_auto_backend_checks_for_initiatives_once_per_data_version(self):
+        bump_data_version()
+        Initiative.objects.all().delete()
+        self.assertFalse(search.use_postgres_backend())
+        load_initiatives(_records())
+        with self.assertNumQueries(0):
+            self.assertFalse(search.use_postgres_backend())
+        bump_data_version()
+        self.assertTrue(search.use_postgres_backend())
+
+
+# Async views run their queries on pool threads with their own connections,
+# which cannot see a TestCase's open transaction.
+@skipUnless(connection.vendor == "postgresql", "the trigram search backend needs PostgreSQL")
+class PostgresSearchViewTests(TransactionTestCase):
+    def setUp(self):
+        load_initiatives(_records())
+
+    @override_settings(DASHBOARD_SEARCH_BACKEND="postgres")
+    def test_view_does_not_build_the_in_process_index(self):
+        search.reset_search_index()
+        data = self.client.get("/api/v1/search", {"query": "kera"}).json()
+        self.assertEqual([row["name"] for row in data["results"]], ["SWAYAM - Kerala"])
+        self.assertEqual(data["states"], [{"name": "Kerala", "slug": "kerala"}])
+        self.assertEqual(data["schemes"], [])
+        self.assertIsNone(search._INDEX)
+
+
+class DimensionResolverTests(TestCase):
+    def setUp(self):
+        load_initiatives(_records() + [{**_records()[0], "scheme": "PM POSHAN (Mid-Day Meal)", "state": "Tamil Nadu"}])
+        bump_data_version()
+
+    def test_slug_and_name_resolve_to_the_same_fk(self):
+        for dimension, model, name, slug in (
+            ("state", State, "Tamil Nadu", "tamil-nadu"),
+            ("state", State, "Goa", "goa"),
+            ("scheme", Scheme, "PM POSHAN (Mid-Day Meal)", "pm-poshan-mid-day-meal"),
+        ):
+            with self.subTest(name=name):
+                resolver = get_resolver(dimension)
+                pk = model.objects.get(name=name).pk
+                self.assertEqual((resolver.pk(name), resolver.pk(slug)), (pk, pk))
+                self.assertEqual(resolver.name(slug), name)
+                filters = {"year": None, "state": None, "scheme": None, "category": None}
+                ids = list(initiative_queryset({**filters, dimension: name}).values_list("id", flat=True))
+                self.assertTrue(ids)
+                self.assertEqual(list(initiative_queryset({**filters, dimension: slug}).values_list("id", flat=True)), ids)
+        self.assertIsNone(get_resolver("state").pk("atlantis"))
+
+
+class QueryPlanTests(TestCase):
+    def test_seeded_plans_use_an_index(self):
+        out = io.StringIO()
+        call_command("check_query_plans", "--seed", stdout=out)
+        self.assertTrue(Initiative.objects.exists())
+        self.assertIn("filter combinations and the keyset cursor use an index", out.getvalue())
+        self.assertNotIn("SEQ SCAN", out.getvalue())
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        load_initiatives(_records())
+        load_initiatives(_records(year=2023, name="Second"))
+        load_initiatives(_records(year=2024, name="Third"))
+
+    def test_pages_follow_the_ordering_without_gaps_or_repeats(self):
+        expected = list(Initiative.objects.order_by("year", "state_id", "id").values_list("id", flat=True))
+        seen, url = [], "/api/v1/db/initiatives/?pagination=cursor&page_size=2&fields=id"
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data["results"]), 2)
+            seen += [row["id"] for row in data["results"]]
+            url = data["next"] and "?".join(urlsplit(data["next"])[2:4])
+        self.assertEqual(seen, expected)
+
+    def test_a_malformed_cursor_is_not_found(self):
+        # Valid base64 JSON whose elements do not fit the (year, state_id, id) ordering.
+        for key in ('["a","b","c"]', "[2023,null,1]", "[2023,1]", '{"year":2023}', "[2023,[1],1]"):
+            with self.subTest(key=key):
+                cursor = base64.urlsafe_b64encode(key.encode()).decode()
+                response = self.client.get("/api/v1/db/initiatives/", {"cursor": cursor})
+                self.assertEqual((response.status_code, response.json()), (404, {"detail": "Invalid cursor"}))
+
+    def test_a_cursor_page_seeks_the_keyset_index(self):
+        out = io.StringIO()
+        call_command("check_query_plans", stdout=out)
+        self.assertIn("ok        api    keyset cursor", out.getvalue())
+
+
+class BatchTests(TestCase):
+    def batch(self, *queries):
+        return self.client.post("/api/v1/batch", {"queries": list(queries)}, content_type="application/json")
+
+    def test_results_come_back_by_id_and_shared_inputs_are_computed_once(self):
+        data = self.batch(
+            {"id": "kpis", "type": "kpis", "params": {"year": 2024}},
+            {"id": 7, "type": "kpis", "params": "year=2024"},
+            {"id": "map", "type": "map", "params": {"year": 2024}},
+            {"type": "points", "params": {"year": 2024}},
+        ).json()
+        self.assertEqual(set(data["results"]), {"kpis", "7", "map", "points"})
+        self.assertEqual(data["computed"], 2)
+        self.assertEqual(data["results"]["kpis"], data["results"]["7"])
+        self.assertEqual(data["results"]["kpis"], self.client.get("/api/v1/kpis", {"year": 2024}).json())
+        self.assertNotIn("errors", data)
+
+    def test_ids_must_be_strings_or_integers(self):
+        for query_id in ({"a": 1}, [1], True, 1.5):
+            with self.subTest(query_id=query_id):
+                response = self.batch({"id": query_id, "type": "kpis"})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("queries[0].id", response.json()["error"])
+
+    def test_invalid_params_fail_only_their_query(self):
+        response = self.batch({"id": "bad", "type": "kpis", "params": {"year": "abc"}}, {"id": "ok", "type": "kpis"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["errors"], {"bad": "year must be an integer."})
+        self.assertEqual(set(data["results"]), {"ok"})
+
+
+class CompareTrendsTests(TestCase):
+    def test_many_states_match_one_query_per_state(self):
+        states = ["Goa", "Kerala", "tamil-nadu", "Bihar", "Punjab"]
+        data = self.client.get(
+            "/api/v1/compare/trends", {"entities": ",".join(states), "scheme": "SWAYAM", "metric": "schools"}
+        ).json()
+        self.assertEqual([series["label"] for series in data["series"]], states)
+        for series in data["series"]:
+            for index, year in enumerate(data["years"]):
+                with self.subTest(state=series["label"], year=year):
+                    cards = self.client.get(
+                        "/api/v1/kpis", {"state": series["label"], "year": year, "scheme": "SWAYAM"}
+                    ).json()["cards"]
+                    self.assertGreater(cards["initiatives"], 0)
+                    self.assertEqual({key: values[index] for key, values in series["metrics"].items()}, cards)
+                    self.assertEqual(series["values"][index], cards["schools"])
+
+
+class CsvExportTests(TestCase):
+    def read(self, url, params):
+        response = self.client.get(url, params)
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode() if isinstance(chunk, bytes) else chunk for chunk in response.streaming_content]
+        return chunks, list(csv.reader(io.StringIO("".join(chunks))))
+
+    def test_exports_stream_the_header_then_every_matching_row(self):
+        for url, header, params in (
+            ("/api/v1/exports/data.csv", EXPORT_CSV_HEADER, {"year": 2024}),
+            ("/reports/download/", REPORT_CSV_HEADER, {"scheme": "swayam"}),
+        ):
+            filters = {"year": None, "state": None, "scheme": None, "category": None, **params}
+            with self.subTest(url=url):
+                chunks, rows = self.read(url, params)
+                self.assertEqual(rows[0], header)
+                self.assertEqual(len(rows) - 1, len(select_rows(filters)))
+                self.assertGreater(len(rows) - 1, 0)
+                # The header and at most 500 rows per chunk, not one buffered body.
+                self.assertEqual(len(chunks), 1 + -(-(len(rows) - 1) // 500))
+
+
+class ClassBreaksTests(TestCase):
+    def test_methods(self):
+        self.assertEqual(class_breaks(range(1, 11), "quantile", 5), [1, 2.8, 4.6, 6.4, 8.2, 10])
+        self.assertEqual(class_breaks([0, 10, 30, 100], "equal-interval", 4), [0, 25, 50, 75, 100])
+        self.assertEqual(class_breaks([50, 1, 12, 2, 11, 3, 10], "jenks", 3), [1, 3, 12, 50])
+
+    def test_degenerate_inputs(self):
+        self.assertEqual(class_breaks([], "quantile", 5), [])
+        # No more classes than values, and tied bounds merge.
+        self.assertEqual(class_breaks([1, 2], "quantile", 5), [1, 1.5, 2])
+        self.assertEqual(class_breaks([5, 5, 5, 5], "jenks", 3), [5, 5])
+
+
+class FilterValidationTests(TestCase):
+    def test_non_integer_year_is_a_bad_request(self):
+        for url in ("/api/v1/search?query=goa&year=abc", "/api/v1/kpis?year=abc", "/api/data/?year=20x4"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/search?query=goa&year=2024").status_code, 200)
+
+
+class BuildGeoTests(TestCase):
+    @staticmethod
+    def source():
+        # Two states sharing a wiggly border, traced once by each (in opposite directions).
+        border = [[1 + 0.02 * math.sin(index), index / 40] for index in range(41)]
+        west = [[0, 0], *border, [0, 1], [0, 0]]
+        east = [[2, 0], [2, 1], *reversed(border), [2, 0]]
+        return {"type": "FeatureCollection", "features": [
+            {"type": "Feature", "properties": {"state": name}, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+            for name, ring in (("West", west), ("East", east))
+        ]}
+
+    @staticmethod
+    def arc_ids(arcs):
+        if isinstance(arcs, int):
+            return {arcs if arcs >= 0 else ~arcs}
+        return set().union(*map(BuildGeoTests.arc_ids, arcs))
+
+    def test_built_levels_share_borders_and_ship_precompressed(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        source = Path(root, "boundaries.geojson")
+        source.write_text(json.dumps(self.source()))
+        geo = Path(root, "static", "geo")
+        call_command("build_geo", str(source), "--output", str(geo), "--zooms", "4", "8", stdout=io.StringIO())
+
+        with override_settings(STATICFILES_DIRS=[str(geo.parent)]):
+            data = self.client.get("/api/v1/geo").json()
+        self.assertEqual([level["zoom"] for level in data["levels"]], [4, 8])
+        built = json.loads((geo / "manifest.json").read_text())
+        for level, sizes in zip(data["levels"], (level["sizes"] for level in built["levels"])):
+            for extension in ("topojson", "geojson"):
+                path = geo / posixpath.basename(level[extension])
+                self.assertTrue(path.is_file(), path)
+                self.assertIn("gzip", sizes[extension])
+                self.assertEqual(gzip.decompress((geo / f"{path.name}.gz").read_bytes()), path.read_bytes())
+                if "br" in sizes[extension]:
+                    self.assertTrue((geo / f"{path.name}.br").is_file())
+
+            topology = json.loads((geo / posixpath.basename(level["topojson"])).read_text())
+            west, east = (self.arc_ids(geometry["arcs"]) for geometry in topology["objects"]["states"]["geometries"])
+            self.assertTrue(west & east, "the shared border must be one arc referenced by both states")
+            self.assertTrue(west - east and east - west)
+
+
+class InitiativesWindowTests(TestCase):
+    def get(self, **params):
+        return self.client.get("/api/v1/initiatives", {"year": 2024, **params}).json()
+
+    def test_sort_page_and_fields_are_validated(self):
+        data = self.get(sort="-students_impacted", page=2, page_size=5, fields="name,students_impacted,bogus")
+        self.assertEqual((data["sort"], data["page"], data["page_size"]), ("-students_impacted", 2, 5))
+        self.assertEqual(list(data["results"][0]), ["name", "students_impacted"])
+        first = self.get(sort="-students_impacted", page_size=10)["results"]
+        self.assertEqual(data["results"], [{"name": row["name"], "students_impacted": row["students_impacted"]}
+                                           for row in first[5:]])
+        students = [row["students_impacted"] for row in first]
+        self.assertEqual(students, sorted(students, reverse=True))
+
+        # Unknown or malformed values fall back to the defaults (sizes are clamped) rather than failing.
+        fallback = self.get(sort="password", page="zero", page_size="-3", fields="bogus")
+        self.assertEqual((fallback["sort"], fallback["page"], fallback["page_size"]), ("id", 1, 1))
+        self.assertEqual(list(fallback["results"][0]), list(INITIATIVE_FIELDS))
+        self.assertEqual(self.get(page_size=10 ** 6)["page_size"], INITIATIVES_MAX_PAGE_SIZE)
+
+        past_the_end = self.get(page=10 ** 6)
+        self.assertEqual((past_the_end["results"], past_the_end["total"]), ([], data["total"]))
+
+
+class ColumnLayoutTests(TestCase):
+    @staticmethod
+    def to_rows(columns):
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    def test_columns_round_trip_to_the_row_layout(self):
+        params = {"year": 2024, "scheme": "SWAYAM", "page_size": 7, "page": 2, "sort": "-students_impacted"}
+        rows = self.client.get("/api/data/", params).json()
+        columns = self.client.get("/api/data/", {**params, "layout": "columns"}).json()
+        self.assertEqual(columns.pop("layout"), "columns")
+        self.assertEqual(len(columns["initiatives"]["results"]["id"]), 7)
+        columns["initiatives"]["results"] = self.to_rows(columns["initiatives"]["results"])
+        columns["map"] = self.to_rows(columns["map"])
+        self.assertEqual(columns, rows)
+
+        params["fields"] = "name,state,progress_pct"
+        rows = self.client.get("/api/v1/initiatives", params).json()
+        columns = self.client.get("/api/v1/initiatives", {**params, "layout": "columns"}).json()
+        self.assertEqual(list(columns["results"]), ["name", "state", "progress_pct"])
+        columns["results"] = self.to_rows(columns["results"])
+        self.assertEqual(columns, rows)
+
+
+class ConditionalGetTests(TestCase):
+    def test_a_matching_etag_is_not_modified_until_the_data_version_changes(self):
+        first = self.client.get("/api/v1/kpis", {"year": 2024, "scheme": "SWAYAM"})
+        etag = first["ETag"]
+        self.assertEqual(first.status_code, 200)
+        with mock.patch("dashboard.views.summarize") as summarize:
+            cached = self.client.get("/api/v1/kpis", {"scheme": "SWAYAM", "year": 2024}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((cached.status_code, cached.content, cached["ETag"]), (304, b"", etag))
+        summarize.assert_not_called()
+
+        bump_data_version()
+        changed = self.client.get("/api/v1/kpis", {"year": 2024, "scheme": "SWAYAM"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertEqual(changed.json(), first.json())
+
+
+class SharedDataVersionTests(TestCase):
+    def test_a_bump_in_one_process_reaches_the_others(self):
+        worker, command = LocalMemoryBackend(version_ttl=0), LocalMemoryBackend(version_ttl=0)
+        before = worker.get_version()
+        self.assertEqual(command.get_version(), before)
+        worker.set("key", "stale")
+        bumped = command.bump_version()
+        self.assertGreater(bumped, before)
+        self.assertEqual(worker.get_version(), bumped)
+        self.assertIs(worker.get("key"), _MISSING)
+
+    def test_the_shared_version_is_read_at_most_once_per_ttl(self):
+        worker = LocalMemoryBackend(version_ttl=60)
+        worker.get_version()
+        with self.assertNumQueries(0):
+            worker.get_version()
+
+    async def test_the_event_loop_never_queries(self):
+        cache = PayloadCache(LocalMemoryBackend(version_ttl=0))
+        cache.backend.get_version()  # would raise SynchronousOnlyOperation if it queried
+        self.assertEqual(await cache.aversion(), cache.backend._version)
+
+
+class PdfRendererTests(TestCase):
+    def renderer(self, **options):
+        renderer = PdfRenderer(cache_dir=tempfile.mkdtemp(), idle_timeout=0, **options)
+        self.addCleanup(shutil.rmtree, renderer.cache_dir)
+        # Threads instead of spawned processes, so the patched write_pdf is the one that runs.
+        renderer._pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(renderer._pool.shutdown)
+        return renderer
+
+    @mock.patch("dashboard.pdf.write_pdf", side_effect=lambda html, base_url: f"%PDF {html}".encode())
+    def test_a_cache_hit_returns_the_same_bytes_without_rendering(self, write_pdf):
+        renderer = self.renderer()
+        build_html = mock.Mock(return_value="<p>Goa</p>")
+        first = renderer.render("state_print.html", {"state": "Goa"}, "/", build_html)
+        second = renderer.render("state_print.html", {"state": "Goa"}, "/", build_html)
+        self.assertEqual((first.cache_hit, second.cache_hit), (False, True))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual((build_html.call_count, write_pdf.call_count), (1, 1))
+        self.assertEqual(renderer.stats()["cache_hits"], 1)
+
+    @mock.patch("dashboard.pdf.write_pdf", return_value=b"%PDF")
+    def test_the_cache_is_bounded_without_listing_it_on_every_store(self, write_pdf):
+        renderer = self.renderer(max_cached_files=50)
+        with mock.patch.object(Path, "glob", autospec=True, side_effect=Path.glob) as glob:
+            for index in range(200):
+                renderer.render("state_print.html", {"state": str(index)}, "/", lambda: "<p></p>")
+        self.assertLessEqual(len(list(renderer.cache_dir.glob("*/*.pdf"))), 50)
+        self.assertLessEqual(glob.call_count, 1 + 200 // 5)
+
+
+class ReportQueueTests(TestCase):
+    def setUp(self):
+        load_initiatives(_records())
+        bump_data_version()  # as manage.py load_initiatives does: drops cached dimension ids
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        settings = override_settings(DASHBOARD_REPORTS_ROOT=root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_drain_queue_builds_the_csv(self):
+        report = reports.enqueue_report({"filters": {"state": "Kerala"}})
+        self.assertEqual(reports.drain_queue(), 1)
+        report.refresh_from_db()
+        self.assertEqual(report.status, Report.STATUS_READY)
+        lines = reports.artifact_path(report, "csv").read_text().splitlines()
+        self.assertEqual(lines[0].split(",")[0], "Initiative")
+        self.assertEqual([line.split(",")[0] for line in lines[1:]], ["SWAYAM - Kerala"])
+
+    def test_stale_running_reports_are_requeued_and_rebuilt(self):
+        report = reports.enqueue_report({})
+        Report.objects.filter(pk=report.pk).update(
+            status=Report.STATUS_RUNNING, started_at=timezone.now() - reports.stale_after() - timedelta(seconds=1)
+        )
+        self.assertEqual(reports.drain_queue(), 1)
+        report.refresh_from_db()
+        self.assertEqual((report.status, report.attempts), (Report.STATUS_READY, 1))
+
+    def test_a_report_that_keeps_beating_is_not_requeued(self):
+        report = reports.enqueue_report({})
+        long_ago = timezone.now() - reports.stale_after() * 2
+        Report.objects.filter(pk=report.pk).update(
+            status=Report.STATUS_RUNNING, started_at=long_ago, heartbeat_at=long_ago
+        )
+        reports.beat([report.report_id])
+        self.assertEqual(reports.requeue_stale_reports(reports.stale_after()), 0)
+        Report.objects.filter(pk=report.pk).update(heartbeat_at=long_ago)
+        self.assertEqual(reports.requeue_stale_reports(reports.stale_after()), 1)
+
+    def test_a_host_without_the_file_serves_the_database_copy(self):
+        report = reports.enqueue_report({"filters": {"state": "Goa"}})
+        reports.drain_queue()
+        report.refresh_from_db()
+        path = reports.artifact_path(report, "csv")
+        built = path.read_bytes()
+        path.unlink()
+        response = self.client.get(f"/reports/{report.report_id}", {"download": "csv"})
+        self.assertEqual(b"".join(response.streaming_content), built)
+        self.assertTrue(path.is_file())
+
+    def test_web_process_builds_reports_without_a_worker(self):
+        for inline, state in ((True, "Goa"), (False, "Kerala")):
+            with self.subTest(inline=inline), override_settings(DASHBOARD_REPORTS_INLINE=inline), \
+                    mock.patch("dashboard.views.process_inline") as process_inline:
+                response = self.client.post("/api/v1/reports", {"filters": {"state": state}}, content_type="application/json")
+                self.assertEqual(response.json()["status"], "queued")
+                self.assertEqual(process_inline.called, inline)
+
+
+class LiveEventsTests(TestCase):
+    async def test_a_failed_first_snapshot_is_retried_by_the_next_subscriber(self):
+        calls = []
+
+        async def compute(filters):
+            calls.append(filters)
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+            return {"kpis": {"students": 1}, "map": []}
+
+        filters = {"year": "2024", "state": None, "scheme": None, "category": None}
+        with self.assertLogs("dashboard.live", "ERROR"):
+            failed = [event async for event in live_events(compute, filters, None, once=True)]
+        self.assertEqual(failed, [b"retry: 3000\n\n"])
+        events = [event async for event in live_events(compute, filters, None, once=True)]
+        self.assertEqual(len(calls), 2)
+        self.assertIn(b"event: snapshot", events[-1])
+
+
+class ProfilingTests(TestCase):
+    async def test_asgi_requests_are_profiled_on_their_worker_threads(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(DASHBOARD_PROFILING={
+            "ENABLED": True, "PROFILE_SAMPLE_RATE": 1, "SLOW_REQUEST_MS": 0, "PROFILE_DIR": root,
+        }):
+            # Filters no other test asked for, so the summary is computed rather than cached.
+            response = await self.async_client.get("/api/v1/kpis", {"category": "profiled"})
+            self.assertEqual(response.status_code, 200)
+            [dump] = Path(root).glob("*.prof")
+            functions = {function for _, _, function in pstats.Stats(str(dump)).stats}
+        self.assertIn("summarize", functions)
+
+
+class OffloadedWorkTests(TestCase):
+    async def test_async_views_offload_to_a_capped_pool(self):
+        def where():
+            time.sleep(0.01)
+            return threading.current_thread().name
+
+        names = await asyncio.gather(*(views._in_thread(where) for _ in range(20)))
+        self.assertTrue(all(name.startswith("dashboard-db") for name in names), names)
+        self.assertLessEqual(len(set(names)), getattr(settings, "DASHBOARD_DB_THREADS", 4))
+
+
+class PreforkWarmUpTests(TransactionTestCase):
+    # Not TestCase: the hook closes every connection, which a wrapping transaction would not survive.
+    def server(self, preload_app=True):
+        return mock.Mock(cfg=mock.Mock(preload_app=preload_app))
+
+    def test_when_ready_warms_every_step_and_leaves_no_connection_open(self):
+        from mhrd_dashboard import gunicorn_conf
+
+        load_initiatives(_records())
+        bump_data_version()
+        self.addCleanup(gc.unfreeze)
+        server = self.server()
+        gunicorn_conf.when_ready(server)
+
+        # The master must not hand its database socket to the forked workers
+        # (Django never closes an in-memory SQLite test database).
+        if not (connection.vendor == "sqlite" and connection.is_in_memory_db()):
+            self.assertIsNone(connection.connection)
+        self.assertGreater(gc.get_freeze_count(), 0)
+        _, _, steps, _ = server.log.info.call_args.args
+        self.assertEqual([step.split()[0] for step in steps.split(", ")], [name for name, _ in warmup.STEPS])
+
+    def test_without_preload_each_worker_loads_the_app_itself(self):
+        from mhrd_dashboard import gunicorn_conf
+
+        with mock.patch("dashboard.warmup.warm_up") as warm_up:
+            gunicorn_conf.when_ready(self.server(preload_app=False))
+        warm_up.assert_not_called()
 
-# Create your tests here.
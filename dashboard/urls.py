@@ -38,6 +38,8 @@ urlpatterns = [
     path('api/v1/kpis', views.api_kpis, name='api-kpis'),
     path('api/v1/trends', views.api_trends, name='api-trends'),
     path('api/v1/map', views.api_map, name='api-map'),
+    path('api/v1/geo', views.api_geo, name='api-geo'),
+    path('api/v1/initiatives', views.api_initiatives, name='api-initiatives'),
     path('api/v1/schemes', views.api_schemes, name='api-schemes'),
     path('api/v1/schemes/<slug:scheme_id>/kpis', views.api_scheme_kpis, name='api-scheme-kpis'),
     path('api/v1/reports', views.api_create_report, name='api-create-report'),  # POST
@@ -45,5 +47,7 @@ urlpatterns = [
     path('api/v1/exports/data.csv', views.api_export_csv, name='api-export-csv'),
     path('api/v1/search', views.api_search, name='api-search'),
     path('api/v1/compare/trends', views.api_compare_trends, name='api-compare-trends'),
+    path('api/v1/batch', views.api_batch, name='api-batch'),
+    path('api/v1/live', views.api_live, name='api-live'),
     path('api/v1/db/', include(router.urls)),
 ]
@@ -1,27 +1,78 @@
 from __future__ import annotations
 
-import csv
+import asyncio
+import hashlib
 import json
-from io import StringIO
-from typing import Dict, List, Optional, Tuple
-
-from django.http import HttpRequest, HttpResponse, JsonResponse
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    QueryDict,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render
-from django.views.decorators.http import require_GET, require_http_methods
+from django.views.decorators.http import etag, require_GET, require_http_methods
 from django.views.decorators.csrf import csrf_exempt
+from django.utils.log import log_response
 from django.utils.text import slugify
 
 from .data import (
     CATEGORIES,
-    ENROLLMENT_DATA,
-    INITIATIVES,
+    INDIAN_STATES,
     MONTHS,
     SCHEMES,
-    SCHOLARSHIP_DATA,
     STATE_COORDINATES,
     YEARS,
-    aggregate_initiatives_by_state,
+    get_dataset,
 )
+from .cache import get_payload_cache, normalize_filters
+from .choropleth import CHOROPLETH_METRICS, CLASS_METHODS, DEFAULT_CLASSES, MAX_CLASSES, classify
+from .conditional import conditional_get
+from .cube import cube_totals_by
+from .dimensions import canonical_name, get_resolver
+from .pdf import RendererBusy, get_pdf_renderer
+from .encoding import JsonResponse, encoder_name
+from .exports import EXPORT_CSV_HEADER, REPORT_CSV_HEADER, csv_chunks, export_csv_row, report_csv_row
+from .geo import boundaries as geo_boundaries, manifest as geo_manifest
+from .live import live_events
+from .profiling import latency_stats, record_path, run_profiled
+from .queries import (
+    DEFAULT_WINDOW,
+    INITIATIVE_FIELDS,
+    INITIATIVES_MAX_PAGE_SIZE,
+    INITIATIVES_PAGE_SIZE,
+    INITIATIVES_SORT,
+    METRIC_FIELDS,
+    db_totals,
+    initiative_queryset,
+    initiatives_window,
+    iter_initiatives,
+    log_fallback,
+    metric_aggregates,
+    print_payload,
+    summarize,
+    summarize_states,
+    summary_from_totals,
+)
+from .reports import REPORT_FORMATS, artifact_path, enqueue_report, process_inline, report_id_for
+from .search import PostgresSearchBackend, get_search_index, use_postgres_backend
+from .store import get_store
+
+
+logger = logging.getLogger(__name__)
 
 
 try:
@@ -33,93 +84,207 @@ except Exception:
     ReportModel = None 
 
 
-def _parse_filters(request) -> Dict[str, Optional[str]]:
+T = TypeVar("T")
+
+
+_DB_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_DB_EXECUTOR_LOCK = threading.Lock()
+
+
+def _db_executor() -> ThreadPoolExecutor:
+    # Created on first use, so a preloading gunicorn master forks before any thread exists.
+    global _DB_EXECUTOR
+    if _DB_EXECUTOR is None:
+        with _DB_EXECUTOR_LOCK:
+            if _DB_EXECUTOR is None:
+                _DB_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max(1, getattr(settings, "DASHBOARD_DB_THREADS", 4)), thread_name_prefix="dashboard-db"
+                )
+    return _DB_EXECUTOR
+
+
+def _in_thread(func: Callable[..., T], *args) -> Awaitable[T]:
+    """Run a sync helper from an async view on a ``DASHBOARD_DB_THREADS`` pool thread.
+
+    Each pool thread has its own database connection, so helpers awaited
+    together really run their queries concurrently, while the pool size caps
+    the connections a process holds (the loop's default executor would allow
+    up to 32). Connections are released afterwards once past ``CONN_MAX_AGE``
+    or broken, as at the end of a request.
+    """
+
+    def call() -> T:
+        try:
+            return run_profiled(func, *args)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(call, thread_sensitive=False, executor=_db_executor())()
+
+
+def _async_require_http_methods(methods: Sequence[str]):
+    """``require_http_methods`` for ``async def`` views; Django 4.2's decorator only wraps sync ones."""
+
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in methods:
+                response = HttpResponseNotAllowed(methods)
+                log_response("Method Not Allowed (%s): %s", request.method, request.path, response=response, request=request)
+                return response
+            return await view(request, *args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+_async_require_GET = _async_require_http_methods(["GET"])
+
+
+async def _acached(namespace: str, filters: Dict[str, Optional[str]], func: Callable[[Dict[str, Optional[str]]], T]) -> T:
+    """``func(filters)`` on a pool thread, memoized in the payload cache under ``namespace``."""
+    return await get_payload_cache().aget_or_compute(namespace, filters, lambda: _in_thread(func, filters))
+
+
+def _parse_year(params: QueryDict) -> Optional[str]:
+    """The ``year`` parameter, or None; a value that is not an integer is a 400."""
+    year = params.get("year") or None
+    if year is not None:
+        try:
+            int(year)
+        except ValueError:
+            raise BadRequest("year must be an integer.") from None
+    return year
+
+
+def _parse_filters(params: QueryDict) -> Dict[str, Optional[str]]:
     return {
-        "year": request.GET.get("year") or None,
-        "state": request.GET.get("state") or None,
-        "scheme": request.GET.get("scheme") or None,
-        "category": request.GET.get("category") or None,
+        "year": _parse_year(params),
+        "state": params.get("state") or None,
+        "scheme": params.get("scheme") or None,
+        "category": params.get("category") or None,
     }
 
 
-def _filter_initiatives(filters: Dict[str, Optional[str]]) -> List[Dict[str, object]]:
-    # Prefer DB if populated; fallback to in-memory data
-    if InitiativeModel is not None:
-        try:
-            qs = InitiativeModel.objects.select_related('state', 'scheme').all()
-            if filters["year"]:
-                qs = qs.filter(year=int(filters["year"]))
-            if filters["state"]:
-                qs = qs.filter(state__name=filters["state"])
-            if filters["scheme"]:
-                qs = qs.filter(scheme__name=filters["scheme"])
-            if filters["category"]:
-                qs = qs.filter(category=filters["category"])
-            if qs.exists():
-                result: List[Dict[str, object]] = []
-                for obj in qs:
-                    result.append({
-                        "id": obj.id,
-                        "name": obj.name,
-                        "state": obj.state.name,
-                        "scheme": obj.scheme.name,
-                        "category": obj.category,
-                        "year": obj.year,
-                        "status": obj.status,
-                        "progress": float(obj.progress),
-                        "schools_impacted": int(obj.schools_impacted),
-                        "students_impacted": int(obj.students_impacted),
-                        "scholarships_awarded": int(obj.scholarships_awarded),
-                        "budget_utilized": float(obj.budget_utilized),
-                    })
-                return result
-        except Exception:
-            pass  # fall back
-    filtered: List[Dict[str, object]] = []
-    for initiative in INITIATIVES:
-        if filters["year"] and initiative["year"] != int(filters["year"]):
-            continue
-        if filters["state"] and initiative["state"] != filters["state"]:
-            continue
-        if filters["scheme"] and initiative["scheme"] != filters["scheme"]:
-            continue
-        if filters["category"] and initiative["category"] != filters["category"]:
-            continue
-        filtered.append(initiative)
-    return filtered
+LAYOUTS = ("rows", "columns")
 
 
-def _derive_dashboard_metrics(
-    filters: Dict[str, Optional[str]],
-) -> Tuple[Dict[str, object], List[Dict[str, object]], Dict[str, Dict[str, float]]]:
-    initiatives = _filter_initiatives(filters)
-    total_schools = sum(int(item["schools_impacted"]) for item in initiatives)
-    total_students = sum(int(item["students_impacted"]) for item in initiatives)
-    total_scholarships = sum(int(item["scholarships_awarded"]) for item in initiatives)
-    avg_progress_ratio = round(
-        sum(float(item["progress"]) for item in initiatives) / len(initiatives), 2
-    ) if initiatives else 0
-
-    summary = {
-        "schools": total_schools,
-        "students": total_students,
-        "scholarships": total_scholarships,
-        "avg_progress_ratio": avg_progress_ratio,
-        "avg_progress_pct": round(avg_progress_ratio * 100, 2),
-        "initiatives": len(initiatives),
+def _parse_window(params: QueryDict) -> Dict[str, object]:
+    """page, page_size, sort and fields for an initiatives window; bad values fall back to defaults."""
+    sort = params.get("sort") or INITIATIVES_SORT
+    if sort.lstrip("-") not in INITIATIVE_FIELDS:
+        sort = INITIATIVES_SORT
+    requested = [name.strip() for name in (params.get("fields") or "").split(",")]
+    fields = tuple(name for name in INITIATIVE_FIELDS if name in requested) or INITIATIVE_FIELDS
+    return {
+        "page": max(1, _int_param(params, "page", 1)),
+        "page_size": max(1, _int_param(params, "page_size", INITIATIVES_PAGE_SIZE, maximum=INITIATIVES_MAX_PAGE_SIZE)),
+        "sort": sort,
+        "fields": fields,
     }
 
-    state_summary = aggregate_initiatives_by_state(initiatives)
-    return summary, initiatives, state_summary
+
+async def _iterate_async(chunks: Iterator[str]) -> AsyncIterator[str]:
+    # Each step runs on the request's sync thread, where a server-side cursor
+    # opened by the first step keeps its connection.
+    chunks = iter(chunks)
+    while True:
+        chunk = await sync_to_async(next)(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _csv_response(
+    request: HttpRequest,
+    header: Sequence[str],
+    initiatives: Iterable[Dict[str, object]],
+    to_row: Callable[[Dict[str, object]], List[object]],
+    filename: str,
+) -> StreamingHttpResponse:
+    chunks = csv_chunks(header, initiatives, to_row)
+    if isinstance(request, ASGIRequest):
+        # ASGI would otherwise read a sync iterator to the end before sending.
+        chunks = _iterate_async(chunks)
+    response = StreamingHttpResponse(chunks, content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+SERIES_METRICS = ("students", "schools", "scholarships", "avg_progress_pct", "initiatives")
+
+
+def _yearly_totals(filters: Dict[str, Optional[str]], states: Sequence[str]) -> Dict[Tuple[object, ...], Dict[str, float]]:
+    """Totals keyed by (state, year), or by (year,) when ``states`` is empty.
+
+    One cube query (or GROUP BY query) on the DB path, one grouped reduction on the store.
+    """
+    fields = ["state_id", "year"] if states else ["year"]
+    try:
+        cells = cube_totals_by(filters, ("state", "year") if states else ("year",), states)
+        if cells is not None:
+            record_path("cube")
+            return cells
+        qs = initiative_queryset(filters)
+        if qs is not None:
+            resolver = get_resolver("state")
+            if states:
+                qs = qs.filter(state_id__in=[pk for pk in map(resolver.pk, states) if pk is not None])
+            rows = qs.values(*fields).annotate(**metric_aggregates()).order_by()
+            grouped = {
+                ((resolver.name_for_pk(row["state_id"]), row["year"]) if states else (row["year"],)): db_totals(row)
+                for row in rows
+            }
+            if grouped:
+                record_path("db")
+                return grouped
+    except Exception:
+        log_fallback("Yearly totals")
+    record_path("memory")
+    store = get_store()
+    rows = store.select(
+        year=int(filters["year"]) if filters["year"] else None,
+        state=list(states) or None,
+        scheme=canonical_name("scheme", filters["scheme"]),
+        category=filters["category"],
+    )
+    return store.totals_by_many(("state", "year") if states else ("year",), rows)
+
+
+def _series_by_state_year(
+    states: Sequence[str], filters: Dict[str, Optional[str]]
+) -> Dict[Tuple[str, int], Dict[str, object]]:
+    """Summary cards for every (state, year), computed in a single grouped pass.
+
+    ``filters`` supplies the remaining scheme/category constraints. An empty
+    state name stands for all states; cells without initiatives get zeroed cards.
+    States may be given by name or slug; the grid keeps the form it was given.
+    """
+    named = [canonical_name("state", state) for state in states if state]
+    grouped: Dict[Tuple[object, ...], Dict[str, float]] = _yearly_totals(filters, named) if named else {}
+    if "" in states:
+        grouped.update({("", year): totals for (year,), totals in _yearly_totals(filters, []).items()})
+    empty = summary_from_totals({field: 0 for field in (*METRIC_FIELDS, "count")})
+    grid: Dict[Tuple[str, int], Dict[str, object]] = {}
+    for state in states:
+        for year in YEARS:
+            totals = grouped.get((canonical_name("state", state), year))
+            grid[(state, year)] = summary_from_totals(totals) if totals else empty
+    return grid
+
+
+def _derive_dashboard_metrics(
+    filters: Dict[str, Optional[str]], window: Dict[str, object] = DEFAULT_WINDOW,
+) -> Tuple[Dict[str, object], Dict[str, object], Dict[str, Dict[str, float]]]:
+    return summarize(filters), initiatives_window(filters, **window), summarize_states(filters)
 
 
 def _prepare_trends(filters: Dict[str, Optional[str]]) -> Dict[str, List[object]]:
     year = int(filters["year"]) if filters["year"] else YEARS[-1]
     primary = []
     secondary = []
-    for entry in ENROLLMENT_DATA:
-        if entry["year"] != year:
-            continue
+    for entry in get_dataset().enrollment(year):
         primary.append(entry["primary"])
         secondary.append(entry["secondary"])
     return {
@@ -134,9 +299,7 @@ def _prepare_scholarships(filters: Dict[str, Optional[str]]) -> Dict[str, List[o
     year = int(filters["year"]) if filters["year"] else YEARS[-1]
     states = []
     values = []
-    for entry in SCHOLARSHIP_DATA:
-        if entry["year"] != year:
-            continue
+    for entry in get_dataset().scholarships(year):
         states.append(entry["state"])
         values.append(entry["beneficiaries"])
     return {
@@ -146,15 +309,10 @@ def _prepare_scholarships(filters: Dict[str, Optional[str]]) -> Dict[str, List[o
     }
 
 
-def _build_dashboard_payload(filters: Dict[str, Optional[str]]) -> Dict[str, object]:
-    summary, initiatives, state_summary = _derive_dashboard_metrics(filters)
-    normalized_initiatives: List[Dict[str, object]] = []
-    for item in initiatives:
-        normalized = dict(item)
-        normalized["progress_pct"] = round(float(item["progress"]) * 100, 2)
-        normalized_initiatives.append(normalized)
-    trends = _prepare_trends(filters)
-    scholarship = _prepare_scholarships(filters)
+_MAP_POINT_FIELDS = ("state", "lat", "lng", "schools", "students", "scholarships", "avg_progress")
+
+
+def _map_points(state_summary: Dict[str, Dict[str, float]]) -> List[Dict[str, object]]:
     map_points = []
     for state, data in state_summary.items():
         coords = STATE_COORDINATES.get(state)
@@ -172,25 +330,122 @@ def _build_dashboard_payload(filters: Dict[str, Optional[str]]) -> Dict[str, obj
             }
         )
     map_points.sort(key=lambda item: item["state"])
+    return map_points
 
-    return {
+
+def _assemble_payload(
+    filters: Dict[str, Optional[str]],
+    summary: Dict[str, object],
+    initiatives: Dict[str, object],
+    state_summary: Dict[str, Dict[str, float]],
+    layout: str = "rows",
+) -> Dict[str, object]:
+    map_points = _map_points(state_summary)
+    if layout == "columns":
+        map_points = {field: [point[field] for point in map_points] for field in _MAP_POINT_FIELDS}
+    trends = _prepare_trends(filters)
+    scholarship = _prepare_scholarships(filters)
+
+    payload = {
         "summary": summary,
         "trends": trends,
         "scholarships": scholarship,
-        "initiatives": normalized_initiatives,
+        "initiatives": initiatives,
         "map": map_points,
-        "filters": filters,
     }
+    if layout == "columns":
+        payload["layout"] = layout
+    return payload
+
+
+def _compute_dashboard_payload(
+    filters: Dict[str, Optional[str]], window: Dict[str, object] = DEFAULT_WINDOW
+) -> Dict[str, object]:
+    return _assemble_payload(filters, *_derive_dashboard_metrics(filters, window))
+
+
+async def _acompute_dashboard_payload(
+    filters: Dict[str, Optional[str]], layout: str = "rows", window: Dict[str, object] = DEFAULT_WINDOW
+) -> Dict[str, object]:
+    """``_compute_dashboard_payload`` with its independent queries run concurrently,
+    so the payload takes as long as the slowest of them rather than their sum."""
+    summary, initiatives, state_summary = await asyncio.gather(
+        _in_thread(summarize, filters),
+        _in_thread(lambda: initiatives_window(filters, layout=layout, **window)),
+        _in_thread(summarize_states, filters),
+    )
+    return _assemble_payload(filters, summary, initiatives, state_summary, layout)
+
+
+def _cache_namespace(name: str, layout: str = "rows", window: Dict[str, object] = DEFAULT_WINDOW) -> str:
+    """Cache namespace for ``name`` under a layout and initiatives window; plain ``name`` for the defaults."""
+    if layout == "rows" and window == DEFAULT_WINDOW:
+        return name
+    variant = repr((layout, sorted(window.items()))).encode("utf-8")
+    return f"{name}-{hashlib.sha1(variant).hexdigest()[:12]}"
+
+
+def _build_dashboard_payload(
+    filters: Dict[str, Optional[str]], window: Dict[str, object] = DEFAULT_WINDOW
+) -> Dict[str, object]:
+    # Cached per normalized filters, initiatives window and data version; the
+    # shared dict is never mutated, each caller gets a shallow copy carrying
+    # its own filters.
+    payload = get_payload_cache().get_or_compute(
+        _cache_namespace("payload", window=window), filters, lambda: _compute_dashboard_payload(filters, window)
+    )
+    return {**payload, "filters": filters}
+
+
+async def _abuild_dashboard_payload(
+    filters: Dict[str, Optional[str]], layout: str = "rows", window: Dict[str, object] = DEFAULT_WINDOW
+) -> Dict[str, object]:
+    payload = await get_payload_cache().aget_or_compute(
+        _cache_namespace("payload", layout, window), filters,
+        lambda: _acompute_dashboard_payload(filters, layout, window),
+    )
+    return {**payload, "filters": filters}
+
+
+def _pdf_response(request, template_name: str, context: Dict[str, object], filename: str) -> HttpResponse:
+    """Serve a PDF from the warm renderer pool; print HTML when WeasyPrint is missing."""
+    renderer = get_pdf_renderer()
+    if renderer is None:
+        return render(request, template_name, context)
+    try:
+        result = renderer.render(
+            template_name,
+            context,
+            request.build_absolute_uri("/"),
+            lambda: render(request, template_name, context).content.decode("utf-8"),
+        )
+    except RendererBusy:
+        response = HttpResponse("PDF renderer busy, retry shortly.", status=503, content_type="text/plain")
+        response["Retry-After"] = "5"
+        return response
+    except Exception:
+        logger.exception("PDF render failed for %s; serving print HTML", template_name)
+        return render(request, template_name, context)
+    response = HttpResponse(result.content, content_type="application/pdf")
+    response["Content-Disposition"] = f'inline; filename="{filename}.pdf"'
+    response["X-PDF-Cache"] = "hit" if result.cache_hit else "miss"
+    response["Server-Timing"] = f"pdf-queue;dur={result.queue_ms:.1f}, pdf-render;dur={result.render_ms:.1f}"
+    return response
 
 
 # -------- Frontend pages ---------
+def _without_initiatives(payload: Dict[str, object]) -> Dict[str, object]:
+    return {key: value for key, value in payload.items() if key != "initiatives"}
+
+
 @require_GET
 def overview(request) -> HttpResponse:
-    filters = _parse_filters(request)
-    payload = _build_dashboard_payload(filters)
+    filters = _parse_filters(request.GET)
+    version = get_payload_cache().version  # read first: the payload is at least this fresh
+    payload = _build_dashboard_payload(filters, _parse_window(request.GET))
     filter_options = {
         "years": YEARS,
-        "states": sorted({item["state"] for item in INITIATIVES}),
+        "states": sorted(INDIAN_STATES),
         "schemes": sorted(set(SCHEMES)),
         "categories": sorted(set(CATEGORIES)),
     }
@@ -199,6 +454,8 @@ def overview(request) -> HttpResponse:
         "dashboard/overview.html",
         {
             "payload": payload,
+            # The table is rendered from the window above; the script data leaves it out.
+            "initial_data": {**_without_initiatives(payload), "version": version},
             "filters": filter_options,
         },
     )
@@ -206,129 +463,99 @@ def overview(request) -> HttpResponse:
 
 @require_GET
 def states_list(request) -> HttpResponse:
-    states = sorted({item["state"] for item in INITIATIVES})
+    states = sorted(INDIAN_STATES)
     return render(request, "dashboard/states.html", {"states": states})
 
 
 @require_GET
 def state_detail(request, state_slug: str) -> HttpResponse:
-    # slug maps to state name
-    states = {slugify(s): s for s in {i["state"] for i in INITIATIVES}}
-    if StateModel is not None:
-        try:
-            for s in StateModel.objects.values_list('slug', 'name'):
-                states[s[0]] = s[1]
-        except Exception:
-            pass
-    state_name = states.get(state_slug)
+    states = get_resolver("state")
+    state_name = states.name(state_slug)
     if not state_name:
         return render(request, "dashboard/state_detail.html", {"state": None, "initiatives": []}, status=404)
-    filters = {**_parse_filters(request), "state": state_name}
-    payload = _build_dashboard_payload(filters)
+    filters = {**_parse_filters(request.GET), "state": state_name}
+    payload = _build_dashboard_payload(filters, _parse_window(request.GET))
     filter_options = {
         "years": YEARS,
-        "states": sorted({item["state"] for item in INITIATIVES} | set(states.values())),
+        "states": states.names(),
         "schemes": sorted(set(SCHEMES)),
         "categories": sorted(set(CATEGORIES)),
     }
-    return render(request, "dashboard/state_detail.html", {"state": state_name, "payload": payload, "filters": filter_options})
+    return render(request, "dashboard/state_detail.html", {
+        "state": state_name, "payload": payload, "detail_data": _without_initiatives(payload), "filters": filter_options,
+    })
 
 
 @require_GET
 def state_print(request, state_slug: str) -> HttpResponse:
-    states = {slugify(s): s for s in {i["state"] for i in INITIATIVES}}
-    state_name = states.get(state_slug, state_slug)
-    filters = {**_parse_filters(request), "state": state_name}
-    payload = _build_dashboard_payload(filters)
+    state_name = get_resolver("state").name(state_slug) or state_slug
+    filters = {**_parse_filters(request.GET), "state": state_name}
+    payload = print_payload(filters)
     return render(request, "dashboard/state_print.html", {"state": state_name, "payload": payload})
 
 
 @require_GET
 def state_pdf(request, state_slug: str) -> HttpResponse:
-    states = {slugify(s): s for s in {i["state"] for i in INITIATIVES}}
-    state_name = states.get(state_slug, state_slug)
-    filters = {**_parse_filters(request), "state": state_name}
-    payload = _build_dashboard_payload(filters)
-    try:
-        from weasyprint import HTML  # type: ignore
-        html = render(request, "dashboard/state_print.html", {"state": state_name, "payload": payload}).content.decode("utf-8")
-        pdf = HTML(string=html, base_url=request.build_absolute_uri("/")).write_pdf()
-        response = HttpResponse(pdf, content_type="application/pdf")
-        response["Content-Disposition"] = f'inline; filename="{slugify(state_name)}.pdf"'
-        return response
-    except Exception:
-        return render(request, "dashboard/state_print.html", {"state": state_name, "payload": payload})
+    state_name = get_resolver("state").name(state_slug) or state_slug
+    filters = {**_parse_filters(request.GET), "state": state_name}
+    payload = print_payload(filters)
+    return _pdf_response(request, "dashboard/state_print.html", {"state": state_name, "payload": payload}, slugify(state_name))
 
 
 @require_GET
 def schemes_list(request) -> HttpResponse:
     schemes_info: List[Dict[str, object]] = []
+    store = get_store()
     for s in sorted(set(SCHEMES)):
         slug = slugify(s)
-        items = [i for i in INITIATIVES if str(i.get("scheme")) == s]
-        states = sorted({str(i.get("state")) for i in items})
+        rows = store.select(scheme=s)
         schemes_info.append({
             "name": s,
             "slug": slug,
-            "initiatives_count": len(items),
-            "states_count": len(states),
+            "initiatives_count": len(rows),
+            "states_count": len(store.totals_by("state", rows)),
         })
     return render(request, "dashboard/schemes.html", {"schemes": schemes_info})
 
 
 @require_GET
 def scheme_detail(request, scheme_slug: str) -> HttpResponse:
-    mapping = {slugify(s): s for s in set(SCHEMES)}
-    if SchemeModel is not None:
-        try:
-            for s in SchemeModel.objects.values_list('slug', 'name'):
-                mapping[s[0]] = s[1]
-        except Exception:
-            pass
-    scheme_name = mapping.get(scheme_slug)
+    schemes = get_resolver("scheme")
+    scheme_name = schemes.name(scheme_slug)
     if not scheme_name:
         return render(request, "dashboard/scheme_detail.html", {"scheme": None, "payload": {}}, status=404)
-    filters = {**_parse_filters(request), "scheme": scheme_name}
-    payload = _build_dashboard_payload(filters)
+    filters = {**_parse_filters(request.GET), "scheme": scheme_name}
+    payload = _build_dashboard_payload(filters, _parse_window(request.GET))
     filter_options = {
         "years": YEARS,
-        "states": sorted({item["state"] for item in INITIATIVES}),
-        "schemes": sorted(set(mapping.values())),
+        "states": sorted(INDIAN_STATES),
+        "schemes": schemes.names(),
         "categories": sorted(set(CATEGORIES)),
     }
-    return render(request, "dashboard/scheme_detail.html", {"scheme": scheme_name, "payload": payload, "filters": filter_options})
+    return render(request, "dashboard/scheme_detail.html", {
+        "scheme": scheme_name, "payload": payload, "detail_data": _without_initiatives(payload), "filters": filter_options,
+    })
 
 
 @require_GET
 def scheme_print(request, scheme_slug: str) -> HttpResponse:
-    mapping = {slugify(s): s for s in set(SCHEMES)}
-    scheme_name = mapping.get(scheme_slug, scheme_slug)
-    filters = {**_parse_filters(request), "scheme": scheme_name}
-    payload = _build_dashboard_payload(filters)
+    scheme_name = get_resolver("scheme").name(scheme_slug) or scheme_slug
+    filters = {**_parse_filters(request.GET), "scheme": scheme_name}
+    payload = print_payload(filters)
     return render(request, "dashboard/scheme_print.html", {"scheme": scheme_name, "payload": payload})
 
 
 @require_GET
 def scheme_pdf(request, scheme_slug: str) -> HttpResponse:
-    mapping = {slugify(s): s for s in set(SCHEMES)}
-    scheme_name = mapping.get(scheme_slug, scheme_slug)
-    filters = {**_parse_filters(request), "scheme": scheme_name}
-    payload = _build_dashboard_payload(filters)
-    # Try server-side PDF if WeasyPrint is available; else return print HTML
-    try:
-        from weasyprint import HTML  # type: ignore
-        html = render(request, "dashboard/scheme_print.html", {"scheme": scheme_name, "payload": payload}).content.decode("utf-8")
-        pdf = HTML(string=html, base_url=request.build_absolute_uri("/")).write_pdf()
-        response = HttpResponse(pdf, content_type="application/pdf")
-        response["Content-Disposition"] = f'inline; filename="{slugify(scheme_name)}.pdf"'
-        return response
-    except Exception:
-        return render(request, "dashboard/scheme_print.html", {"scheme": scheme_name, "payload": payload})
+    scheme_name = get_resolver("scheme").name(scheme_slug) or scheme_slug
+    filters = {**_parse_filters(request.GET), "scheme": scheme_name}
+    payload = print_payload(filters)
+    return _pdf_response(request, "dashboard/scheme_print.html", {"scheme": scheme_name, "payload": payload}, slugify(scheme_name))
 
 
 @require_GET
 def compare_view(request) -> HttpResponse:
-    states = sorted({item["state"] for item in INITIATIVES})
+    states = sorted(INDIAN_STATES)
     schemes = sorted(set(SCHEMES))
     filter_options = {"years": YEARS, "states": states, "schemes": schemes}
     return render(request, "dashboard/compare.html", {"filters": filter_options})
@@ -345,6 +572,14 @@ def reports_list(request) -> HttpResponse:
     return render(request, "dashboard/reports.html", {"reports": reports})
 
 
+def _report_files(report) -> List[Dict[str, str]]:
+    return [
+        {"format": fmt, "url": f"/reports/{report.report_id}?download={fmt}"}
+        for fmt in REPORT_FORMATS
+        if fmt in (report.artifacts or {})
+    ]
+
+
 @require_GET
 def report_detail(request, report_id: str) -> HttpResponse:
     report = None
@@ -354,6 +589,14 @@ def report_detail(request, report_id: str) -> HttpResponse:
             report = ReportModel.objects.filter(report_id=report_id).first()
         except Exception:
             report = None
+    download = request.GET.get("download")
+    if download:
+        # Finished artifacts are served from disk; nothing is recomputed here.
+        path = artifact_path(report, download) if report is not None else None
+        if path is None:
+            raise Http404("Report file not available")
+        content_type = "application/pdf" if download == "pdf" else "text/csv"
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=path.name, content_type=content_type)
     if report is None:
         # Fallback minimal info
         files = [
@@ -361,81 +604,56 @@ def report_detail(request, report_id: str) -> HttpResponse:
         ]
         ctx = {"report_id": report_id, "status": "unknown", "files": files}
     else:
-        files = [
-            {"format": "pdf", "url": f"/reports/{report.report_id}?download=pdf"},
-            {"format": "csv", "url": f"/api/v1/exports/data.csv?report={report.report_id}"},
-        ]
+        files = _report_files(report)
         ctx = {"report_id": report.report_id, "status": report.status, "created_at": report.created_at, "files": files, "params": report.params}
     return render(request, "dashboard/report_detail.html", ctx)
 
 
 # -------- Legacy/simple endpoints ---------
-@require_GET
-def dashboard_data(request: HttpRequest) -> JsonResponse:
-    filters = _parse_filters(request)
-    payload = _build_dashboard_payload(filters)
+@_async_require_GET
+@conditional_get
+async def dashboard_data(request: HttpRequest) -> JsonResponse:
+    """Full dashboard payload. ``initiatives`` is one page of matches (see
+    ``api_initiatives`` for page, page_size, sort and fields). ``?layout=columns``
+    sends the initiatives and map column-major (``{field: [values]}``), which is
+    smaller and faster to encode."""
+    filters = _parse_filters(request.GET)
+    payload = await _abuild_dashboard_payload(filters, _parse_layout(request.GET), _parse_window(request.GET))
     return JsonResponse(payload)
 
 
-@require_GET
-def state_map_data(request: HttpRequest) -> JsonResponse:
-    filters = _parse_filters(request)
-    payload = _build_dashboard_payload(filters)
-    return JsonResponse({"map": payload["map"]})
+@_async_require_GET
+@conditional_get
+async def state_map_data(request: HttpRequest) -> JsonResponse:
+    state_summary = await _acached("state-summary", _parse_filters(request.GET), summarize_states)
+    return JsonResponse({"map": _map_points(state_summary)})
 
 
 @require_GET
 def download_report(request: HttpRequest) -> HttpResponse:
-    filters = _parse_filters(request)
-    _, initiatives, _ = _derive_dashboard_metrics(filters)
-
-    buffer = StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(
-        [
-            "Initiative",
-            "State",
-            "Scheme",
-            "Category",
-            "Year",
-            "Status",
-            "Progress",
-            "Schools Impacted",
-            "Students Impacted",
-            "Scholarships Awarded",
-            "Budget Utilized (Cr)",
-        ]
+    filters = _parse_filters(request.GET)
+    return _csv_response(
+        request, REPORT_CSV_HEADER, iter_initiatives(filters), report_csv_row, "mhrd_dashboard_report.csv"
     )
-    for init in initiatives:
-        writer.writerow(
-            [
-                init["name"],
-                init["state"],
-                init["scheme"],
-                init["category"],
-                init["year"],
-                init["status"],
-                f"{float(init['progress'])*100:.0f}%",
-                init["schools_impacted"],
-                init["students_impacted"],
-                init["scholarships_awarded"],
-                init["budget_utilized"],
-            ]
-        )
-    response = HttpResponse(buffer.getvalue(), content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="mhrd_dashboard_report.csv"'
-    return response
 
 
 # -------- API v1 ---------
 @require_GET
 def api_health(request: HttpRequest) -> JsonResponse:
-    return JsonResponse({"ok": True})
+    renderer = get_pdf_renderer()
+    return JsonResponse({
+        "ok": True,
+        "cache": get_payload_cache().stats(),
+        "pdf": renderer.stats() if renderer is not None else None,
+        "latency": latency_stats(),
+        "json_encoder": encoder_name(),
+    })
 
 
 @require_GET
+@conditional_get
 def api_meta(request: HttpRequest) -> JsonResponse:
-    states = sorted({item["state"] for item in INITIATIVES})
+    states = sorted(INDIAN_STATES)
     schemes = [{"id": slugify(s), "name": s, "slug": slugify(s)} for s in sorted(set(SCHEMES))]
     return JsonResponse({
         "states": states,
@@ -445,10 +663,14 @@ def api_meta(request: HttpRequest) -> JsonResponse:
     })
 
 
-@require_GET
-def api_kpis(request: HttpRequest) -> JsonResponse:
-    filters = _parse_filters(request)
-    summary, initiatives, _ = _derive_dashboard_metrics(filters)
+@_async_require_GET
+@conditional_get
+async def api_kpis(request: HttpRequest) -> JsonResponse:
+    summary = await _acached("summary", _parse_filters(request.GET), summarize)
+    return JsonResponse(_kpi_cards(summary))
+
+
+def _kpi_cards(summary: Dict[str, object]) -> Dict[str, object]:
     cards = {
         "schools": summary["schools"],
         "students": summary["students"],
@@ -456,20 +678,68 @@ def api_kpis(request: HttpRequest) -> JsonResponse:
         "avg_progress_pct": summary["avg_progress_pct"],
         "initiatives": summary["initiatives"],
     }
-    return JsonResponse({"cards": cards, "count": len(initiatives)})
+    return {"cards": cards, "count": summary["initiatives"]}
 
 
 @require_GET
+@conditional_get
 def api_trends(request: HttpRequest) -> JsonResponse:
-    filters = _parse_filters(request)
+    filters = _parse_filters(request.GET)
     series = _prepare_trends(filters)
     return JsonResponse(series)
 
 
-@require_GET
-def api_map(request: HttpRequest) -> JsonResponse:
-    filters = _parse_filters(request)
-    _, _, state_summary = _derive_dashboard_metrics(filters)
+@_async_require_GET
+@conditional_get
+async def api_map(request: HttpRequest) -> JsonResponse:
+    """Per-state map values for the filters.
+
+    With ``metric`` (students|schools|scholarships|progress) and/or
+    ``classes`` (quantile|equal-interval|jenks; ``k`` classes, at most 9) the
+    values come classified for the boundary files of /api/v1/geo: ``breaks``,
+    one colour per class, and ``classes``/``values`` per boundary feature in
+    file order (class -1: no data). ``geometry`` is the boundary version they
+    follow. Without either, the legacy ``choropleth`` rows.
+    """
+    filters = _parse_filters(request.GET)
+    if "metric" in request.GET or "classes" in request.GET:
+        return JsonResponse(await _aclassified_map(filters, _parse_classes(request.GET)))
+    rows = await get_payload_cache().aget_or_compute("choropleth", filters, lambda: _achoropleth(filters))
+    return JsonResponse(rows)
+
+
+async def _achoropleth(filters: Dict[str, Optional[str]]) -> Dict[str, object]:
+    return _choropleth(await _acached("state-summary", filters, summarize_states))
+
+
+def _parse_classes(params: QueryDict) -> Dict[str, object]:
+    """metric, classification method and class count for the map; bad values fall back to defaults."""
+    metric = params.get("metric")
+    method = params.get("classes")
+    return {
+        "metric": metric if metric in CHOROPLETH_METRICS else "students",
+        "method": method if method in CLASS_METHODS else CLASS_METHODS[0],
+        "count": max(1, _int_param(params, "k", DEFAULT_CLASSES, maximum=MAX_CLASSES)),
+    }
+
+
+async def _aclassified_map(filters: Dict[str, Optional[str]], options: Dict[str, object]) -> Dict[str, object]:
+    # Cached per filters, classification and boundary version: a few hundred
+    # bytes that every client on the same view shares.
+    geometry, states = await _in_thread(geo_boundaries)
+
+    async def compute() -> Dict[str, object]:
+        state_summary = await _acached("state-summary", filters, summarize_states)
+        return {**classify(state_summary, states, **options), "geometry": geometry}
+
+    return await get_payload_cache().aget_or_compute(_map_namespace(options, geometry), filters, compute)
+
+
+def _map_namespace(options: Dict[str, object], geometry: str) -> str:
+    return f"map-{options['metric']}-{options['method']}-{options['count']}-{geometry}"
+
+
+def _choropleth(state_summary: Dict[str, Dict[str, float]]) -> Dict[str, object]:
     choropleth = [
         {
             "state": state,
@@ -481,23 +751,58 @@ def api_map(request: HttpRequest) -> JsonResponse:
         for state, payload in state_summary.items()
     ]
     choropleth.sort(key=lambda x: x["state"]) 
-    return JsonResponse({"choropleth": choropleth})
+    return {"choropleth": choropleth}
 
 
 @require_GET
+@etag(lambda request: geo_manifest()[0])
+def api_geo(request: HttpRequest) -> JsonResponse:
+    """Which boundary file the map should load at each zoom level.
+
+    ``levels`` ascend by ``zoom`` (the most detailed zoom each file is
+    simplified for) with the URL of its TopoJSON (``object`` names the
+    geometry collection) and GeoJSON. The files are content-hashed and
+    served immutable and precompressed; see ``manage.py build_geo``.
+    """
+    return JsonResponse(geo_manifest()[1])
+
+
+@require_GET
+@conditional_get
 def api_schemes(request: HttpRequest) -> JsonResponse:
     data = [{"id": slugify(s), "name": s, "slug": slugify(s)} for s in sorted(set(SCHEMES))]
     return JsonResponse({"schemes": data})
 
 
-@require_GET
-def api_scheme_kpis(request: HttpRequest, scheme_id: str) -> JsonResponse:
+@_async_require_GET
+@conditional_get
+async def api_initiatives(request: HttpRequest) -> JsonResponse:
+    """One sorted page of matching initiatives and the total match count.
+    Params: year?, state?, scheme?, category?, page (from 1), page_size (<=500),
+    sort (a field, ``-field`` for descending), fields (comma-separated), layout (rows|columns).
+    """
+    return JsonResponse(await _ainitiatives(request.GET))
+
+
+async def _ainitiatives(params: QueryDict) -> Dict[str, object]:
+    filters = _parse_filters(params)
+    layout = _parse_layout(params)
+    window = _parse_window(params)
+    data = await get_payload_cache().aget_or_compute(
+        _cache_namespace("initiatives", layout, window), filters,
+        lambda: _in_thread(lambda: initiatives_window(filters, layout=layout, **window)),
+    )
+    return {**data, "fields": list(window["fields"])}
+
+
+@_async_require_GET
+@conditional_get
+async def api_scheme_kpis(request: HttpRequest, scheme_id: str) -> JsonResponse:
     # Accept either slug or exact name
-    mapping = {slugify(s): s for s in set(SCHEMES)}
-    scheme_name = mapping.get(scheme_id, scheme_id)
-    filters = {**_parse_filters(request), "scheme": scheme_name}
-    summary, initiatives, _ = _derive_dashboard_metrics(filters)
-    return JsonResponse({"schemeId": scheme_id, "cards": summary, "count": len(initiatives)})
+    scheme_name = await _in_thread(get_resolver("scheme").name, scheme_id) or scheme_id
+    filters = {**_parse_filters(request.GET), "scheme": scheme_name}
+    summary = await _in_thread(summarize, filters)
+    return JsonResponse({"schemeId": scheme_id, "cards": summary, "count": summary["initiatives"]})
 
 
 @csrf_exempt
@@ -507,18 +812,21 @@ def api_create_report(request: HttpRequest) -> JsonResponse:
         payload = json.loads(request.body or b"{}")
     except json.JSONDecodeError:
         payload = {}
-    # In a real app, enqueue a job and persist. Here we persist immediately.
-    report_id = f"rpt_{abs(hash(json.dumps(payload, sort_keys=True))) % 10_000_000}"
-    status_val = "ready"
+    if not isinstance(payload, dict):
+        payload = {}
+    # Artifacts are built by `manage.py process_reports`, or, when a deploy
+    # opts in with DASHBOARD_REPORTS_INLINE, off the request thread here.
+    report_id = report_id_for(payload)
+    status_val = "queued"
     if ReportModel is not None:
         try:
-            obj, created = ReportModel.objects.get_or_create(report_id=report_id, defaults={"params": payload, "status": status_val})
-            if not created:
-                obj.params = payload
-                obj.status = status_val
-                obj.save(update_fields=["params", "status"])
+            report = enqueue_report(payload)
+            report_id, status_val = report.report_id, report.status
         except Exception:
             pass
+        else:
+            if status_val == ReportModel.STATUS_QUEUED and getattr(settings, "DASHBOARD_REPORTS_INLINE", False):
+                process_inline()
     return JsonResponse({"reportId": report_id, "status": status_val}, status=202)
 
 
@@ -526,88 +834,301 @@ def api_create_report(request: HttpRequest) -> JsonResponse:
 def api_get_report(request: HttpRequest, report_id: str) -> JsonResponse:
     files = []
     status_val = "unknown"
+    error = ""
     if ReportModel is not None:
         try:
             rpt = ReportModel.objects.filter(report_id=report_id).first()
             if rpt is not None:
                 status_val = rpt.status
+                error = rpt.error
+                files = _report_files(rpt)
         except Exception:
             pass
-    files = [
-        {"format": "pdf", "url": f"/reports/{report_id}?download=pdf"},
-        {"format": "csv", "url": f"/api/v1/exports/data.csv?report={report_id}"},
-    ]
-    return JsonResponse({"reportId": report_id, "status": status_val, "files": files})
+    data: Dict[str, object] = {"reportId": report_id, "status": status_val, "files": files}
+    if error:
+        data["error"] = error
+    return JsonResponse(data)
 
 
 @require_GET
+@conditional_get
 def api_export_csv(request: HttpRequest) -> HttpResponse:
-    filters = _parse_filters(request)
-    _, initiatives, _ = _derive_dashboard_metrics(filters)
-    buffer = StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(["name", "state", "scheme", "category", "year", "progress", "schools", "students", "scholarships", "budget"])
-    for init in initiatives:
-        writer.writerow([
-            init["name"], init["state"], init["scheme"], init["category"], init["year"],
-            f"{float(init['progress'])*100:.0f}%", init["schools_impacted"], init["students_impacted"], init["scholarships_awarded"], init["budget_utilized"]
-        ])
-    response = HttpResponse(buffer.getvalue(), content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="mhrd_export.csv"'
-    return response
+    filters = _parse_filters(request.GET)
+    return _csv_response(request, EXPORT_CSV_HEADER, iter_initiatives(filters), export_csv_row, "mhrd_export.csv")
 
 
-@require_GET
-def api_search(request: HttpRequest) -> JsonResponse:
+def _parse_layout(params: QueryDict) -> str:
+    return params.get("layout") if params.get("layout") in LAYOUTS else "rows"
+
+
+def _int_param(params: QueryDict, name: str, default: int, maximum: Optional[int] = None) -> int:
+    try:
+        value = max(0, int(params.get(name, default)))
+    except (TypeError, ValueError):
+        value = default
+    return min(value, maximum) if maximum is not None else value
+
+
+def _search(
+    query: str, limit: int, offset: int, year: Optional[int], category: Optional[str]
+) -> Tuple[int, List[Dict[str, object]], List[Dict[str, object]], List[Dict[str, object]]]:
+    """(total, initiative results, matching states, matching schemes) for a non-empty query."""
+    if use_postgres_backend():
+        # Never build the in-process index here: it would hold every initiative in each worker.
+        backend = PostgresSearchBackend()
+        total, results = backend.search(query, limit, offset, year, category)
+        return total, results, backend.dimension_matches(query, "state"), backend.dimension_matches(query, "scheme")
+    index = get_search_index()
+    total, results = index.search(query, limit=limit, offset=offset, year=year, category=category)
+    _, states = index.search(query, kind="state", limit=5)
+    _, schemes = index.search(query, kind="scheme", limit=5)
+    return total, results, states, schemes
+
+
+@_async_require_GET
+@conditional_get
+async def api_search(request: HttpRequest) -> JsonResponse:
+    """Typeahead search. Params: query, limit (<=100), offset, year?, category?"""
     query = (request.GET.get("query") or "").strip().lower()
+    limit = _int_param(request.GET, "limit", 20, maximum=100)
+    offset = _int_param(request.GET, "offset", 0)
+    year = _parse_year(request.GET)
+    category = request.GET.get("category") or None
     results: List[Dict[str, object]] = []
+    states: List[Dict[str, object]] = []
+    schemes: List[Dict[str, object]] = []
+    total = 0
     if query:
-        for init in INITIATIVES:
-            if (
-                query in str(init["name"]).lower()
-                or query in str(init["state"]).lower()
-                or query in str(init["scheme"]).lower()
-            ):
-                results.append({
-                    "id": init["id"],
-                    "name": init["name"],
-                    "state": init["state"],
-                    "scheme": init["scheme"],
-                    "year": init["year"],
-                    "category": init["category"],
-                })
-    return JsonResponse({"query": query, "results": results})
+        total, results, states, schemes = await _in_thread(
+            _search, query, limit, offset, int(year) if year else None, category
+        )
+    return JsonResponse({
+        "query": query,
+        "results": results,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "states": states,
+        "schemes": schemes,
+    })
 
 
-@require_GET
-def api_compare_trends(request: HttpRequest) -> JsonResponse:
-    """Return simple yearly series for left/right entities.
-    Params: left, right (state names), scheme?, metric? (students|schools|scholarships|avg_progress_pct)
+@_async_require_GET
+@conditional_get
+async def api_compare_trends(request: HttpRequest) -> JsonResponse:
+    """Return yearly series for any number of states.
+    Params: entities (comma-separated state names) and/or left, right; scheme?, category?,
+    metric? (students|schools|scholarships|avg_progress_pct). Every metric is returned under
+    ``series[].metrics``; ``values`` and the legacy ``left``/``right`` keys carry ``metric``.
     """
-    left = request.GET.get("left") or ""
-    right = request.GET.get("right") or ""
-    scheme = request.GET.get("scheme") or None
-    metric = (request.GET.get("metric") or "students").lower()
+    query = _parse_compare(request.GET)
+    grid = await _in_thread(_series_by_state_year, query["entities"], query["filters"])
+    return JsonResponse(_compare_series(query, grid))
+
+
+def _parse_compare(params: QueryDict) -> Dict[str, object]:
+    left = params.get("left") or ""
+    right = params.get("right") or ""
+    metric = (params.get("metric") or "students").lower()
+    if metric not in SERIES_METRICS:
+        metric = "students"
+    entities: List[str] = [left, right] if "entities" not in params else [name for name in (left, right) if name]
+    for value in params.getlist("entities"):
+        entities.extend(name.strip() for name in value.split(",") if name.strip())
+    return {
+        "left": left,
+        "right": right,
+        "legacy": "entities" not in params,
+        "metric": metric,
+        "entities": list(dict.fromkeys(entities)),
+        "filters": {
+            "year": None,
+            "state": None,
+            "scheme": params.get("scheme") or None,
+            "category": params.get("category") or None,
+        },
+    }
+
+
+def _compare_series(query: Dict[str, object], grid: Dict[Tuple[str, int], Dict[str, object]]) -> Dict[str, object]:
+    left, right, metric, entities = query["left"], query["right"], query["metric"], query["entities"]
     years = YEARS  # use available years
-    def value_for(filters):
-        series = []
-        for y in years:
-            f = {**filters, "year": str(y)}
-            summary, _, _ = _derive_dashboard_metrics(f)
-            if metric == "schools":
-                series.append(summary["schools"]) 
-            elif metric == "scholarships":
-                series.append(summary["scholarships"]) 
-            elif metric == "avg_progress_pct":
-                series.append(summary["avg_progress_pct"]) 
-            else:
-                series.append(summary["students"]) 
-        return series
-    left_filters = {"state": left, "scheme": scheme, "category": request.GET.get("category") or None}
-    right_filters = {"state": right, "scheme": scheme, "category": request.GET.get("category") or None}
-    return JsonResponse({
+    series = {
+        name: {key: [grid[(name, year)][key] for year in years] for key in SERIES_METRICS}
+        for name in entities
+    }
+    response: Dict[str, object] = {
         "years": years,
         "metric": metric,
-        "left": {"label": left, "values": value_for(left_filters)},
-        "right": {"label": right, "values": value_for(right_filters)},
-    })
+        "series": [
+            {"label": name, "values": series[name][metric], "metrics": series[name]}
+            for name in entities
+        ],
+    }
+    if left or query["legacy"]:
+        response["left"] = {"label": left, "values": series[left][metric]}
+    if right or query["legacy"]:
+        response["right"] = {"label": right, "values": series[right][metric]}
+    return response
+
+
+
+# -------- Batch ---------
+BATCH_QUERIES = ("kpis", "map", "points", "trends", "scholarships", "initiatives", "compare")
+BATCH_MAX_QUERIES = 20
+
+_Plan = Tuple[Tuple[object, ...], Callable[[], Awaitable[object]], Callable[[object], object]]
+
+
+def _batch_plan(kind: str, params: QueryDict) -> _Plan:
+    """(input key, input computation, result shaping) for one batch sub-query.
+
+    The key names the input the result is shaped from, so sub-queries that
+    need the same input (``kpis`` for one filter set asked twice, or ``map``
+    and ``points`` over the same per-state totals) share one computation.
+    """
+    filters = _parse_filters(params)
+    key = normalize_filters(filters)
+    if kind == "kpis":
+        return ("summary", key), lambda: _acached("summary", filters, summarize), _kpi_cards
+    if kind == "map" and ("metric" in params or "classes" in params):
+        options = _parse_classes(params)
+        map_key = ("map-classes", key, tuple(sorted(options.items())))
+        return map_key, lambda: _aclassified_map(filters, options), lambda value: value
+    if kind in ("map", "points"):
+        shape = _choropleth if kind == "map" else (lambda summary: {"map": _map_points(summary)})
+        return ("state-summary", key), lambda: _acached("state-summary", filters, summarize_states), shape
+    if kind in ("trends", "scholarships"):
+        prepare = _prepare_trends if kind == "trends" else _prepare_scholarships
+
+        async def prepared() -> Dict[str, List[object]]:
+            return prepare(filters)
+
+        return (kind, key[0]), prepared, lambda value: value
+    if kind == "initiatives":
+        window = (_parse_layout(params), tuple(sorted(_parse_window(params).items())))
+        return ("initiatives", key, window), lambda: _ainitiatives(params), lambda value: value
+    query = _parse_compare(params)
+    compare_key = (tuple(query["entities"]), normalize_filters(query["filters"]))
+    return (
+        ("compare", compare_key),
+        lambda: _in_thread(_series_by_state_year, query["entities"], query["filters"]),
+        lambda grid: _compare_series(query, grid),
+    )
+
+
+def _parse_batch(raw: Optional[Union[str, bytes]]) -> List[Tuple[str, str, QueryDict]]:
+    """(id, type, params) per sub-query; ValueError describes a malformed batch.
+
+    A batch is ``{"queries": [{"id": ..., "type": ..., "params": ...}]}`` (or
+    the bare list). ``params`` is an object or a query string using the
+    parameters of the matching endpoint; ``id`` defaults to the type.
+    """
+    try:
+        body = json.loads(raw or "null")
+    except ValueError:
+        raise ValueError("Batch must be JSON.")
+    queries = body.get("queries") if isinstance(body, dict) else body
+    if not isinstance(queries, list) or not queries:
+        raise ValueError("queries must be a non-empty list.")
+    if len(queries) > BATCH_MAX_QUERIES:
+        raise ValueError(f"At most {BATCH_MAX_QUERIES} queries per batch.")
+    parsed: List[Tuple[str, str, QueryDict]] = []
+    for index, query in enumerate(queries):
+        kind = query.get("type") if isinstance(query, dict) else None
+        if kind not in BATCH_QUERIES:
+            raise ValueError(f"queries[{index}].type must be one of {', '.join(BATCH_QUERIES)}.")
+        raw_params = query.get("params") or {}
+        if isinstance(raw_params, str):
+            params = QueryDict(raw_params.lstrip("?"))
+        elif isinstance(raw_params, dict):
+            params = QueryDict(mutable=True)
+            for name, value in raw_params.items():
+                values = value if isinstance(value, list) else [value]
+                params.setlist(name, [str(item) for item in values if item is not None])
+        else:
+            raise ValueError(f"queries[{index}].params must be an object or a query string.")
+        query_id = query.get("id") or kind
+        if isinstance(query_id, bool) or not isinstance(query_id, (str, int)):
+            raise ValueError(f"queries[{index}].id must be a string or an integer.")
+        parsed.append((str(query_id), kind, params))
+    ids = [query_id for query_id, _, _ in parsed]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Query ids must be unique.")
+    return parsed
+
+
+@_async_require_http_methods(["GET", "POST"])
+@csrf_exempt
+@conditional_get
+async def api_batch(request: HttpRequest) -> JsonResponse:
+    """Several dashboard queries in one round trip.
+
+    POST the batch as the body, or GET it as ``?queries=<JSON>`` to keep ETag
+    revalidation. Types: kpis, map, points (``/api/map/``), trends,
+    scholarships, initiatives, compare. Each distinct input is computed once
+    per batch, concurrently, and results come back under their query ids.
+    A sub-query with invalid params (e.g. a non-integer year) is reported
+    under ``errors`` by id instead of failing the batch. ``version`` is the
+    data version the results are at least as new as.
+    """
+    try:
+        queries = _parse_batch(request.body if request.method == "POST" else request.GET.get("queries"))
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    version = await get_payload_cache().aversion()
+    plans: List[Tuple[str, _Plan]] = []
+    errors: Dict[str, str] = {}
+    for query_id, kind, params in queries:
+        try:
+            plans.append((query_id, _batch_plan(kind, params)))
+        except BadRequest as exc:
+            errors[query_id] = str(exc)
+    inputs: Dict[Tuple[object, ...], Callable[[], Awaitable[object]]] = {}
+    for _, (key, compute, _) in plans:
+        inputs.setdefault(key, compute)
+    values = dict(zip(inputs, await asyncio.gather(*(compute() for compute in inputs.values()))))
+    data: Dict[str, object] = {
+        "results": {query_id: shape(values[key]) for query_id, (key, _, shape) in plans},
+        "computed": len(inputs),
+        "version": version,
+    }
+    if errors:
+        data["errors"] = errors
+    return JsonResponse(data)
+
+
+# -------- Live updates ---------
+async def _live_snapshot(filters: Dict[str, Optional[str]]) -> Dict[str, object]:
+    summary, state_summary = await asyncio.gather(
+        _acached("summary", filters, summarize),
+        _acached("state-summary", filters, summarize_states),
+    )
+    return {"kpis": _kpi_cards(summary)["cards"], "map": _choropleth(state_summary)["choropleth"]}
+
+
+@_async_require_GET
+async def api_live(request: HttpRequest) -> HttpResponse:
+    """Server-sent KPI and map updates for the dashboard filters.
+
+    Sends a ``snapshot`` ({kpis, map}, as /api/v1/kpis cards and /api/v1/map
+    rows), then a ``delta`` ({kpis, map, removed}: changed cards, changed rows
+    and states that dropped out) whenever the data version moves. Event ids
+    are data versions, so a reconnect resumes from ``Last-Event-ID`` (or
+    ``?since=``) and only gets a snapshot if it missed something. Under WSGI
+    the response ends after one event or the long-poll timeout.
+    """
+    filters = _parse_filters(request.GET)
+    try:
+        since: Optional[int] = int(request.headers.get("Last-Event-ID") or request.GET.get("since") or "")
+    except ValueError:
+        since = None
+    if isinstance(request, ASGIRequest):
+        response: HttpResponse = StreamingHttpResponse(live_events(_live_snapshot, filters, since), content_type="text/event-stream")
+    else:
+        # A WSGI worker cannot hold a stream open cheaply; long-poll for one event.
+        body = b"".join([chunk async for chunk in live_events(_live_snapshot, filters, since, once=True)])
+        response = HttpResponse(body, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # don't let nginx buffer the stream
+    return response
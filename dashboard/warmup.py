@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+
+from django.db import connections
+from django.http import QueryDict
+
+logger = logging.getLogger(__name__)
+
+
+def _store() -> None:
+    from .store import get_store
+
+    get_store()
+
+
+def _dimensions() -> None:
+    from .dimensions import get_resolver
+
+    for dimension in ("state", "scheme"):
+        get_resolver(dimension).names()
+
+
+def _search() -> None:
+    from .search import get_search_index, use_postgres_backend
+
+    if not use_postgres_backend():
+        get_search_index()
+
+
+def _urls() -> None:
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns  # imports every view module and compiles the patterns
+
+
+def _templates() -> None:
+    from django.template import engines
+    from django.template.loader import get_template
+
+    # The project's own templates; the cached loader keeps each compiled one.
+    for directory in engines["django"].engine.dirs:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(".html"):
+                    get_template(os.path.relpath(os.path.join(root, name), directory))
+
+
+def _schema() -> None:
+    from .schema import openapi_schema
+
+    openapi_schema()
+
+
+def _geo() -> None:
+    from .geo import manifest
+
+    manifest()
+
+
+def _payloads() -> None:
+    from .cache import get_payload_cache
+    from .choropleth import classify
+    from .geo import boundaries
+    from .queries import summarize, summarize_states
+    from .views import _build_dashboard_payload, _map_namespace, _parse_classes, _parse_filters
+
+    # The unfiltered landing view: the overview page and the KPI and map
+    # requests its first paint makes.
+    cache = get_payload_cache()
+    filters = _parse_filters(QueryDict())
+    _build_dashboard_payload(filters)
+    cache.get_or_compute("summary", filters, lambda: summarize(filters))
+    state_summary = cache.get_or_compute("state-summary", filters, lambda: summarize_states(filters))
+    options = _parse_classes(QueryDict())
+    geometry, states = boundaries()
+    cache.get_or_compute(
+        _map_namespace(options, geometry), filters,
+        lambda: {**classify(state_summary, states, **options), "geometry": geometry},
+    )
+
+
+STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("store", _store),
+    ("dimensions", _dimensions),
+    ("search", _search),
+    ("urls", _urls),
+    ("templates", _templates),
+    ("schema", _schema),
+    ("geo", _geo),
+    ("payloads", _payloads),
+]
+
+
+def warm_up() -> Dict[str, float]:
+    """Build the process-wide indexes and caches the views would otherwise build on first use.
+
+    Meant for the gunicorn master before it forks (see
+    ``mhrd_dashboard.gunicorn_conf``), so it runs everything inline: no
+    thread pools, event loops or renderer processes, which would not survive
+    the fork. A failing step is logged and skipped; the worker builds that
+    part lazily as before. Returns milliseconds per step.
+    """
+
+    timings: Dict[str, float] = {}
+    try:
+        for name, step in STEPS:
+            started = time.perf_counter()
+            try:
+                step()
+            except Exception:
+                logger.exception("Warm-up step %r failed; it will run on first use instead", name)
+                continue
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    finally:
+        # Workers must open their own connections, never share the master's socket.
+        connections.close_all()
+    return timings
@@ -0,0 +1,45 @@
+"""
+gunicorn configuration for the deployed ASGI app:
+
+    gunicorn -c python:mhrd_dashboard.gunicorn_conf mhrd_dashboard.asgi:application
+
+With ``preload_app`` the master imports Django once and, in ``when_ready``,
+builds the numpy store, dimension tables, search index, compiled templates,
+OpenAPI schema and the landing view's payloads (``dashboard.warmup``) before
+forking. Workers start with all of that in place instead of each building it
+on its first requests, and share its memory pages copy-on-write.
+
+CPython writes to an object's header whenever it is reference-counted or
+visited by the cyclic GC, which copies the page into the worker. ``gc.freeze()``
+moves everything allocated so far into a permanent generation the collector
+never scans, so GC passes in the workers leave the shared pages alone.
+
+Set ``DASHBOARD_PRELOAD=0`` to have each worker import the app itself, e.g. to
+compare startup time and memory (``manage.py benchmark --no-preload``).
+Command-line options such as ``--workers`` or ``--bind`` override this file.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = os.environ.get('DASHBOARD_PRELOAD', '1') == '1'
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before the first fork.
+    if not server.cfg.preload_app:
+        return
+    from dashboard.warmup import warm_up
+
+    timings = warm_up()
+    gc.collect()
+    gc.freeze()
+    server.log.info(
+        "Warmed up in %.0f ms (%s); froze %d objects before forking",
+        sum(timings.values()),
+        ", ".join(f"{name} {ms:.0f}" for name, ms in timings.items()),
+        gc.get_freeze_count(),
+    )
@@ -52,8 +52,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'dashboard.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'dashboard.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -86,6 +87,97 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
+    'DEFAULT_RENDERER_CLASSES': [
+        'dashboard.encoding.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Dashboard payload cache: 'local' keeps an LRU per worker process, 'django'
+# delegates to the CACHES alias below (use a shared cache across workers).
+# The local backend shares the data version through the database and each
+# worker re-reads it at most every VERSION_TTL seconds.
+DASHBOARD_CACHE = {
+    'BACKEND': os.environ.get('DASHBOARD_CACHE_BACKEND', 'local'),
+    'ALIAS': os.environ.get('DASHBOARD_CACHE_ALIAS', 'default'),
+    'MAX_ENTRIES': int(os.environ.get('DASHBOARD_CACHE_MAX_ENTRIES', '1024')),
+    'VERSION_TTL': float(os.environ.get('DASHBOARD_CACHE_VERSION_TTL', '1')),
+    'TIMEOUT': None,
+}
+
+# Report jobs: artifacts are written here by `manage.py process_reports` and
+# copied into the database, so web hosts without this disk can still serve
+# them. DASHBOARD_REPORTS_INLINE=1 builds them on a background thread of the
+# web process instead, for deploys without a worker (PDFs still go through
+# the renderer pool). Reports whose heartbeat has been silent for
+# DASHBOARD_REPORTS_STALE_AFTER seconds are requeued.
+DASHBOARD_REPORTS_ROOT = os.environ.get('DASHBOARD_REPORTS_ROOT', str(BASE_DIR / 'var' / 'reports'))
+DASHBOARD_REPORT_WORKERS = int(os.environ.get('DASHBOARD_REPORT_WORKERS', '2'))
+DASHBOARD_REPORTS_INLINE = os.environ.get('DASHBOARD_REPORTS_INLINE', '0') == '1'
+DASHBOARD_REPORTS_STALE_AFTER = int(os.environ.get('DASHBOARD_REPORTS_STALE_AFTER', '900'))
+
+# PDF rendering: renderer processes started on the first cache miss (and
+# stopped again after IDLE_TIMEOUT seconds without a render) plus a
+# content-addressed cache. DASHBOARD_PDF_PROCESSES is the renderer budget for
+# the whole host, split across its WEB_CONCURRENCY web processes (at least one
+# each), so adding web workers does not multiply WeasyPrint's memory.
+DASHBOARD_PDF = {
+    'PROCESSES': max(
+        1, int(os.environ.get('DASHBOARD_PDF_PROCESSES', '2')) // int(os.environ.get('WEB_CONCURRENCY', '1'))
+    ),
+    'IDLE_TIMEOUT': float(os.environ.get('DASHBOARD_PDF_IDLE_TIMEOUT', '300')),
+    'MAX_PENDING': int(os.environ.get('DASHBOARD_PDF_MAX_PENDING', '8')),
+    'WAIT_TIMEOUT': float(os.environ.get('DASHBOARD_PDF_WAIT_TIMEOUT', '2')),
+    'RENDER_TIMEOUT': float(os.environ.get('DASHBOARD_PDF_RENDER_TIMEOUT', '60')),
+    'CACHE_DIR': os.environ.get('DASHBOARD_PDF_CACHE_DIR', str(BASE_DIR / 'var' / 'pdf-cache')),
+}
+
+# Search backend: 'memory' (in-process inverted index), 'postgres' (pg_trgm),
+# or 'auto' to use Postgres whenever it holds the initiatives.
+DASHBOARD_SEARCH_BACKEND = os.environ.get('DASHBOARD_SEARCH_BACKEND', 'auto')
+
+# Districts generated per state/scheme/year by the synthetic demo dataset.
+# 1 is the regular dataset; raise it to load-test with larger data.
+DASHBOARD_DEMO_SCALE = int(os.environ.get('DASHBOARD_DEMO_SCALE', '1'))
+
+# Threads each web process runs its async views' database work on. Every one
+# keeps its own connection for CONN_MAX_AGE, so a host holds up to
+# WEB_CONCURRENCY * (DASHBOARD_DB_THREADS + 1) connections (the +1 is Django's
+# thread for sync views), plus one per report worker; keep that under the
+# database's connection limit.
+DASHBOARD_DB_THREADS = int(os.environ.get('DASHBOARD_DB_THREADS', '4'))
+
+# Request instrumentation: Server-Timing headers and per-view latency
+# percentiles (see /api/v1/health). Set PROFILE_SAMPLE_RATE (0-1) to run
+# cProfile on that share of requests and keep the slow ones in PROFILE_DIR
+# (under ASGI only the work async views run on threads is profiled).
+DASHBOARD_PROFILING = {
+    'ENABLED': os.environ.get('DASHBOARD_PROFILING', '1') == '1',
+    'PROFILE_SAMPLE_RATE': float(os.environ.get('DASHBOARD_PROFILE_SAMPLE_RATE', '0')),
+    'SLOW_REQUEST_MS': float(os.environ.get('DASHBOARD_SLOW_REQUEST_MS', '500')),
+    'PROFILE_DIR': os.environ.get('DASHBOARD_PROFILE_DIR', str(BASE_DIR / 'var' / 'profiles')),
+}
+
+# JSON encoding: 'auto' uses orjson when installed, 'stdlib' forces the json module.
+DASHBOARD_JSON_ENCODER = os.environ.get('DASHBOARD_JSON_ENCODER', 'auto')
+
+# HTTP validators on the read APIs: ETags follow the data version, so browsers
+# (MAX_AGE) revalidate for a cheap 304 and a reverse proxy may reuse a response
+# for SHARED_MAX_AGE seconds after it was generated.
+DASHBOARD_HTTP_CACHE = {
+    'ENABLED': os.environ.get('DASHBOARD_HTTP_CACHE', '1') == '1',
+    'MAX_AGE': int(os.environ.get('DASHBOARD_HTTP_MAX_AGE', '0')),
+    'SHARED_MAX_AGE': int(os.environ.get('DASHBOARD_HTTP_SHARED_MAX_AGE', '10')),
+}
+
+# Live updates (/api/v1/live): how often each worker checks the data version,
+# the keep-alive interval, how long a stream stays open before the browser
+# reconnects from its last event id, and the long-poll wait under WSGI.
+DASHBOARD_LIVE = {
+    'POLL_INTERVAL': float(os.environ.get('DASHBOARD_LIVE_POLL_INTERVAL', '1')),
+    'HEARTBEAT': float(os.environ.get('DASHBOARD_LIVE_HEARTBEAT', '15')),
+    'MAX_STREAM_SECONDS': float(os.environ.get('DASHBOARD_LIVE_MAX_STREAM_SECONDS', '300')),
+    'LONG_POLL_TIMEOUT': float(os.environ.get('DASHBOARD_LIVE_LONG_POLL_TIMEOUT', '25')),
 }
 
 
@@ -177,6 +269,16 @@ else:
 # Disable manifest storage to avoid missing file errors
 WHITENOISE_MANIFEST_STRICT = False
 
+# Files named by content hash (``name.<12 hex>.ext``, as written by
+# ``manage.py build_geo`` and by Django's hashed storages) never change in
+# place, so WhiteNoise serves them with ``Cache-Control: immutable``. It also
+# serves their prebuilt .br/.gz variants to clients that accept them.
+WHITENOISE_IMMUTABLE_FILE_TEST = r"\.[0-9a-f]{12}\.\w+$"
+WHITENOISE_MIMETYPES = {
+    ".geojson": "application/geo+json",
+    ".topojson": "application/json",
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
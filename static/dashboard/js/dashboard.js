@@ -11,14 +11,45 @@ function parseInitialData() {
     }
 }
 
-function colorScale(val, max) {
-    const t = max > 0 ? val / max : 0;
-    const c = Math.floor(200 * t) + 30;
-    return `rgb(30, ${60 + Math.floor(100 * t)}, ${c})`;
+// Fill for boundary features without data under the current filters.
+const NO_DATA_COLOR = "#cbd5e1";
+
+// Turn a column-major block ({field: [values]}) from ?layout=columns back into row objects.
+function columnsToRows(columns) {
+    const fields = Object.keys(columns || {});
+    const length = fields.length ? columns[fields[0]].length : 0;
+    return Array.from({ length }, (_, i) => Object.fromEntries(fields.map(field => [field, columns[field][i]])));
 }
 
-function normalizeStateName(name) {
-    return (name || '').toLowerCase().replace(/[^a-z]/g, '');
+// Decode one GeometryCollection of a quantized, delta-encoded TopoJSON
+// topology (as written by `manage.py build_geo`) into a GeoJSON FeatureCollection.
+function topoFeatures(topology, name) {
+    const [sx, sy] = topology.transform.scale;
+    const [tx, ty] = topology.transform.translate;
+    const arcs = topology.arcs.map(arc => {
+        let x = 0, y = 0;
+        return arc.map(([dx, dy]) => [(x += dx) * sx + tx, (y += dy) * sy + ty]);
+    });
+    const ring = refs => {
+        const points = [];
+        refs.forEach(ref => {
+            const arc = ref < 0 ? arcs[~ref].slice().reverse() : arcs[ref];
+            for (let i = points.length ? 1 : 0; i < arc.length; i++) points.push(arc[i]);
+        });
+        return points;
+    };
+    const polygon = rings => rings.map(ring);
+    return {
+        type: "FeatureCollection",
+        features: topology.objects[name].geometries.map(g => ({
+            type: "Feature",
+            id: g.id,
+            properties: g.properties || {},
+            geometry: g.type === "Polygon" ? { type: "Polygon", coordinates: polygon(g.arcs) }
+                : g.type === "MultiPolygon" ? { type: "MultiPolygon", coordinates: g.arcs.map(polygon) }
+                : null
+        }))
+    };
 }
 
 document.addEventListener("DOMContentLoaded", () => {
@@ -98,52 +129,71 @@ document.addEventListener("DOMContentLoaded", () => {
     L.tileLayer("https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png", { maxZoom: 18 }).addTo(map);
     const markersLayer = L.layerGroup().addTo(map);
     let geoLayer = null;
+    // Marker fallback points for the current filters, taken from the last dashboard payload.
+    let mapPoints = initialPayload.map || [];
+    // Classified map values for the current filters, by metric.
+    let choroplethClasses = {};
+    // Boundary files by URL, and the manifest level currently drawn.
+    const geoRequests = {};
+    let geoManifest = null;
+    let geoLevel = null;
 
-    async function populateChoropleth(metric = "students") {
-        try {
-            const loadGeo = async () => {
-                try {
-                    const resp = await fetch("/static/geo/india_states.geojson");
-                    if (resp.ok) return await resp.json();
-                } catch (_) {}
-                try {
-                    const resp2 = await fetch("/static/geo/india_states_demo.geojson");
-                    if (resp2.ok) return await resp2.json();
-                } catch (_) {}
-                return null; // trigger marker fallback
-            };
+    // The least detailed level simplified for `zoom` or beyond (the last
+    // level past the most detailed one). A null zoom fits every zoom.
+    function geoLevelFor(levels, zoom) {
+        return levels.find(level => level.zoom === null || level.zoom >= zoom) || levels[levels.length - 1];
+    }
 
-            const [geo, data] = await Promise.all([
-                loadGeo(),
-                fetch(`/api/v1/map?${buildQueryString()}`).then(r => r.json())
-            ]);
+    function loadGeoManifest() {
+        geoManifest = geoManifest || fetch("/api/v1/geo").then(r => r.json()).catch(() => ({ levels: [] }));
+        return geoManifest;
+    }
+
+    async function loadGeo() {
+        const manifest = await loadGeoManifest();
+        const level = geoLevelFor(manifest.levels || [], map.getZoom());
+        if (!level) return null; // trigger marker fallback
+        const url = level.topojson || level.geojson;
+        geoRequests[url] = geoRequests[url] || fetch(url)
+            .then(r => (r.ok ? r.json() : null))
+            .then(data => (data && level.topojson ? topoFeatures(data, manifest.object) : data))
+            .then(data => {
+                // Map classes come back in feature order; remember each feature's position.
+                data?.features.forEach((feature, index) => {
+                    feature.properties = { ...feature.properties, index };
+                });
+                return data;
+            })
+            .catch(() => null);
+        geoLevel = level;
+        return geoRequests[url];
+    }
+
+    async function mapParams(metric) {
+        const params = new URLSearchParams(buildQueryString());
+        params.set("metric", metric);
+        params.set("geometry", (await loadGeoManifest()).version || "");
+        return params.toString();
+    }
+
+    async function loadChoropleth(metric) {
+        if (!choroplethClasses[metric]) {
+            const data = await fetch(`/api/v1/map?${await mapParams(metric)}`).then(r => r.json());
+            choroplethClasses[metric] = data;
+        }
+        return choroplethClasses[metric];
+    }
+
+    async function populateChoropleth(metric = "students", fit = true) {
+        try {
+            const [geo, data] = await Promise.all([loadGeo(), loadChoropleth(metric)]);
 
             if (!geo) {
                 // Fallback: draw circle markers using payload.map points
-                try {
-                    const payload = await fetch(`/api/data/?${buildQueryString()}`).then(r => r.json());
-                    populateMap(payload.map || []);
-                } catch(err) {
-                    console.warn('Map fallback failed', err);
-                }
+                populateMap(mapPoints);
                 return;
             }
 
-            const valuesByState = {};
-            let max = 0;
-            
-            (data.choropleth || []).forEach(row => {
-                const val = {
-                    schools: row.schools,
-                    scholarships: row.scholarships,
-                    progress: row.avg_progress,
-                    students: row.students
-                }[metric] || 0;
-                
-                valuesByState[normalizeStateName(row.state)] = val;
-                if (val > max) max = val;
-            });
-
             if (geoLayer) {
                 map.removeLayer(geoLayer);
                 geoLayer = null;
@@ -151,34 +201,31 @@ document.addEventListener("DOMContentLoaded", () => {
 
             geoLayer = L.geoJSON(geo, {
                 style: feature => {
-                    const props = feature.properties || {};
-                    const st = props.state || props.NAME_1 || props.st_nm || props.State_Name || '';
-                    const val = valuesByState[normalizeStateName(st)] || 0;
+                    const index = data.classes[feature.properties.index];
                     return {
-                        fillColor: colorScale(val, max),
+                        fillColor: index >= 0 ? data.colors[index] : NO_DATA_COLOR,
                         weight: 1,
                         color: '#ffffff',
                         fillOpacity: 0.7
                     };
                 },
                 onEachFeature: (feature, layer) => {
-                    const props = feature.properties || {};
-                    const st = props.state || props.NAME_1 || props.st_nm || props.State_Name || '';
-                    const val = valuesByState[normalizeStateName(st)] || 0;
-                    layer.bindPopup(`<strong>${st}</strong><br>${metric}: ${numberFormatter.format(val)}`);
+                    const props = feature.properties;
+                    const value = data.values[props.index];
+                    const shown = value === null || value === undefined ? "no data" : numberFormatter.format(value);
+                    layer.bindPopup(`<strong>${props.state || ''}</strong><br>${metric}: ${shown}`);
                 }
             }).addTo(map);
 
-            try {
-                map.fitBounds(geoLayer.getBounds(), { padding: [30, 30] });
-            } catch (e) {}
+            if (fit) {
+                try {
+                    map.fitBounds(geoLayer.getBounds(), { padding: [30, 30] });
+                } catch (e) {}
+            }
         } catch (e) {
             console.warn("Choropleth error", e);
             // Last resort: try points
-            try {
-                const payload = await fetch(`/api/data/?${buildQueryString()}`).then(r => r.json());
-                populateMap(payload.map || []);
-            } catch(_) {}
+            populateMap(mapPoints);
         }
     }
 
@@ -215,7 +262,10 @@ document.addEventListener("DOMContentLoaded", () => {
         }
     }
 
+    let kpiValues = { ...initialPayload.summary };
+
     function updateKpis(summary) {
+        kpiValues = { ...kpiValues, ...summary };
         const kpiContainer = document.getElementById("kpi-cards");
         if (!kpiContainer) return;
         
@@ -226,15 +276,66 @@ document.addEventListener("DOMContentLoaded", () => {
                 : numberFormatter.format(value);
         };
         
-        updateKPI('schools', summary.schools);
-        updateKPI('students', summary.students);
-        updateKPI('scholarships', summary.scholarships);
-        updateKPI('progress', summary.avg_progress_pct);
+        updateKPI('schools', kpiValues.schools);
+        updateKPI('students', kpiValues.students);
+        updateKPI('scholarships', kpiValues.scholarships);
+        updateKPI('progress', kpiValues.avg_progress_pct);
+    }
+
+    // The table shows one server-side page of initiatives; paging and sorting fetch just that page.
+    const initiativesTable = document.getElementById("initiatives-table");
+    const tableState = {
+        page: Number(initiativesTable?.dataset.page) || 1,
+        pageSize: Number(initiativesTable?.dataset.pageSize) || 25,
+        sort: initiativesTable?.dataset.sort || "id",
+        pages: 1
+    };
+    const TABLE_FIELDS = "name,state,scheme,category,year,status,progress_pct";
+
+    function windowParams(page) {
+        const params = new URLSearchParams(buildQueryString());
+        params.set("page", page);
+        params.set("page_size", tableState.pageSize);
+        params.set("sort", tableState.sort);
+        params.set("layout", "columns");
+        return params;
     }
 
-    function updateInitiativesTable(initiatives = []) {
+    function updatePager(windowData) {
+        tableState.page = windowData.page;
+        tableState.pages = windowData.pages;
+        tableState.sort = windowData.sort;
+        const status = document.getElementById("initiatives-status");
+        if (status) {
+            status.textContent = `Page ${windowData.page} of ${Math.max(windowData.pages, 1)} · ${numberFormatter.format(windowData.total)} initiatives`;
+        }
+        document.querySelectorAll("#initiatives-pager [data-page-step]").forEach(button => {
+            const target = windowData.page + Number(button.dataset.pageStep);
+            button.disabled = target < 1 || target > windowData.pages;
+        });
+        initiativesTable?.querySelectorAll("th[data-sort]").forEach(th => {
+            th.classList.toggle("is-sorted", tableState.sort.replace(/^-/, "") === th.dataset.sort);
+            th.classList.toggle("is-sorted--desc", tableState.sort === `-${th.dataset.sort}`);
+        });
+    }
+
+    async function loadInitiativesPage(page) {
+        const params = windowParams(page);
+        params.set("fields", TABLE_FIELDS);
+        try {
+            const response = await fetch(`/api/v1/initiatives?${params.toString()}`, { headers: { Accept: "application/json" } });
+            if (!response.ok) throw new Error(`Failed to fetch initiatives (${response.status})`);
+            updateInitiativesTable(await response.json());
+        } catch (error) {
+            console.error("Initiatives page error:", error);
+        }
+    }
+
+    function updateInitiativesTable(windowData) {
         const tbody = document.getElementById("initiatives-body");
         if (!tbody) return;
+        const initiatives = columnsToRows(windowData.results);
+        updatePager(windowData);
         
         tbody.innerHTML = initiatives.length ? initiatives.map(item => `
             <tr>
@@ -265,37 +366,108 @@ document.addEventListener("DOMContentLoaded", () => {
         downloadLink.href = query ? `${baseUrl}?${query}` : baseUrl;
     }
 
+    // Everything a filter change redraws, fetched as one batch: one round trip,
+    // and the server computes each shared aggregate once.
     async function refreshDashboard() {
-        const query = buildQueryString();
-        const url = `/api/data/${query ? `?${query}` : ''}`;
+        const filters = buildQueryString();
+        const metric = document.getElementById('map-metric')?.value || 'students';
+        const initiativesParams = windowParams(1);
+        initiativesParams.set("fields", TABLE_FIELDS);
+        const queries = [
+            { id: "kpis", type: "kpis", params: filters },
+            { id: "trends", type: "trends", params: filters },
+            { id: "scholarships", type: "scholarships", params: filters },
+            { id: "map", type: "map", params: await mapParams(metric) },
+            { id: "points", type: "points", params: filters },
+            { id: "initiatives", type: "initiatives", params: initiativesParams.toString() }
+        ];
+        const url = `/api/v1/batch?queries=${encodeURIComponent(JSON.stringify(queries))}`;
         
         try {
             const response = await fetch(url, { headers: { Accept: "application/json" } });
             if (!response.ok) throw new Error(`Failed to fetch data (${response.status})`);
             
-            const payload = await response.json();
-            updateKpis(payload.summary);
+            const { results, version } = await response.json();
+            updateKpis(results.kpis.cards);
             
-            enrollmentChart.data.labels = payload.trends.labels;
-            enrollmentChart.data.datasets[0].data = payload.trends.primary;
-            enrollmentChart.data.datasets[1].data = payload.trends.secondary;
+            enrollmentChart.data.labels = results.trends.labels;
+            enrollmentChart.data.datasets[0].data = results.trends.primary;
+            enrollmentChart.data.datasets[1].data = results.trends.secondary;
             enrollmentChart.update();
 
-            scholarshipChart.data.labels = payload.scholarships.states;
-            scholarshipChart.data.datasets[0].data = payload.scholarships.values;
+            scholarshipChart.data.labels = results.scholarships.states;
+            scholarshipChart.data.datasets[0].data = results.scholarships.values;
             scholarshipChart.update();
 
-            const metric = document.getElementById('map-metric')?.value || 'students';
+            mapPoints = results.points.map || [];
+            choroplethClasses = { [metric]: results.map };
             await populateChoropleth(metric);
-            updateInitiativesTable(payload.initiatives);
+            updateInitiativesTable(results.initiatives);
             updateDownloadLink();
+            connectLive(version);
         } catch (error) {
             console.error("Dashboard refresh error:", error);
         }
     }
 
+    // Live KPI and map updates for the current filters. Event ids are data
+    // versions: connecting with the version already shown skips the snapshot,
+    // and the browser resumes from the last id it saw after a reconnect.
+    let liveSource = null;
+
+    // Map changes reclassify the current metric (one small, shared, cached request).
+    function redrawLiveMap() {
+        choroplethClasses = {};
+        populateChoropleth(document.getElementById('map-metric')?.value || 'students', false);
+    }
+
+    function connectLive(since) {
+        if (!window.EventSource) return;
+        liveSource?.close();
+        const params = new URLSearchParams(buildQueryString());
+        if (since) params.set("since", since);
+        liveSource = new EventSource(`/api/v1/live?${params.toString()}`);
+        liveSource.addEventListener("snapshot", event => {
+            const data = JSON.parse(event.data);
+            updateKpis(data.kpis);
+            redrawLiveMap();
+        });
+        liveSource.addEventListener("delta", event => {
+            const data = JSON.parse(event.data);
+            updateKpis(data.kpis);
+            if (data.map.length || data.removed.length) redrawLiveMap();
+        });
+    }
+
     selects.forEach(select => select.addEventListener("change", refreshDashboard));
+
+    document.querySelectorAll("#initiatives-pager [data-page-step]").forEach(button => {
+        button.addEventListener("click", () => loadInitiativesPage(tableState.page + Number(button.dataset.pageStep)));
+    });
+    if (initiativesTable) {
+        updatePager({
+            page: tableState.page,
+            pages: Number(initiativesTable.dataset.pages) || 0,
+            total: Number(initiativesTable.dataset.total) || 0,
+            sort: tableState.sort
+        });
+    }
+    initiativesTable?.querySelectorAll("th[data-sort]").forEach(th => {
+        th.addEventListener("click", () => {
+            tableState.sort = tableState.sort === th.dataset.sort ? `-${th.dataset.sort}` : th.dataset.sort;
+            loadInitiativesPage(1);
+        });
+    });
     
+    // Swap in the boundary level simplified for the new zoom, keeping the view.
+    map.on("zoomend", async () => {
+        if (!geoLayer || !geoLevel) return;
+        const manifest = await geoManifest;
+        if (geoLevelFor(manifest.levels || [], map.getZoom()) !== geoLevel) {
+            populateChoropleth(document.getElementById('map-metric')?.value || 'students', false);
+        }
+    });
+
     const metricSel = document.getElementById('map-metric');
     if (metricSel) {
         metricSel.addEventListener('change', () => populateChoropleth(metricSel.value));
@@ -305,6 +477,7 @@ document.addEventListener("DOMContentLoaded", () => {
         const metric = document.getElementById('map-metric')?.value || 'students';
         await populateChoropleth(metric);
         updateDownloadLink();
+        connectLive(initialPayload.version);
     })();
 });
 